@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark archetype-shared belief updates against a full per-persona run.
+
+Uses a deterministic stand-in for the LLM (votes derived from the persona's
+traits in the prompt) so fidelity can be measured without API calls:
+
+    python benchmarks/bench_archetypes.py [--personas data/personas/swiss_population.jsonl]
+
+Reports LLM calls, wall time and agreement with the full run for several
+archetype counts.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+
+benchmarks_dir = Path(__file__).parent
+backend_dir = benchmarks_dir.parent
+sys.path.insert(0, str(backend_dir))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-placeholder")
+
+from src import llm_client
+from src.population import Population
+
+CANDIDATES = ["Lina Meier", "Markus Keller"]
+TOPICS = ["housing", "climate"]
+
+call_count = 0
+
+
+async def fake_generate_response_async(client, prompt, system_instruction, temperature=1.0, max_output_tokens=8000):
+    """Derive topic votes from Openness/Agreeableness/Age in the prompt."""
+    global call_count
+    call_count += 1
+    await asyncio.sleep(0)
+
+    def trait(name, default=0.5):
+        match = re.search(rf"{name}: ([0-9.]+)", prompt)
+        return float(match.group(1)) if match else default
+
+    age = trait("Age", 40) / 100
+    beliefs = {}
+    for offset, topic in enumerate(TOPICS):
+        score = 0.5 * trait("Openness") + 0.3 * trait("Agreeableness") + 0.2 * (1 - age) + 0.05 * offset
+        beliefs[topic] = {"belief": f"Position on {topic}", "vote": CANDIDATES[0] if score > 0.45 else CANDIDATES[1]}
+    votes = [b["vote"] for b in beliefs.values()]
+    beliefs["overall_vote"] = max(set(votes), key=votes.count)
+    return json.dumps(beliefs)
+
+
+class Transcript:
+    """Minimal debate transcript accepted by Persona.consume_debate_content."""
+    class topic:
+        title = "Housing"
+        description = "Housing policy"
+
+    class Statement:
+        def __init__(self, text):
+            self.raw_text = text
+
+    statements = [Statement("Lina Meier: Build cooperatives."), Statement("Markus Keller: Deregulate.")]
+
+
+def load_population(path, archetypes=None, seed=0):
+    random.seed(seed)
+    population = Population()
+    population.load_from_jsonl(path)
+    if archetypes:
+        population.enable_archetypes(archetypes, susceptibility_threshold=0.9, seed=seed)
+    return population
+
+
+def run(population, rounds=2):
+    global call_count
+    call_count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        population.consume_debate_content(Transcript())
+        population.update_beliefs_from_debate(max_concurrent=200)
+    return call_count, time.perf_counter() - start
+
+
+def agreement(reference, candidate, key):
+    pairs = list(zip(reference.personas, candidate.personas))
+    matches = 0
+    for a, b in pairs:
+        va, vb = a.beliefs.get(key), b.beliefs.get(key)
+        if isinstance(va, dict):
+            va, vb = va.get("vote"), (vb or {}).get("vote")
+        matches += va == vb
+    return matches / len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archetype fidelity vs. cost benchmark')
+    parser.add_argument('--personas', default=str(backend_dir / 'data/personas/swiss_population.jsonl'))
+    parser.add_argument('--archetypes', type=int, nargs='+', default=[5, 10, 25, 50, 100])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    llm_client.generate_response_async = fake_generate_response_async
+
+    full = load_population(args.personas)
+    full_calls, full_time = run(full)
+    print(f"{'mode':<16}{'LLM calls':>10}{'time (s)':>10}{'overall_vote':>14}{'topic votes':>13}")
+    print(f"{'full':<16}{full_calls:>10}{full_time:>10.2f}{1.0:>14.3f}{1.0:>13.3f}")
+
+    for k in args.archetypes:
+        shared = load_population(args.personas, archetypes=k)
+        calls, elapsed = run(shared)
+        topic_agreement = sum(agreement(full, shared, topic) for topic in TOPICS) / len(TOPICS)
+        print(f"{f'archetypes={k}':<16}{calls:>10}{elapsed:>10.2f}"
+              f"{agreement(full, shared, 'overall_vote'):>14.3f}{topic_agreement:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
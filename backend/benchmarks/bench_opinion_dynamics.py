@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark one surrogate opinion-dynamics epoch on a large synthetic population:
+
+    python benchmarks/bench_opinion_dynamics.py [--size 1000000] [--topics 3] [--candidates 2]
+
+Times calibration on an LLM-sized subset and a full-population step.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+benchmarks_dir = Path(__file__).parent
+backend_dir = benchmarks_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.opinion_dynamics import OpinionDynamics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Opinion dynamics surrogate benchmark')
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--topics', type=int, default=3)
+    parser.add_argument('--candidates', type=int, default=2)
+    parser.add_argument('--llm-sample', type=int, default=1000)
+    parser.add_argument('--epochs', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    dynamics = OpinionDynamics(
+        rng.uniform(0, 1, args.size).astype(np.float32),
+        rng.uniform(0.5, 0.8, args.size).astype(np.float32),
+        rng.uniform(0, 0.5, args.size).astype(np.float32),
+        [f"topic_{t}" for t in range(args.topics)],
+        [f"candidate_{c}" for c in range(args.candidates)],
+        seed=0
+    )
+    print(f"setup: {time.perf_counter() - start:.2f}s for {args.size} personas")
+
+    rows = np.sort(rng.choice(args.size, args.llm_sample, replace=False))
+    for epoch in range(args.epochs):
+        before = dynamics.stances[rows].copy()
+        # Stand-in for LLM updates: the sample leans towards candidate_0
+        after = np.zeros_like(before)
+        choice = (rng.uniform(size=before.shape[:2]) < 0.6).astype(int)
+        np.put_along_axis(after, (1 - choice)[..., None], 1.0, axis=2)
+
+        start = time.perf_counter()
+        dynamics.calibrate(rows, before, after)
+        calibrated = time.perf_counter()
+        dynamics.step(pinned_rows=rows, pinned_stances=after)
+        stepped = time.perf_counter()
+
+        overall = dynamics.vote_shares()["overall"]
+        print(f"epoch {epoch}: calibrate {calibrated - start:.3f}s, step {stepped - calibrated:.2f}s, "
+              f"step size {dynamics.step_size:.3f}, overall shares "
+              + ", ".join(f"{c}={s:.3f}" for c, s in overall.items()))
+
+
+if __name__ == "__main__":
+    main()
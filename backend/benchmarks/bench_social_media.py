@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark SocialMedia post indexing and bulk reactions:
+
+    python benchmarks/bench_social_media.py [--posts 100000] [--reactions 1000000] [--personas 10000]
+
+Times adding posts, applying reactions one by one and in bulk, and
+filtering the feed by a set of authors.
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+benchmarks_dir = Path(__file__).parent
+backend_dir = benchmarks_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.social_media import SocialMedia, Post
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40}{time.perf_counter() - start:>8.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SocialMedia index benchmark')
+    parser.add_argument('--posts', type=int, default=100_000)
+    parser.add_argument('--reactions', type=int, default=1_000_000)
+    parser.add_argument('--personas', type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    persona_ids = [f"persona_{i}" for i in range(args.personas)]
+    posts = [Post(id=f"post_{i}", persona_id=rng.choice(persona_ids), content="...") for i in range(args.posts)]
+    reactions = [
+        (f"post_{rng.randrange(args.posts)}", rng.choice(persona_ids), rng.choice(SocialMedia.VALID_REACTIONS))
+        for _ in range(args.reactions)
+    ]
+
+    platform = SocialMedia()
+    timed(f"add_post x{args.posts}", lambda: [platform.add_post(post) for post in posts])
+    timed(f"add_reaction x{args.reactions // 2}", lambda: [platform.add_reaction(*r) for r in reactions[:args.reactions // 2]])
+    timed(f"add_reactions (bulk) x{args.reactions - args.reactions // 2}", lambda: platform.add_reactions(reactions[args.reactions // 2:]))
+
+    authors = rng.sample(persona_ids, 100)
+    feed = timed("get_feed_by_personas (100 authors)", lambda: platform.get_feed_by_personas(authors))
+    print(f"  -> {len(feed)} posts")
+
+
+if __name__ == "__main__":
+    main()
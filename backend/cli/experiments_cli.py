@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Run several configs and replicates concurrently under one LLM rate budget.
+
+Usage (from backend/, like main.py):
+    python cli/experiments_cli.py src/configs/zurich_config-baseline.yaml --replicates 3
+    python cli/experiments_cli.py "src/configs/zurich_*.yaml" --processes 6 --rpm 900 --retries 2
+"""
+
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+cli_dir = Path(__file__).parent
+backend_dir = cli_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+from main import create_engine
+from src.experiment_runner import ExperimentRunner, find_configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run simulations for many configs and replicates on a process pool')
+    parser.add_argument('configs', nargs='+', help='Config files, directories of configs or glob patterns')
+    parser.add_argument('--replicates', type=int, default=1, help='Runs per config (replicate k uses random_seed + k - 1)')
+    parser.add_argument('--processes', type=int, default=None, help='Worker processes (default: CPU count; 0: run serially)')
+    parser.add_argument('--rpm', type=float, default=None, help='Global LLM requests per minute across all workers')
+    parser.add_argument('--retries', type=int, default=1, help='Extra attempts for failed runs (resumed from checkpoints)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not share an LLM response cache between runs')
+    parser.add_argument('--experiment-id', type=str, default=None, help='Name of the experiment output directory')
+    parser.add_argument('--base-dir', type=str, default='data/simulation', help='Base directory for simulation outputs')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.INFO)
+
+    runner = ExperimentRunner(
+        find_configs(args.configs),
+        create_engine,
+        replicates=args.replicates,
+        base_dir=args.base_dir,
+        experiment_id=args.experiment_id,
+        processes=args.processes,
+        requests_per_minute=args.rpm,
+        use_cache=not args.no_cache,
+        max_retries=args.retries
+    )
+    index = runner.run()
+
+    print(f"\n{index['completed']} of {len(index['runs'])} runs completed in {index['elapsed_seconds']:.0f}s "
+          f"({index['llm']['cache_hits']} cached responses)")
+    for run in index["runs"]:
+        outcome = run.get("final_vote") if run["status"] == "completed" else run.get("error")
+        print(f"  {run['simulation_id']}: {run['status']} after {run['attempts']} attempt(s) - {outcome}")
+    print(f"Index: {runner.experiment_dir / 'index.json'}")
+    sys.exit(0 if index["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
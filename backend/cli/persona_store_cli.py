@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Convert persona JSONL files into the memory-mapped columnar cache.
+
+Usage:
+    python cli/persona_store_cli.py data/personas/*.jsonl [--rebuild]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+cli_dir = Path(__file__).parent
+backend_dir = cli_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.persona_store import PersonaStore, cache_dir_for, is_stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build columnar caches for persona JSONL files')
+    parser.add_argument('files', nargs='+', help='Persona JSONL files to convert')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild even if the cache is up to date')
+    args = parser.parse_args()
+
+    for file_path in args.files:
+        stale = args.rebuild or is_stale(file_path)
+        start = time.perf_counter()
+        store = PersonaStore.open(file_path, rebuild=args.rebuild)
+        elapsed = time.perf_counter() - start
+
+        status = "built" if stale else "up to date"
+        print(f"{file_path}: {len(store)} personas, {len(store.columns)} columns ({status}, {elapsed:.3f}s)")
+        print(f"  cache: {cache_dir_for(file_path)}")
+
+
+if __name__ == "__main__":
+    main()
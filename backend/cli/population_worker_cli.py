@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Host a slice of a distributed simulation's population (see src/distributed.py).
+
+Usage (from backend/, with the coordinator started by main.py --coordinator HOST:PORT):
+    SIMULATION_CLUSTER_KEY=... python cli/population_worker_cli.py coordinator-host:7070
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+cli_dir = Path(__file__).parent
+backend_dir = cli_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.distributed import run_worker, HEARTBEAT_INTERVAL
+from src.transport import TcpTransport, parse_address
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve part of a distributed population to a coordinator')
+    parser.add_argument('coordinator', help='HOST:PORT of the coordinator (main.py --coordinator)')
+    parser.add_argument('--worker-id', type=str, default=None, help='Name reported to the coordinator (default: host:pid)')
+    parser.add_argument('--heartbeat', type=float, default=HEARTBEAT_INTERVAL, help='Seconds between heartbeats')
+    parser.add_argument('--retry', type=float, default=30, help='Seconds to keep retrying while the coordinator is not up yet')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(name)s - %(message)s')
+    load_dotenv()
+    authkey = os.getenv('SIMULATION_CLUSTER_KEY')
+    if not authkey:
+        parser.error('SIMULATION_CLUSTER_KEY not found in environment')
+
+    address = parse_address(args.coordinator, default_host='localhost')
+    deadline = time.monotonic() + args.retry
+    while True:
+        try:
+            run_worker(TcpTransport(authkey.encode()), address, worker_id=args.worker_id, heartbeat_interval=args.heartbeat)
+            return
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Summarize social media reactions of a finished simulation.
+
+Usage:
+    python cli/reaction_stats_cli.py data/simulation/<simulation_id> [--top 10]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+cli_dir = Path(__file__).parent
+backend_dir = cli_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.reaction_log import ReactionLog
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reaction analytics for a simulation run')
+    parser.add_argument('simulation_dir', help='Simulation output directory containing epochs.jsonl')
+    parser.add_argument('--top', type=int, default=10, help='Number of entries to list per ranking')
+    args = parser.parse_args()
+
+    log = ReactionLog.from_epochs(Path(args.simulation_dir) / "epochs.jsonl")
+    summary = log.summary(top=args.top)
+    print(f"{summary['total_reactions']} reactions ({summary['thumbs_up']} 👍, {summary['thumbs_down']} 👎) "
+          f"on {len(log.post_ids)} posts by {len(log.persona_ids)} personas")
+
+    print("\nMost approved authors:")
+    approval = sorted(summary["author_approval"].items(), key=lambda item: item[1]["approval"], reverse=True)
+    for persona_id, stats in approval[:args.top]:
+        print(f"  {persona_id}: {stats['approval']:.0%} ({stats['likes']} 👍 / {stats['dislikes']} 👎)")
+
+    print("\nMost polarizing posts:")
+    for entry in summary["most_polarizing_posts"]:
+        print(f"  {entry['post_id']}: {entry['polarization']:.2f}")
+
+    print("\nLeast agreeable personas:")
+    agreement = sorted(log.persona_agreement().items(), key=lambda item: item[1])
+    for persona_id, rate in agreement[:args.top]:
+        print(f"  {persona_id}: agrees with the majority {rate:.0%} of the time")
+
+
+if __name__ == "__main__":
+    main()
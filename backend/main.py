@@ -2,10 +2,15 @@ import logging
 import argparse
 from src.config import Config
 from src.game_engine import GameEngine
-from src.candidate import Candidate
 from src.mediator import Mediator, Topic
 from src.social_media import SocialMedia
+from src.persona_store import PersonaStore
+from src.sweep import SweepRunner, load_sweep
+from src.distributed import Coordinator, WorkerPool
+from src.transport import TcpTransport, parse_address
 import os
+import random
+import yaml
 
 # Configure logging
 logging.basicConfig(
@@ -14,21 +19,8 @@ logging.basicConfig(
 )
 
 
-def main():
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Run the synthetic communities simulation')
-    parser.add_argument(
-        '--config',
-        type=str,
-        default='src/configs/config.yaml',
-        help='Path to configuration YAML file (default: src/configs/config.yaml)'
-    )
-    args = parser.parse_args()
-
-    # Load configuration from YAML file
-    config = Config.from_yaml(args.config)
-    print(f"Loaded configuration from: {args.config}")
-
+def create_engine(config: Config, config_path: str) -> GameEngine:
+    """Build a fresh engine from a configuration: population, candidates, mediator and social media."""
     # Display world information if loaded
     if config.world_story:
         print(f"World story loaded from: {config.world_file}")
@@ -38,11 +30,34 @@ def main():
     else:
         print("No world story loaded")
 
-    engine = GameEngine(config, config_path=args.config)
+    engine = GameEngine(config, config_path=config_path)
 
     # Load population from JSONL file
+    store, llm_rows = None, []
     if os.path.exists(config.population_file):
-        engine.population.load_from_jsonl(config.population_file, limit=config.population_size)
+        if config.opinion_dynamics:
+            # Hybrid mode: LLM personas are a random sample of the surrogate population
+            store = PersonaStore.open(config.population_file)
+            llm_rows = sorted(random.Random(config.random_seed).sample(range(len(store)), min(config.population_size, len(store))))
+            engine.population.load_from_store(store, llm_rows)
+        elif config.population_sampling:
+            engine.population.load_stratified_sample(
+                config.population_file,
+                config.population_sampling["strata"],
+                sample_size=config.population_size,
+                target_size=config.population_sampling.get("target_size"),
+                filters=(config.population_query or {}).get("filters"),
+                seed=config.random_seed
+            )
+        elif config.population_query:
+            engine.population.load_from_query(
+                config.population_file,
+                config.population_query,
+                limit=config.population_size,
+                seed=config.random_seed
+            )
+        else:
+            engine.population.load_from_jsonl(config.population_file, limit=config.population_size)
         print(f"Loaded {engine.population.size()} personas from {config.population_file}")
     else:
         print(f"Warning: {config.population_file} not found, running with empty population")
@@ -57,27 +72,137 @@ def main():
         for topic_data in config.topics
     ]
 
-    # Initialize candidates from config
-    engine.candidates = [
-        Candidate(
-            candidate_data["id"],
-            candidate_data["name"],
-            candidate_data["description"],
-            topics,
-            engine.llm_client,
-            world_story=config.world_story
-        )
-        for candidate_data in config.candidates
-    ]
+    # Initialize candidates from config (all initial positions are generated concurrently)
+    engine.setup_candidates(config.candidates, topics)
 
     engine.mediator = Mediator("mediator_1", topics=topics, llm_client_instance=engine.llm_client, world_story=config.world_story)
     engine.social_media = SocialMedia()
 
+    if store is not None:
+        engine.setup_opinion_dynamics(store, llm_rows)
+
     print(f"Loaded {len(topics)} debate topics")
-    
+    return engine
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Run the synthetic communities simulation')
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='src/configs/config.yaml',
+        help='Path to configuration YAML file (default: src/configs/config.yaml)'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default=None,
+        metavar='SIMULATION_DIR',
+        help='Resume an interrupted run from the latest checkpoint in SIMULATION_DIR (ignores --config)'
+    )
+    parser.add_argument(
+        '--fork',
+        type=str,
+        default=None,
+        metavar='PARENT_DIR',
+        help='Start a new run from the checkpoint of --fork-epoch in PARENT_DIR (ignores --config)'
+    )
+    parser.add_argument(
+        '--fork-epoch',
+        type=int,
+        default=None,
+        metavar='K',
+        help='Last parent epoch the fork shares (required with --fork)'
+    )
+    parser.add_argument(
+        '--overrides',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='YAML file of config fields to override in the fork'
+    )
+    parser.add_argument(
+        '--set',
+        action='append',
+        default=[],
+        metavar='KEY=VALUE',
+        help='Override a single config field in the fork (value parsed as YAML; repeatable)'
+    )
+    parser.add_argument(
+        '--sweep',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Run the parameter sweep in FILE, executing prefixes shared between runs once (ignores --config)'
+    )
+    parser.add_argument(
+        '--coordinator',
+        type=str,
+        default=None,
+        metavar='HOST:PORT',
+        help='Host the population on workers (cli/population_worker_cli.py) connecting to HOST:PORT; '
+             'the shared key is read from SIMULATION_CLUSTER_KEY'
+    )
+    parser.add_argument(
+        '--min-workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Workers that must be connected before (re)starting an epoch (with --coordinator)'
+    )
+    args = parser.parse_args()
+
+    if args.sweep:
+        sweep = load_sweep(args.sweep)
+        runner = SweepRunner(sweep["runs"], lambda config: create_engine(config, None), sweep_id=sweep["sweep_id"])
+        run_dirs = runner.run()
+        print(f"Sweep completed: {len(run_dirs)} runs in {runner.sweep_dir} "
+              f"({runner.epochs_executed} of {sum(run.num_epochs for run in sweep['runs'])} epochs executed)")
+        return
+
+    if args.fork:
+        if args.fork_epoch is None:
+            parser.error('--fork requires --fork-epoch')
+        overrides = {}
+        if args.overrides:
+            with open(args.overrides, 'r') as f:
+                overrides.update(yaml.safe_load(f) or {})
+        for assignment in args.set:
+            key, separator, value = assignment.partition('=')
+            if not separator:
+                parser.error(f"--set expects KEY=VALUE (got '{assignment}')")
+            overrides[key.strip()] = yaml.safe_load(value)
+        engine = GameEngine.fork(args.fork, args.fork_epoch, overrides)
+        print(f"Forked {args.fork} after epoch {args.fork_epoch} into {engine.simulation_dir}")
+    elif args.resume:
+        engine = GameEngine.resume(args.resume)
+        print(f"Resumed {args.resume} after epoch {engine.epochs_completed - 1} of {engine.config.num_epochs}")
+    else:
+        # Load configuration from YAML file
+        config = Config.from_yaml(args.config)
+        print(f"Loaded configuration from: {args.config}")
+        engine = create_engine(config, args.config)
+
     print(f"Starting simulation with {len(engine.candidates)} candidates")
     print(f"Population size: {engine.population.size()}")
-    
+
+    if args.coordinator:
+        authkey = os.getenv('SIMULATION_CLUSTER_KEY')
+        if not authkey:
+            parser.error('--coordinator requires SIMULATION_CLUSTER_KEY in the environment')
+        pool = WorkerPool(TcpTransport(authkey.encode()).listen(parse_address(args.coordinator)))
+        print(f"Waiting for {args.min_workers} worker(s) on {pool.listener.address[0]}:{pool.listener.address[1]}")
+        coordinator = Coordinator(engine, pool, min_workers=args.min_workers)
+        try:
+            vote_results = coordinator.run()
+        finally:
+            pool.stop()
+        print(f"\nSimulation completed in {coordinator.engine.simulation_dir} "
+              f"({coordinator.recoveries} worker loss(es) recovered)")
+        print(f"Final vote results: {vote_results}")
+        return
+
     results = engine.run()
     
     print("\nSimulation completed")
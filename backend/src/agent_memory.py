@@ -0,0 +1,170 @@
+"""Bounded memory for candidates and the mediator.
+
+An agent's memory is rendered into every debate prompt, so it must not grow
+without bound. AgentMemory keeps it in three parts:
+
+- pinned: the world context, always kept verbatim
+- summary: older experiences compressed by the LLM into a rolling summary
+- recent entries: the latest reflections and reviews, kept verbatim
+
+Entries are only ever appended between compactions, so the rendered text
+grows by exactly the appended entry. A fork (see ``fork``) records the
+entries appended to it, so concurrent forks can be merged by replaying them
+even if they compacted in between. ``compact_async`` folds older entries
+into the summary once the memory exceeds its token budget, trimming the
+summary if the LLM overshoots; the engine calls it before every debate
+question and once per epoch after the debates.
+"""
+
+import copy
+import logging
+from typing import Dict, List, Any, Optional
+
+from . import llm_client
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4  # Rough estimate, good enough for budgeting prompt size
+
+SUMMARY_HEADER = "=== SUMMARY OF EARLIER EXPERIENCES ===\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class AgentMemory:
+    """Pinned context, rolling summary and recent verbatim entries under an optional token budget."""
+
+    def __init__(self, pinned: str = "", token_budget: Optional[int] = None, recent_entries: int = 6):
+        """
+        Args:
+            pinned: Text that is always kept verbatim (world context)
+            token_budget: Approximate token budget of the rendered memory (None: unbounded)
+            recent_entries: Number of latest entries kept verbatim when compacting
+        """
+        self.pinned = pinned
+        self.token_budget = token_budget
+        self.recent_entries = recent_entries
+        self.summary = ""
+        self.entries: List[str] = []
+        self.summarized_entries = 0  # Entries folded into the summary so far
+        self.journal: Optional[List[str]] = None  # Entries appended since fork()
+
+    def render(self) -> str:
+        """Memory text as embedded in prompts."""
+        summary = f"{SUMMARY_HEADER}{self.summary}\n\n" if self.summary else ""
+        return self.pinned + summary + "".join(self.entries)
+
+    def append(self, entry: str) -> None:
+        self.entries.append(entry)
+        if self.journal is not None:
+            self.journal.append(entry)
+
+    def fork(self) -> 'AgentMemory':
+        """Independent copy that records the entries appended to it in `journal`."""
+        fork = copy.deepcopy(self)
+        fork.journal = []
+        return fork
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.render())
+
+    def needs_compaction(self) -> bool:
+        return self.token_budget is not None and bool(self.entries) and self.tokens > self.token_budget
+
+    def _summary_room(self, recent: List[str]) -> int:
+        """Tokens the budget leaves for the summary next to the pinned text and `recent` entries."""
+        return (self.token_budget - estimate_tokens(self.pinned + SUMMARY_HEADER + "\n\n")
+                - estimate_tokens("".join(recent)))
+
+    def _split(self) -> int:
+        """
+        Number of oldest entries to fold into the summary: all but the `recent_entries`
+        latest, and more while the latest would leave less than a quarter of the budget
+        for the summary. At least one, so an oversized summary is re-summarized.
+        """
+        split = max(1, len(self.entries) - self.recent_entries)
+        while split < len(self.entries) and self._summary_room(self.entries[split:]) < self.token_budget // 4:
+            split += 1
+        return split
+
+    def _summary_words(self, recent: List[str]) -> int:
+        """Word target for the summary: what the budget leaves after pinned and recent text."""
+        return max(10, int(self._summary_room(recent) * 0.75))  # ~0.75 words per token
+
+    def _fit_summary(self, summary: str, recent: List[str]) -> str:
+        """Cut `summary` at a word boundary so that it fits its share of the budget."""
+        max_chars = max(0, self._summary_room(recent)) * CHARS_PER_TOKEN
+        if len(summary) <= max_chars:
+            return summary
+        cut = summary[:max_chars]
+        return cut[:cut.rfind(" ")] if " " in cut else cut
+
+    def _summary_prompt(self, owner: str, older: List[str], recent: List[str]) -> str:
+        previous = f"Your summary so far:\n{self.summary}\n\n" if self.summary else ""
+        experiences = "".join(older)
+        return f"""You are {owner}. Condense your memory of earlier experiences into one summary.
+
+{previous}Experiences to add to the summary:
+{experiences}
+
+Write the updated summary in at most {self._summary_words(recent)} words, in the first person. Keep what still
+matters for the coming debates: positions you took or changed, arguments that worked or failed, public
+sentiment and recurring concerns. Drop repetition and minor details."""
+
+    async def compact_async(self, llm_client_instance, owner: str) -> bool:
+        """
+        Fold older entries into the summary if the memory is over budget.
+
+        The most recent entries stay verbatim unless they alone would crowd out the summary
+        (see _split). A summary longer than its share of the budget is cut, so the memory
+        fits the budget afterwards unless the pinned text alone exceeds it.
+
+        Args:
+            llm_client_instance: Client used for the summarization call
+            owner: Who the memory belongs to, e.g. "Alice, a political candidate"
+
+        Returns:
+            True if the memory was compacted
+        """
+        if not self.needs_compaction():
+            return False
+
+        split = self._split()
+        older, recent = self.entries[:split], self.entries[split:]
+        tokens_before = self.tokens
+        try:
+            summary = await llm_client.generate_response_async(
+                llm_client_instance,
+                self._summary_prompt(owner, older, recent),
+                f"You are {owner}. You keep a concise, faithful memory of your own experiences."
+            )
+        except Exception as e:
+            logger.error(f"Error compacting memory of {owner}: {e}")
+            return False
+
+        summary = summary.strip()
+        fitted = self._fit_summary(summary, recent)
+        if len(fitted) < len(summary):
+            logger.warning(f"Summary of {owner}'s memory exceeded the token budget; cut from "
+                           f"~{estimate_tokens(summary)} to ~{estimate_tokens(fitted)} tokens")
+        self.summary = fitted
+        self.entries = recent
+        self.summarized_entries += len(older)
+        logger.info(f"Compacted memory of {owner}: {len(older)} entries summarized, "
+                    f"~{tokens_before} -> ~{self.tokens} tokens")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Approximate memory size by part (for per-epoch reporting)."""
+        return {
+            "tokens": self.tokens,
+            "pinned_tokens": estimate_tokens(self.pinned),
+            "summary_tokens": estimate_tokens(self.summary),
+            "recent_tokens": estimate_tokens("".join(self.entries)),
+            "entries": len(self.entries),
+            "summarized_entries": self.summarized_entries
+        }
@@ -0,0 +1,195 @@
+"""Archetype clustering for sharing belief-update LLM calls across similar personas.
+
+Personas are embedded as a feature matrix (standardized numeric traits plus
+one-hot demographics and current topic votes) and clustered with vectorized
+k-means. The member closest to each centroid is the archetype representative:
+its belief update is computed by the LLM and then propagated to the other
+members, each of which keeps some of its own prior topic beliefs with a
+probability that grows with its distance from the centroid and shrinks with
+its susceptibility.
+"""
+
+import copy
+import random
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FEATURES = [
+    "age",
+    "susceptibility",
+    "trust_institution",
+    "confirmation_bias",
+    "social_network_influence",
+    "risk_aversion",
+    "fairness_value",
+    "personality_traits.openness",
+    "personality_traits.conscientiousness",
+    "personality_traits.extraversion",
+    "personality_traits.agreeableness",
+    "personality_traits.neuroticism",
+]
+
+CATEGORICAL_FEATURES = ["education_level", "ethnicity", "gender", "income_bracket"]
+
+
+@dataclass
+class ArchetypeClustering:
+    """Cluster assignment of a list of personas."""
+    labels: np.ndarray  # cluster index per persona
+    representatives: List[int]  # persona index closest to each centroid
+    distances: np.ndarray  # distance of each persona to its centroid
+
+
+def _feature(features: Dict[str, Any], dotted_name: str) -> Any:
+    value = features
+    for part in dotted_name.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _belief_votes(beliefs: Dict[str, Any]) -> Dict[str, str]:
+    """Extract topic -> preferred candidate from a beliefs dict (both belief formats)."""
+    votes = {}
+    for topic, belief in beliefs.items():
+        if topic == "overall_vote":
+            votes[topic] = str(belief)
+        elif isinstance(belief, dict):
+            votes[topic] = str(belief.get("vote", ""))
+    return votes
+
+
+def persona_feature_matrix(personas: List) -> np.ndarray:
+    """
+    Build a standardized feature matrix for clustering.
+
+    Numeric traits are z-scored (missing values become the column mean);
+    demographics and current topic votes are one-hot encoded.
+    """
+    columns = []
+
+    for name in NUMERIC_FEATURES:
+        raw = [_feature(persona.features, name) for persona in personas]
+        values = np.array([np.nan if not isinstance(v, (int, float)) else float(v) for v in raw])
+        if np.isnan(values).all():
+            continue
+        values = np.where(np.isnan(values), np.nanmean(values), values)
+        std = values.std()
+        columns.append(((values - values.mean()) / std if std > 0 else values - values.mean())[:, None])
+
+    categorical = [
+        [f"{name}={_feature(persona.features, name)}" for name in CATEGORICAL_FEATURES]
+        + [f"{topic}->{vote}" for topic, vote in _belief_votes(persona.beliefs).items()]
+        for persona in personas
+    ]
+    vocabulary = {token: i for i, token in enumerate(sorted(set(t for tokens in categorical for t in tokens)))}
+    if vocabulary:
+        one_hot = np.zeros((len(personas), len(vocabulary)))
+        for row, tokens in enumerate(categorical):
+            one_hot[row, [vocabulary[t] for t in tokens]] = 1.0
+        columns.append(one_hot)
+
+    if not columns:
+        return np.zeros((len(personas), 1))
+    return np.hstack(columns)
+
+
+def _squared_distances(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Pairwise squared Euclidean distances, shape (n_points, n_centroids)."""
+    distances = (X ** 2).sum(axis=1)[:, None] - 2.0 * X @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+    return np.maximum(distances, 0.0)
+
+
+def kmeans(X: np.ndarray, k: int, max_iter: int = 100, seed: Optional[int] = None) -> ArchetypeClustering:
+    """
+    Vectorized k-means with k-means++ initialization.
+
+    Args:
+        X: Feature matrix, shape (n_personas, n_features)
+        k: Number of clusters (capped at the number of personas)
+        max_iter: Maximum number of Lloyd iterations
+        seed: Seed for initialization
+
+    Returns:
+        ArchetypeClustering with labels, representatives and distances
+    """
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    k = max(1, min(k, n))
+
+    # k-means++ seeding
+    centroids = [X[rng.integers(n)]]
+    for _ in range(1, k):
+        closest = _squared_distances(X, np.array(centroids)).min(axis=1)
+        total = closest.sum()
+        probabilities = closest / total if total > 0 else np.full(n, 1.0 / n)
+        centroids.append(X[rng.choice(n, p=probabilities)])
+    centroids = np.array(centroids)
+
+    labels = np.full(n, -1)
+    for _ in range(max_iter):
+        new_labels = _squared_distances(X, centroids).argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, X)
+        occupied = counts > 0
+        centroids[occupied] = sums[occupied] / counts[occupied, None]
+
+    distances = np.sqrt(_squared_distances(X, centroids)[np.arange(n), labels])
+    representatives = []
+    for cluster in range(k):
+        members = np.flatnonzero(labels == cluster)
+        if len(members):
+            representatives.append(int(members[distances[members].argmin()]))
+
+    return ArchetypeClustering(labels=labels, representatives=representatives, distances=distances)
+
+
+def cluster_personas(personas: List, num_archetypes: int, seed: Optional[int] = None) -> ArchetypeClustering:
+    """Cluster personas into archetypes on their features and current beliefs."""
+    return kmeans(persona_feature_matrix(personas), num_archetypes, seed=seed)
+
+
+def propagate_beliefs(
+    representative,
+    member,
+    distance: float,
+    max_distance: float,
+    perturbation: float = 0.3,
+    rng: Optional[random.Random] = None
+) -> None:
+    """
+    Copy a representative's updated beliefs to a cluster member with per-persona perturbation.
+
+    Each topic belief the member already held is kept instead of the representative's with
+    probability ``perturbation * (1 - susceptibility) * (0.5 + 0.5 * distance / max_distance)``,
+    so outlying, stubborn members drift less. The overall vote is then re-derived from the
+    topic votes if any topic was kept.
+    """
+    rng = rng or random
+    susceptibility = member.features.get("susceptibility", 0.5)
+    keep_probability = perturbation * (1.0 - susceptibility) * (0.5 + 0.5 * (distance / max_distance if max_distance > 0 else 0.0))
+
+    updated = copy.deepcopy(representative.beliefs)
+    kept_any = False
+    for topic, belief in member.beliefs.items():
+        if topic != "overall_vote" and topic in updated and rng.random() < keep_probability:
+            updated[topic] = copy.deepcopy(belief)
+            kept_any = True
+
+    if kept_any:
+        topic_votes = [vote for topic, vote in _belief_votes(updated).items() if topic != "overall_vote" and vote]
+        if topic_votes:
+            updated["overall_vote"] = Counter(topic_votes).most_common(1)[0][0]
+
+    member.beliefs = updated
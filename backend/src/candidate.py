@@ -1,8 +1,10 @@
+import asyncio
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from .mediator import Topic, Question, CandidateStatement, MediatorStatement, DebateTranscript
 from . import llm_client
+from .agent_memory import AgentMemory
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,16 @@ class CandidateState:
 
 
 class Candidate:
-    def __init__(self, candidate_id: str, name: str, character: str, topics: List[Topic], llm_client_instance, world_story: str = None):
+    def __init__(
+        self,
+        candidate_id: str,
+        name: str,
+        character: str,
+        topics: List[Topic],
+        llm_client_instance,
+        world_story: str = None,
+        initialize: bool = True
+    ):
         self.id = candidate_id
         self.name = name
         self.character = character
@@ -27,45 +38,50 @@ class Candidate:
         self.llm_client = llm_client_instance
         self.world_story = world_story if world_story else ""
 
-        # Initialize policy positions based on topics
-        self.state = self._initialize_policy_positions()
+        self.memory_manager: AgentMemory = None  # Created with the initial state (see _build_state)
 
-    def _initialize_policy_positions(self) -> CandidateState:
-        """Initialize policy positions for each topic using LLM."""
-        logger.debug(f"{self.name}: Initializing policy positions for {len(self.topics)} topics")
-        policy_positions = {}
+        # Initialize policy positions based on topics (deferred to initialize_async if initialize=False)
+        self.state: CandidateState = self._initialize_policy_positions() if initialize else None
 
-        # Initialize memory with world context if available
-        initial_memory = ""
-        if self.world_story:
-            initial_memory = f"""=== WORLD CONTEXT ===
+    def __getstate__(self) -> Dict[str, Any]:
+        # LLM clients are not picklable; checkpoint.load_checkpoint attaches a new one
+        state = self.__dict__.copy()
+        state["llm_client"] = None
+        return state
+
+    def _initial_memory(self) -> str:
+        """Initial memory holding the world context, if any."""
+        if not self.world_story:
+            return ""
+        logger.debug(f"{self.name}: Initialized with world context in memory ({len(self.world_story)} chars)")
+        return f"""=== WORLD CONTEXT ===
 {self.world_story}
 
 You are a political candidate in this world. Your positions and beliefs are shaped by this context.
 
 """
-            logger.debug(f"{self.name}: Initialized with world context in memory ({len(self.world_story)} chars)")
-
-        for topic in self.topics:
-            logger.debug(f"{self.name}: Generating initial position for topic '{topic.title}' (ID: {topic.id})")
 
-            prompt = f"You are {self.name}, a political candidate with the following character: {self.character}. What is your position on: {topic.title}? {topic.description}. Answer in 2-3 sentences, reflecting your political character."
+    def _initial_position_prompt(self, topic: Topic) -> Tuple[str, str]:
+        """Prompt and system instruction for the initial position on a topic."""
+        logger.debug(f"{self.name}: Generating initial position for topic '{topic.title}' (ID: {topic.id})")
 
-            if self.world_story:
-                prompt += f"\n\nRemember, you are operating in this world context:\n{self.world_story[:500]}..."
+        prompt = f"You are {self.name}, a political candidate with the following character: {self.character}. What is your position on: {topic.title}? {topic.description}. Answer in 2-3 sentences, reflecting your political character."
 
-            system_instruction = f"You are {self.name}, a political candidate. Character: {self.character}. Provide clear, concise policy positions consistent with your character."
+        if self.world_story:
+            prompt += f"\n\nRemember, you are operating in this world context:\n{self.world_story[:500]}..."
 
-            position = llm_client.generate_response(
-                self.llm_client,
-                prompt,
-                system_instruction
-            )
+        system_instruction = f"You are {self.name}, a political candidate. Character: {self.character}. Provide clear, concise policy positions consistent with your character."
+        return prompt, system_instruction
 
+    def _build_state(self, positions: List[str], initial_memory: str) -> CandidateState:
+        """Assemble the initial state from one generated position per topic (in topic order)."""
+        policy_positions = {}
+        for topic, position in zip(self.topics, positions):
             policy_positions[topic.id] = position.strip()
             logger.info(f"{self.name} initial position on {topic.title}: {position.strip()}")
 
         logger.debug(f"{self.name}: Policy position initialization complete")
+        self.memory_manager = AgentMemory(pinned=initial_memory)
         return CandidateState(
             id=self.id,
             name=self.name,
@@ -75,48 +91,92 @@ You are a political candidate in this world. Your positions and beliefs are shap
             world_context=self.world_story
         )
 
-    def read_social_media_signals(self, social_media_feed: str) -> None:
-        """Read social media signals and update policy positions based on public sentiment."""
-        logger.debug(f"{self.name}: read_social_media_signals called with feed length: {len(social_media_feed) if social_media_feed else 0}")
-
-        if not social_media_feed:
+    def _initialize_policy_positions(self) -> CandidateState:
+        """Initialize policy positions for each topic using LLM."""
+        logger.debug(f"{self.name}: Initializing policy positions for {len(self.topics)} topics")
+        initial_memory = self._initial_memory()
+
+        positions = [
+            llm_client.generate_response(self.llm_client, *self._initial_position_prompt(topic))
+            for topic in self.topics
+        ]
+        return self._build_state(positions, initial_memory)
+
+    async def _initialize_policy_positions_async(self) -> CandidateState:
+        """Async version of _initialize_policy_positions; all topics are generated concurrently."""
+        logger.debug(f"{self.name}: Initializing policy positions for {len(self.topics)} topics (async)")
+        initial_memory = self._initial_memory()
+
+        positions = await asyncio.gather(*[
+            llm_client.generate_response_async(self.llm_client, *self._initial_position_prompt(topic))
+            for topic in self.topics
+        ])
+        return self._build_state(positions, initial_memory)
+
+    async def initialize_async(self) -> None:
+        """Generate the initial state of a candidate constructed with initialize=False."""
+        self.state = await self._initialize_policy_positions_async()
+
+    def _remember(self, entry: str) -> None:
+        """Append an entry to memory and refresh the memory text used in prompts."""
+        if self.memory_manager is None:
+            self.memory_manager = AgentMemory(pinned=self.state.memory)
+        self.memory_manager.append(entry)
+        self.state.memory = self.memory_manager.render()
+
+    async def compact_memory_async(self) -> bool:
+        """Summarize older memory entries if memory is over its token budget (see AgentMemory)."""
+        if self.memory_manager is None:
+            return False
+        compacted = await self.memory_manager.compact_async(self.llm_client, f"{self.name}, a political candidate")
+        if compacted:
+            self.state.memory = self.memory_manager.render()
+        return compacted
+
+    def _digest_signals(self, digest) -> Dict[str, str]:
+        return {topic.id: digest.topic_text(topic.id) for topic in self.topics if topic.id in digest.topics}
+
+    def read_social_media_digest(self, digest) -> None:
+        """Update policy positions from a shared FeedDigest (each topic prompt sees only its own digest line)."""
+        if digest.total_posts == 0:
             return
+        self.read_social_media_signals(digest.to_text(), topic_signals=self._digest_signals(digest))
 
-        logger.debug(f"{self.name}: Social media feed content:\n{social_media_feed[:200]}...")  # Log first 200 chars
+    async def read_social_media_digest_async(self, digest) -> None:
+        """Async version of read_social_media_digest."""
+        if digest.total_posts == 0:
+            return
+        await self.read_social_media_signals_async(digest.to_text(), topic_signals=self._digest_signals(digest))
 
-        # Update positions for each topic based on public sentiment
-        for topic in self.topics:
-            current_position = self.state.policy_positions[topic.id]
-            logger.debug(f"{self.name}: Processing topic '{topic.title}' (ID: {topic.id})")
-            logger.debug(f"{self.name}: Current position on {topic.title}: {current_position}")
+    def _signal_prompt(self, topic: Topic, topic_feed: str) -> Tuple[str, str]:
+        """Prompt and system instruction for adjusting the position on a topic to public sentiment."""
+        current_position = self.state.policy_positions[topic.id]
+        logger.debug(f"{self.name}: Processing topic '{topic.title}' (ID: {topic.id})")
+        logger.debug(f"{self.name}: Current position on {topic.title}: {current_position}")
 
-            prompt = f"""Your current position on {topic.title}: {current_position}
+        prompt = f"""Your current position on {topic.title}: {current_position}
 
 Recent public posts:
-{social_media_feed}
+{topic_feed}
 
 Based on public sentiment, should you adjust your stance? Reply with your updated position in 2-3 sentences, or keep the same if no adjustment needed."""
 
-            system_instruction = f"You are {self.name}, a political candidate. Adjust your positions based on public opinion while maintaining authenticity."
+        system_instruction = f"You are {self.name}, a political candidate. Adjust your positions based on public opinion while maintaining authenticity."
+        return prompt, system_instruction
 
-            logger.debug(f"{self.name}: Calling LLM to update position on {topic.title}")
-            updated_position = llm_client.generate_response(
-                self.llm_client,
-                prompt,
-                system_instruction
-            )
-
-            old_position = self.state.policy_positions[topic.id]
-            self.state.policy_positions[topic.id] = updated_position.strip()
-
-            if old_position != updated_position.strip():
-                logger.info(f"{self.name} CHANGED position on {topic.title}")
-                logger.debug(f"{self.name}: Old: {old_position}")
-                logger.debug(f"{self.name}: New: {updated_position.strip()}")
-            else:
-                logger.debug(f"{self.name}: Position unchanged on {topic.title}")
+    def _apply_position(self, topic: Topic, updated_position: str) -> None:
+        old_position = self.state.policy_positions[topic.id]
+        self.state.policy_positions[topic.id] = updated_position.strip()
 
-        # Generate rich memory reflection using LLM
+        if old_position != updated_position.strip():
+            logger.info(f"{self.name} CHANGED position on {topic.title}")
+            logger.debug(f"{self.name}: Old: {old_position}")
+            logger.debug(f"{self.name}: New: {updated_position.strip()}")
+        else:
+            logger.debug(f"{self.name}: Position unchanged on {topic.title}")
+
+    def _signal_reflection_prompt(self, social_media_feed: str) -> Tuple[str, str]:
+        """Prompt and system instruction for the memory reflection after reading social media."""
         memory_prompt = f"""You are {self.name}, a political candidate. You just reviewed social media and considered whether to adjust your positions.
 
 Reflect on this experience in 2-3 sentences as a personal, introspective memory. Focus on:
@@ -131,29 +191,71 @@ Social media posts you saw:
 Write an authentic, first-person reflection as if writing in a private journal. Be honest about your internal reasoning and feelings:"""
 
         system_instruction = f"You are {self.name}, reflecting privately and honestly. Write in first person. Be introspective, thoughtful, and reveal your authentic reasoning - not a public statement, but a private thought."
+        return memory_prompt, system_instruction
+
+    def _apply_signal_reflection(self, memory_reflection: str) -> None:
+        self._remember(f"{memory_reflection.strip()}\n")
+        logger.debug(f"{self.name}: Memory updated with reflection. Total memory length: {len(self.state.memory)}")
+
+    def read_social_media_signals(self, social_media_feed: str, topic_signals: Optional[Dict[str, str]] = None) -> None:
+        """
+        Read social media signals and update policy positions based on public sentiment.
+
+        Args:
+            social_media_feed: Recent posts (or a digest of them)
+            topic_signals: Optional topic_id -> text used instead of the full feed in that topic's prompt
+        """
+        logger.debug(f"{self.name}: read_social_media_signals called with feed length: {len(social_media_feed) if social_media_feed else 0}")
+
+        if not social_media_feed:
+            return
+
+        logger.debug(f"{self.name}: Social media feed content:\n{social_media_feed[:200]}...")  # Log first 200 chars
+
+        # Update positions for each topic based on public sentiment
+        for topic in self.topics:
+            topic_feed = topic_signals.get(topic.id, social_media_feed) if topic_signals else social_media_feed
+            logger.debug(f"{self.name}: Calling LLM to update position on {topic.title}")
+            updated_position = llm_client.generate_response(self.llm_client, *self._signal_prompt(topic, topic_feed))
+            self._apply_position(topic, updated_position)
+
+        # Generate rich memory reflection using LLM
+        memory_reflection = llm_client.generate_response(self.llm_client, *self._signal_reflection_prompt(social_media_feed))
+        self._apply_signal_reflection(memory_reflection)
+
+    async def read_social_media_signals_async(self, social_media_feed: str, topic_signals: Optional[Dict[str, str]] = None) -> None:
+        """
+        Async version of read_social_media_signals.
+
+        The per-topic position updates and the memory reflection do not depend on each
+        other, so all of them run concurrently.
+        """
+        logger.debug(f"{self.name}: read_social_media_signals_async called with feed length: {len(social_media_feed) if social_media_feed else 0}")
 
-        memory_reflection = llm_client.generate_response(
-            self.llm_client,
-            memory_prompt,
-            system_instruction
+        if not social_media_feed:
+            return
+
+        position_prompts = [
+            self._signal_prompt(topic, topic_signals.get(topic.id, social_media_feed) if topic_signals else social_media_feed)
+            for topic in self.topics
+        ]
+        *updated_positions, memory_reflection = await asyncio.gather(
+            *[llm_client.generate_response_async(self.llm_client, *prompt) for prompt in position_prompts],
+            llm_client.generate_response_async(self.llm_client, *self._signal_reflection_prompt(social_media_feed))
         )
 
-        # Update memory with rich reflection
-        self.state.memory += f"{memory_reflection.strip()}\n"
-        logger.debug(f"{self.name}: Memory updated with reflection. Total memory length: {len(self.state.memory)}")
+        for topic, updated_position in zip(self.topics, updated_positions):
+            self._apply_position(topic, updated_position)
+        self._apply_signal_reflection(memory_reflection)
 
-    def craft_debate_statement(
+    def _debate_statement_prompt(
         self,
         question: Question,
         turn_number: int,
-        previous_statements: List[CandidateStatement]
-    ) -> CandidateStatement:
-        """
-        Craft LLM-generated debate statement using current policy position, memory, and debate context.
-
-        The candidate will consider their policy position, past experiences (memory), and the ongoing
-        debate to craft strategic responses that may include rebuttals to opponents.
-        """
+        previous_statements: List[CandidateStatement],
+        rebuttal: bool = False
+    ) -> Tuple[str, str]:
+        """Prompt and system instruction for a debate statement (see craft_debate_statement)."""
         logger.debug(f"{self.name}: craft_debate_statement called for topic '{question.topic.title}', turn {turn_number}")
 
         # Get current policy position for parent topic
@@ -203,6 +305,10 @@ Write an authentic, first-person reflection as if writing in a private journal.
             logger.debug(f"{self.name}: No previous statements - opening statement")
 
         # Strategic instructions
+        if rebuttal:
+            prompt += """REBUTTAL ROUND: All candidates have answered. Respond directly to your opponents' answers above.
+
+            """
         prompt += """INSTRUCTIONS:
             Craft a compelling 2-3 sentence statement that:
             1. Aligns with YOUR CORE POSITION and reflects your experiences
@@ -222,12 +328,9 @@ Write an authentic, first-person reflection as if writing in a private journal.
             - Be concise but impactful (2-3 sentences)
             - Sound authentic and conversational, not robotic"""
 
-        response = llm_client.generate_response(
-            self.llm_client,
-            prompt,
-            system_instruction
-        )
+        return prompt, system_instruction
 
+    def _build_statement(self, question: Question, response: str) -> CandidateStatement:
         generated_statement = response.strip()
         logger.info(f"{self.name}: Generated debate statement: {generated_statement[:100]}...")
 
@@ -241,13 +344,38 @@ Write an authentic, first-person reflection as if writing in a private journal.
             question=question
         )
 
-    def reflect_on_debate(self, question: Question, debate_transcript: DebateTranscript) -> None:
+    def craft_debate_statement(
+        self,
+        question: Question,
+        turn_number: int,
+        previous_statements: List[CandidateStatement],
+        rebuttal: bool = False
+    ) -> CandidateStatement:
         """
-        Reflect on the completed debate and update memory with insights and belief changes.
+        Craft LLM-generated debate statement using current policy position, memory, and debate context.
 
-        This allows the candidate to process the full debate, consider opponents' arguments,
-        evaluate their own performance, and potentially update their beliefs and understanding.
+        The candidate will consider their policy position, past experiences (memory), and the ongoing
+        debate to craft strategic responses that may include rebuttals to opponents. With
+        `rebuttal`, the statement answers the opponents' statements of the round just finished.
         """
+        prompt, system_instruction = self._debate_statement_prompt(question, turn_number, previous_statements, rebuttal)
+        response = llm_client.generate_response(self.llm_client, prompt, system_instruction)
+        return self._build_statement(question, response)
+
+    async def craft_debate_statement_async(
+        self,
+        question: Question,
+        turn_number: int,
+        previous_statements: List[CandidateStatement],
+        rebuttal: bool = False
+    ) -> CandidateStatement:
+        """Async version of craft_debate_statement for answering concurrently with other candidates."""
+        prompt, system_instruction = self._debate_statement_prompt(question, turn_number, previous_statements, rebuttal)
+        response = await llm_client.generate_response_async(self.llm_client, prompt, system_instruction)
+        return self._build_statement(question, response)
+
+    def _debate_reflection_prompt(self, question: Question, debate_transcript: DebateTranscript) -> Tuple[str, str]:
+        """Prompt and system instruction for reflecting on a finished debate question."""
         logger.debug(f"{self.name}: reflect_on_debate called for question '{question.text}' on topic '{question.topic.title}'")
         logger.debug(f"{self.name}: Debate transcript length: {len(debate_transcript.statements)}")
 
@@ -279,15 +407,30 @@ Write an authentic, first-person reflection as if writing in a private journal.
         Be brutally honest with yourself. Acknowledge when opponents made good points.
         Admit doubts or uncertainties. Show intellectual growth and humility where appropriate.
         Write in first person, be vulnerable and authentic - this is for you alone."""
+        return reflection_prompt, system_instruction
 
-        logger.debug(f"{self.name}: Calling LLM to generate post-debate reflection")
-        reflection = llm_client.generate_response(
-            self.llm_client,
-            reflection_prompt,
-            system_instruction
-        )
-
-        # Update memory with reflection
-        self.state.memory += f"\n--- After debate on '{question.text}' ({question.topic.title}) ---\n{reflection.strip()}\n"
+    def _apply_debate_reflection(self, question: Question, reflection: str) -> None:
+        self._remember(f"\n--- After debate on '{question.text}' ({question.topic.title}) ---\n{reflection.strip()}\n")
         logger.info(f"{self.name}: Completed reflection on debate question: '{question.text}' (topic: {question.topic.title})")
         logger.debug(f"{self.name}: Memory now {len(self.state.memory)} characters")
+
+    def reflect_on_debate(self, question: Question, debate_transcript: DebateTranscript) -> None:
+        """
+        Reflect on the completed debate and update memory with insights and belief changes.
+
+        This allows the candidate to process the full debate, consider opponents' arguments,
+        evaluate their own performance, and potentially update their beliefs and understanding.
+        """
+        prompt, system_instruction = self._debate_reflection_prompt(question, debate_transcript)
+
+        logger.debug(f"{self.name}: Calling LLM to generate post-debate reflection")
+        reflection = llm_client.generate_response(self.llm_client, prompt, system_instruction)
+        self._apply_debate_reflection(question, reflection)
+
+    async def reflect_on_debate_async(self, question: Question, debate_transcript: DebateTranscript) -> None:
+        """Async version of reflect_on_debate for reflecting concurrently with other candidates."""
+        prompt, system_instruction = self._debate_reflection_prompt(question, debate_transcript)
+
+        logger.debug(f"{self.name}: Calling LLM to generate post-debate reflection (async)")
+        reflection = await llm_client.generate_response_async(self.llm_client, prompt, system_instruction)
+        self._apply_debate_reflection(question, reflection)
@@ -0,0 +1,116 @@
+"""Full-state checkpoints of a simulation run.
+
+After every epoch the engine is pickled together with the global random
+states into ``<simulation_dir>/checkpoints/epoch_XXXX.pkl.gz``. The pickle
+holds everything ``epochs.jsonl`` cannot reconstruct: persona beliefs,
+knowledge and chats, candidate and mediator memory, the social media
+platform with its reaction log, debate transcripts and the opinion
+dynamics surrogate.
+
+LLM clients are not picklable (the Gemini client is the configured module),
+so every agent drops its client when pickled (``__getstate__``) and
+``load_checkpoint`` attaches a fresh one.
+"""
+
+import os
+import gzip
+import pickle
+import random
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from . import llm_client
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(simulation_dir, epoch: int) -> Path:
+    """Path of the checkpoint written after `epoch`."""
+    return Path(simulation_dir) / CHECKPOINT_DIR / f"epoch_{epoch:04d}.pkl.gz"
+
+
+def latest_checkpoint(simulation_dir) -> Optional[Path]:
+    """Checkpoint of the latest completed epoch in a simulation directory, or None."""
+    checkpoints = sorted((Path(simulation_dir) / CHECKPOINT_DIR).glob("epoch_*.pkl.gz"))
+    return checkpoints[-1] if checkpoints else None
+
+
+def save_checkpoint(engine, path=None) -> Path:
+    """
+    Pickle the engine after its current epoch.
+
+    The file is written to a temporary name and renamed, so a crash while
+    writing never leaves a truncated checkpoint behind.
+
+    Returns:
+        Path of the written checkpoint
+    """
+    path = Path(path) if path else checkpoint_path(engine.simulation_dir, engine.current_epoch)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "epoch": engine.current_epoch,
+        "engine": engine,
+        "random_state": random.getstate(),
+        "numpy_random_state": np.random.get_state(),
+        "response_cache": llm_client.sharing_state()
+    }
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+    logger.info(f"Saved checkpoint of epoch {engine.current_epoch} to {path} ({path.stat().st_size / 1024:.0f} KiB)")
+    return path
+
+
+def read_checkpoint(path) -> Dict[str, Any]:
+    """Unpickle a checkpoint payload without restoring random state or LLM clients."""
+    with gzip.open(Path(path), "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {payload.get('version')} in {path}")
+    return payload
+
+
+def attach_llm_client(engine) -> None:
+    """Create an LLM client and give it to the engine and every agent restored without one."""
+    load_dotenv()
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in environment")
+
+    engine.llm_client = llm_client.create_client(api_key)
+    if engine.mediator:
+        engine.mediator.llm_client = engine.llm_client
+    for candidate in engine.candidates:
+        candidate.llm_client = engine.llm_client
+    for persona in engine.population.personas:
+        persona.llm_client = engine.llm_client
+
+
+def load_checkpoint(path):
+    """
+    Restore a GameEngine from a checkpoint, ready to continue with the next epoch.
+
+    Restores the global random states (and the occurrence counts of a configured
+    response cache) as they were after the checkpointed epoch and attaches a
+    fresh LLM client to the engine and all agents.
+    """
+    payload = read_checkpoint(path)
+    engine = payload["engine"]
+    random.setstate(payload["random_state"])
+    np.random.set_state(payload["numpy_random_state"])
+    llm_client.restore_sharing_state(payload.get("response_cache"))
+    attach_llm_client(engine)
+
+    logger.info(f"Loaded checkpoint of epoch {payload['epoch']} from {path}")
+    return engine
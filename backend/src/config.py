@@ -12,9 +12,46 @@ class Config:
     num_epochs: int
     random_seed: int
 
+    # How candidates answer within a turn: "sequential" (each sees the previous candidates'
+    # statements of the same turn) or "simultaneous" (all answer concurrently from previous turns,
+    # optionally followed by one rebuttal turn)
+    debate_protocol: str = "sequential"
+    rebuttal_turn: bool = False
+
+    # Debate all topics of an epoch concurrently (candidate/mediator state is merged in topic order)
+    parallel_topics: bool = False
+
+    # Stream each published transcript to the population while debates continue; ordering
+    # "deterministic" processes transcripts in (topic, question) order, "arrival" as they are
+    # published. pipeline_belief_updates "per_epoch" updates beliefs once after the last
+    # transcript, which with "deterministic" gives the same personas as the non-pipelined run.
+    # "per_transcript" also updates beliefs after every transcript to overlap those LLM calls
+    # with the debates: topics x questions_per_topic updates per persona per epoch instead of
+    # one (9x the belief-update LLM calls at 3 topics x 3 questions), and different beliefs
+    pipeline_debates: bool = False
+    pipeline_ordering: str = "deterministic"
+    pipeline_belief_updates: str = "per_epoch"
+
+    # Optional batched question planning: each topic's questions and introductions are planned in
+    # one LLM call per epoch and re-planned only when a debate diverges from its planned question.
+    # {"divergence_threshold": float}  (share of a question's key terms the answers must use)
+    question_planning: Dict[str, Any] = None
+
     # Social media parameters
     post_probability: float = 0.07
     reaction_probability: float = 0.4
+    feed_size: int = None  # Personalized top-k feed per persona (None: everyone sees every post)
+    post_retention_epochs: int = None  # Epochs a post stays active before moving to the on-disk archive (None: forever)
+
+    # Optional map-reduce feed summarization (see feed_digest.py): candidates and the mediator
+    # read one per-topic sentiment digest per epoch instead of the raw feed.
+    # {"chunk_size": int, "max_themes": int}
+    feed_digest: Dict[str, Any] = None
+
+    # Optional bound on candidate and mediator memory (see agent_memory.py): older entries are
+    # summarized before every debate question and after the debates when memory exceeds the budget.
+    # {"token_budget": int, "recent_entries": int}
+    agent_memory: Dict[str, Any] = None
 
     # Peer chat parameters
     num_rounds_mean: int = 3
@@ -24,10 +61,37 @@ class Config:
     max_change_percentage: float = 0.5
     max_concurrent: int = 20
 
+    # Advance each persona through the epoch's population stages independently (see
+    # persona_dataflow.py) instead of waiting for every persona at each phase boundary
+    persona_dataflow: bool = False
+
+    # Partition the personas across this many worker processes (see population_shards.py;
+    # None: all personas in the engine's process)
+    population_shards: int = None
+
+    # Optional archetype sharing of belief updates (see archetypes.py):
+    # {"num_archetypes": int, "susceptibility_threshold": float, "perturbation": float}
+    archetypes: Dict[str, Any] = None
+
+    # Optional hybrid mode (see opinion_dynamics.py): population_size personas get LLM
+    # belief updates and calibrate a numeric surrogate over every persona in population_file.
+    # {"neighbors": int, "confidence": float}
+    opinion_dynamics: Dict[str, Any] = None
+
+    # Pickle the full simulation state after every epoch (see checkpoint.py) for --resume
+    checkpoints: bool = True
+
     # Data files
     population_file: str = "data/personas/swiss_population_50.jsonl"
     world_file: str = None
 
+    # Optional demographic selection from population_file (see population_query.py)
+    population_query: Dict[str, Any] = None
+
+    # Optional stratified sampling with post-stratification weights (see stratified_sampling.py):
+    # {"strata": {field: null | [bin edges]}, "target_size": int}
+    population_sampling: Dict[str, Any] = None
+
     # Topics and candidates
     topics: List[Dict[str, str]] = None
     candidates: List[Dict[str, str]] = None
@@ -0,0 +1,383 @@
+"""Coordinator/worker mode: one simulation with its population spread over hosts.
+
+The coordinator process runs the GameEngine as usual, except that its
+population is a DistributedPopulation: personas are dealt to the workers
+connected to a WorkerPool instead of to local processes. Everything else
+(candidates, mediator, social media, all random decisions) stays in the
+coordinator, exactly like ShardedPopulation (population_shards.py), whose
+planning and lockstep chat logic this reuses unchanged.
+
+    # coordinator
+    pool = WorkerPool(TcpTransport(authkey).listen(("0.0.0.0", 7070)))
+    Coordinator(engine, pool, min_workers=3).run()
+
+    # every worker host
+    run_worker(TcpTransport(authkey), ("coordinator-host", 7070))
+
+Workers say hello, then heartbeat every `heartbeat_interval` seconds from a
+separate thread while they execute commands. A worker is lost when its
+channel closes or its heartbeats stop for `heartbeat_timeout` seconds; the
+pending call then raises WorkerLost.
+
+State is synced once per epoch: the coordinator forces checkpoints on, and
+checkpointing pickles the population, which pulls every persona's full state
+back from the workers. On WorkerLost the Coordinator reloads the last epoch
+checkpoint (a setup snapshot before epoch 0), deals the personas to the
+workers that are alive then (including newly connected ones) and runs the
+interrupted epoch again. The checkpoint restores the random state too, so the
+repeated epoch makes the same decisions as the interrupted one would have.
+"""
+
+import os
+import time
+import queue
+import socket
+import asyncio
+import logging
+import itertools
+import threading
+import traceback
+import dataclasses
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .checkpoint import CHECKPOINT_DIR, save_checkpoint, latest_checkpoint
+from .game_engine import GameEngine
+from .population import Population
+from .population_shards import ShardWorker, ShardedPopulation
+from .transport import Channel, ChannelClosed, Listener, Transport
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 1.0
+HEARTBEAT_TIMEOUT = 10.0
+
+_LOST = object()  # Put into a worker's result queue when its channel closes
+
+
+class WorkerLost(RuntimeError):
+    """A worker disconnected or stopped heartbeating while the coordinator depended on it."""
+
+    def __init__(self, worker_id: str, reason: str):
+        super().__init__(f"Worker {worker_id} lost: {reason}")
+        self.worker_id = worker_id
+
+
+# ---------- worker role ----------
+
+def serve(channel: Channel, worker_id: str, heartbeat_interval: float = HEARTBEAT_INTERVAL) -> None:
+    """
+    Host a slice of the population: execute the coordinator's commands until told to stop.
+
+    Messages from the coordinator are (request_id, command, payload) with the
+    commands of ShardWorker; replies are ("result", request_id, "ok"|"error", result).
+    """
+    worker = ShardWorker()
+    loop = asyncio.new_event_loop()
+    stopped = threading.Event()
+
+    def heartbeat():
+        while not stopped.wait(heartbeat_interval):
+            try:
+                channel.send(("heartbeat", worker_id))
+            except ChannelClosed:
+                return
+
+    channel.send(("hello", worker_id))
+    threading.Thread(target=heartbeat, name=f"heartbeat-{worker_id}", daemon=True).start()
+    try:
+        while True:
+            try:
+                request_id, command, payload = channel.recv()
+            except ChannelClosed:
+                logger.warning(f"Worker {worker_id}: coordinator went away")
+                break
+            if command == "stop":
+                break
+            try:
+                reply = ("result", request_id, "ok", loop.run_until_complete(getattr(worker, command)(**payload)))
+            except Exception:
+                reply = ("result", request_id, "error", traceback.format_exc())
+            channel.send(reply)
+    finally:
+        stopped.set()
+        channel.close()
+        loop.close()
+    logger.info(f"Worker {worker_id} stopped")
+
+
+def run_worker(transport: Transport, address, worker_id: Optional[str] = None, heartbeat_interval: float = HEARTBEAT_INTERVAL) -> None:
+    """Connect to a coordinator and serve it (worker_id defaults to host:pid)."""
+    if worker_id is None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Worker {worker_id} connecting to {address}")
+    serve(transport.connect(address), worker_id, heartbeat_interval)
+
+
+# ---------- coordinator role ----------
+
+class RemoteWorker:
+    """Coordinator-side handle of a connected worker."""
+
+    def __init__(self, worker_id: str, channel: Channel):
+        self.id = worker_id
+        self.channel = channel
+        self.last_seen = time.monotonic()
+        self.connected = True
+        self.results: queue.Queue = queue.Queue()
+
+    def send(self, request_id: int, command: str, payload: Dict[str, Any]) -> None:
+        self.channel.send((request_id, command, payload))
+
+
+class WorkerPool:
+    """Workers connected to the coordinator, with their liveness tracked by heartbeats."""
+
+    def __init__(self, listener: Listener, heartbeat_timeout: float = HEARTBEAT_TIMEOUT):
+        """
+        Args:
+            listener: Listener of the transport workers connect to (accepting starts immediately)
+            heartbeat_timeout: Seconds without any message after which a worker counts as lost
+        """
+        self.listener = listener
+        self.heartbeat_timeout = heartbeat_timeout
+        self.workers: List[RemoteWorker] = []
+        self._request_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="worker-pool-accept", daemon=True)
+        self._accept_thread.start()
+
+    def _accept_loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                channel = self.listener.accept(timeout=0.5)
+            except TimeoutError:
+                continue
+            except ChannelClosed as error:
+                if self._stopped.is_set():
+                    return
+                logger.warning(f"Rejected a worker connection: {error}")
+                continue
+            try:
+                kind, worker_id = channel.recv(timeout=self.heartbeat_timeout)
+                if kind != "hello":
+                    raise ValueError(f"expected hello, got {kind}")
+            except (TimeoutError, ChannelClosed, ValueError) as error:
+                logger.warning(f"Dropped a worker connection without a valid hello: {error}")
+                channel.close()
+                continue
+
+            worker = RemoteWorker(str(worker_id), channel)
+            with self._lock:
+                self.workers.append(worker)
+            threading.Thread(target=self._receive, args=(worker,), name=f"worker-{worker.id}", daemon=True).start()
+            logger.info(f"Worker {worker.id} connected ({len(self.live_workers())} live)")
+
+    def _receive(self, worker: RemoteWorker) -> None:
+        """Route a worker's messages: heartbeats refresh liveness, results go to its queue."""
+        while True:
+            try:
+                message = worker.channel.recv()
+            except ChannelClosed:
+                break
+            worker.last_seen = time.monotonic()
+            if message[0] == "result":
+                worker.results.put(message[1:])
+        worker.connected = False
+        worker.results.put(_LOST)
+        if not self._stopped.is_set():
+            logger.warning(f"Worker {worker.id} disconnected")
+
+    def is_alive(self, worker: RemoteWorker) -> bool:
+        return worker.connected and time.monotonic() - worker.last_seen <= self.heartbeat_timeout
+
+    def live_workers(self) -> List[RemoteWorker]:
+        with self._lock:
+            return [worker for worker in self.workers if self.is_alive(worker)]
+
+    def wait_for_workers(self, count: int, timeout: Optional[float] = None) -> List[RemoteWorker]:
+        """Block until at least `count` workers are alive; returns them."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            workers = self.live_workers()
+            if len(workers) >= count:
+                return workers
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Only {len(workers)} of {count} workers connected within {timeout}s")
+            time.sleep(0.05)
+
+    def next_request_id(self) -> int:
+        return next(self._request_ids)
+
+    def stop(self) -> None:
+        """Stop all workers and stop accepting new ones."""
+        self._stopped.set()
+        self.listener.close()
+        with self._lock:
+            workers = list(self.workers)
+        for worker in workers:
+            try:
+                worker.send(self.next_request_id(), "stop", {})
+            except ChannelClosed:
+                pass
+            worker.channel.close()
+        self._accept_thread.join(timeout=5)
+
+
+class DistributedPopulation(ShardedPopulation):
+    """ShardedPopulation whose shards are the live workers of a WorkerPool."""
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, pool: WorkerPool, world_story: str = None):
+        """
+        Args:
+            pool: Pool of connected workers; its live workers at first use become the shards
+            world_story: World context passed to personas
+        """
+        super().__init__(num_shards=1, world_story=world_story)
+        self.pool = pool
+
+    @classmethod
+    def adopt(cls, population: Population, pool: WorkerPool) -> 'DistributedPopulation':
+        """Distributed population with the personas (and vote state) of an existing population."""
+        population.close()
+        distributed = cls(pool, world_story=population.world_story)
+        distributed.personas = population.personas
+        distributed.stratum_sizes = population.stratum_sizes
+        distributed.last_votes = population.last_votes
+        return distributed
+
+    def _start_shards(self) -> List[RemoteWorker]:
+        workers = self.pool.live_workers()
+        if not workers:
+            raise RuntimeError("No live workers to host the population")
+        return workers
+
+    def _stop_shards(self) -> None:
+        pass  # Workers stay in the pool; the next load() replaces their personas
+
+    def _call(self, commands: Dict[int, Tuple[str, Dict[str, Any]]]) -> Dict[int, Any]:
+        """Send one command to each listed worker and wait for all results, watching their heartbeats."""
+        with self._lock:
+            try:
+                pending = {}
+                for shard, (command, payload) in commands.items():
+                    worker = self._shards[shard]
+                    request_id = self.pool.next_request_id()
+                    worker.send(request_id, command, payload)
+                    pending[shard] = (worker, request_id)
+
+                results = {}
+                errors = []
+                for shard, (worker, request_id) in pending.items():
+                    status, result = self._await_result(worker, request_id)
+                    if status == "ok":
+                        results[shard] = result
+                    else:
+                        errors.append(f"worker {worker.id}:\n{result}")
+            except WorkerLost:
+                # The lost personas' state is gone: drop the partition, the coordinator rolls back
+                self._shards = None
+                raise
+            except ChannelClosed as error:
+                self._shards = None
+                raise WorkerLost(worker.id, str(error)) from error
+        if errors:
+            raise RuntimeError("Population worker failed: " + "\n".join(errors))
+        return results
+
+    def _await_result(self, worker: RemoteWorker, request_id: int) -> Tuple[str, Any]:
+        while True:
+            try:
+                message = worker.results.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                if not self.pool.is_alive(worker):
+                    raise WorkerLost(worker.id, f"no heartbeat for {self.pool.heartbeat_timeout}s") from None
+                continue
+            if message is _LOST:
+                raise WorkerLost(worker.id, "disconnected")
+            received_id, status, result = message
+            if received_id == request_id:
+                return status, result
+            # Otherwise a late reply to a call abandoned when another worker was lost
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state["pool"] = None  # Reattached by the Coordinator after loading a checkpoint
+        return state
+
+
+class Coordinator:
+    """Runs a GameEngine with its population on remote workers, recovering from lost workers."""
+
+    def __init__(
+        self,
+        engine: GameEngine,
+        pool: WorkerPool,
+        min_workers: int = 1,
+        worker_wait: Optional[float] = 300.0,
+        max_recoveries: int = 3
+    ):
+        """
+        Args:
+            engine: Set-up (or resumed) engine; its population moves to the workers
+            pool: Pool the workers connect to
+            min_workers: Workers that must be alive before (re)starting an epoch
+            worker_wait: Seconds to wait for min_workers (None: forever)
+            max_recoveries: Worker losses to recover from before giving up
+        """
+        if engine.config.archetypes or engine.config.persona_dataflow:
+            raise ValueError("Distributed populations cannot be combined with archetypes or persona_dataflow")
+        self.engine = engine
+        self.pool = pool
+        self.min_workers = min_workers
+        self.worker_wait = worker_wait
+        self.max_recoveries = max_recoveries
+        self.recoveries = 0
+        self.setup_checkpoint: Optional[Path] = None
+
+    def run(self, final_vote: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Run the remaining epochs (and the final vote), reloading the last epoch after a worker loss.
+
+        Returns:
+            Final vote results, or None without a final vote
+        """
+        engine = self.engine
+        # Checkpoints are the per-epoch state sync that recovery rolls back to
+        engine.config = dataclasses.replace(engine.config, checkpoints=True)
+        if engine.simulation_file is None:
+            engine.initialize_simulation_output()
+        if isinstance(engine.population, DistributedPopulation):
+            engine.population.pool = self.pool  # Resumed from a distributed run's checkpoint
+        else:
+            engine.population = DistributedPopulation.adopt(engine.population, self.pool)
+        if engine.epochs_completed == 0:
+            self.setup_checkpoint = save_checkpoint(engine, Path(engine.simulation_dir) / CHECKPOINT_DIR / "setup.pkl.gz")
+
+        while True:
+            self.pool.wait_for_workers(self.min_workers, self.worker_wait)
+            try:
+                self.engine.run()
+                vote_results = None
+                if final_vote and self.engine.population.size() > 0 and self.engine.candidates:
+                    vote_results = self.engine.conduct_final_vote()
+                    self.engine.save_final_vote(vote_results)
+                self.engine.population.close()
+                return vote_results
+            except WorkerLost as error:
+                self.recoveries += 1
+                if self.recoveries > self.max_recoveries:
+                    raise
+                logger.warning(f"{error}; recovery {self.recoveries}/{self.max_recoveries}: "
+                               f"repeating epoch {self.engine.epochs_completed} on the live workers")
+                self.engine = self._rollback()
+
+    def _rollback(self) -> GameEngine:
+        simulation_dir = self.engine.simulation_dir
+        path = latest_checkpoint(simulation_dir) or self.setup_checkpoint
+        engine = GameEngine.from_checkpoint(path, simulation_dir)
+        engine.population.pool = self.pool
+        return engine
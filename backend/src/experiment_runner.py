@@ -0,0 +1,291 @@
+"""Run many simulations concurrently on a process pool.
+
+An experiment is a set of config files, each run for a number of replicates
+(replicate k uses random_seed + k - 1 and is written to
+``<base_dir>/<experiment_id>/<config stem>_<k>/``). All worker processes share:
+
+- one RateBudget, so together they stay within the API quota
+- one ResponseCache, so a failed run that is retried replays the responses it
+  already received instead of paying for them again
+
+Failed runs are retried up to ``max_retries`` times; a retry resumes from the
+run's latest checkpoint when there is one. When all runs are done the runner
+writes ``index.json`` next to the run directories, summarizing status,
+attempts, final votes and LLM usage of every run.
+"""
+
+import glob
+import json
+import time
+import random
+import shutil
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from . import llm_client
+from .config import Config
+from .game_engine import GameEngine
+from .checkpoint import latest_checkpoint
+from .rate_budget import RateBudget
+from .response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Shared resources of a worker process, set by _init_worker
+_worker_cache_path: Optional[str] = None
+_worker_rate_budget: Optional[RateBudget] = None
+
+
+def find_configs(patterns: List[str]) -> List[Path]:
+    """
+    Resolve config directories and glob patterns to config files.
+
+    Args:
+        patterns: Directories (all *.yaml / *.yml inside) or glob patterns
+
+    Returns:
+        Sorted config paths of each pattern, in pattern order, without duplicates
+    """
+    configs: List[Path] = []
+    for pattern in patterns:
+        if Path(pattern).is_dir():
+            matches = sorted(list(Path(pattern).glob("*.yaml")) + list(Path(pattern).glob("*.yml")))
+        else:
+            matches = sorted(Path(match) for match in glob.glob(pattern))
+        if not matches:
+            raise FileNotFoundError(f"No config files match {pattern}")
+        configs.extend(match for match in matches if match not in configs)
+    return configs
+
+
+@dataclass
+class ExperimentJob:
+    """One replicate of one config."""
+    config_path: str
+    replicate: int  # 1-based
+    simulation_id: str
+    attempts: int = 0
+
+
+def _init_worker(cache_path: Optional[str], rate_budget: Optional[RateBudget]) -> None:
+    global _worker_cache_path, _worker_rate_budget
+    _worker_cache_path = cache_path
+    _worker_rate_budget = rate_budget
+
+
+def _run_job(job: ExperimentJob, experiment_dir: str, engine_factory: Callable[[Config, str], GameEngine]) -> Dict[str, Any]:
+    """Run (or resume) one simulation in a worker process and summarize the outcome."""
+    start = time.perf_counter()
+    simulation_dir = Path(experiment_dir) / job.simulation_id
+    cache = ResponseCache(_worker_cache_path, namespace=f"replicate-{job.replicate}") if _worker_cache_path else None
+    budget_before = _worker_rate_budget.stats() if _worker_rate_budget else None
+    llm_client.configure_sharing(cache, _worker_rate_budget)
+
+    result: Dict[str, Any] = {
+        "simulation_id": job.simulation_id,
+        "config": job.config_path,
+        "replicate": job.replicate,
+        "attempts": job.attempts,
+        "simulation_dir": str(simulation_dir)
+    }
+    try:
+        if latest_checkpoint(simulation_dir) is not None:
+            engine = GameEngine.resume(simulation_dir)
+            result["resumed_after_epoch"] = engine.epochs_completed - 1
+        else:
+            if simulation_dir.exists():
+                shutil.rmtree(simulation_dir)  # Partial output of an attempt that failed before its first checkpoint
+            config = Config.from_yaml(job.config_path)
+            config.random_seed += job.replicate - 1
+            random.seed(config.random_seed)
+            np.random.seed(config.random_seed)
+            engine = engine_factory(config, job.config_path)
+            engine.simulation_id = job.simulation_id
+            engine.initialize_simulation_output(experiment_dir)
+            engine.write_effective_config()
+
+        engine.run()
+        final_vote = None
+        if engine.population.size() > 0 and engine.candidates:
+            final_vote = engine.conduct_final_vote()
+            engine.save_final_vote(final_vote)
+        engine.population.close()
+        result.update(status="completed", random_seed=engine.config.random_seed,
+                      epochs_completed=engine.epochs_completed, final_vote=final_vote)
+    except Exception as e:
+        logger.exception(f"Run {job.simulation_id} failed (attempt {job.attempts})")
+        result.update(status="failed", error=f"{type(e).__name__}: {e}")
+    finally:
+        llm_client.configure_sharing()
+
+    llm_usage: Dict[str, Any] = {}
+    if cache is not None:
+        llm_usage["cache"] = cache.stats()
+    if budget_before is not None:
+        budget_after = _worker_rate_budget.stats()
+        llm_usage["requests"] = budget_after["requests"] - budget_before["requests"]
+        llm_usage["waited_seconds"] = round(budget_after["waited_seconds"] - budget_before["waited_seconds"], 3)
+    result["llm"] = llm_usage
+    result["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+class ExperimentRunner:
+    """Run every replicate of a set of configs on a process pool under one rate budget and cache."""
+
+    def __init__(
+        self,
+        config_paths: List[Path],
+        engine_factory: Callable[[Config, str], GameEngine],
+        replicates: int = 1,
+        base_dir: str = "data/simulation",
+        experiment_id: Optional[str] = None,
+        processes: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        use_cache: bool = True,
+        max_retries: int = 1
+    ):
+        """
+        Args:
+            config_paths: Config files of the experiment
+            engine_factory: Builds a set-up engine from a config and its path; must be picklable
+                (a module-level function) unless processes is 0
+            replicates: Runs per config
+            base_dir: Base directory for simulation outputs
+            experiment_id: Name of the experiment directory (default: timestamp)
+            processes: Worker processes (default: CPU count; 0 runs everything in this process)
+            requests_per_minute: Global LLM request budget of all workers (None: unlimited)
+            use_cache: Share an LLM response cache between runs and attempts
+            max_retries: Extra attempts for runs that fail
+        """
+        if replicates < 1:
+            raise ValueError(f"replicates must be at least 1 (got {replicates})")
+        self.config_paths = [Path(path) for path in config_paths]
+        self.engine_factory = engine_factory
+        self.replicates = replicates
+        self.experiment_id = experiment_id or datetime.now().strftime("%Y%m%d_%H%M%S_experiment")
+        self.experiment_dir = Path(base_dir) / self.experiment_id
+        self.processes = multiprocessing.cpu_count() if processes is None else processes
+        self.requests_per_minute = requests_per_minute
+        self.cache_path = self.experiment_dir / "response_cache.sqlite" if use_cache else None
+        self.max_retries = max_retries
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def jobs(self) -> List[ExperimentJob]:
+        jobs = [
+            ExperimentJob(str(path), replicate, f"{path.stem}_{replicate}")
+            for path in self.config_paths
+            for replicate in range(1, self.replicates + 1)
+        ]
+        simulation_ids = [job.simulation_id for job in jobs]
+        if len(set(simulation_ids)) != len(simulation_ids):
+            raise ValueError("Config file names must be unique (run directories are named after them)")
+        return jobs
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run all jobs, retrying failures, and write the summary index.
+
+        Returns:
+            The summary index (also saved as index.json in the experiment directory)
+        """
+        jobs = self.jobs()
+        self.experiment_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        context = multiprocessing.get_context()
+        rate_budget = RateBudget(self.requests_per_minute, context) if self.requests_per_minute else None
+        cache_path = str(self.cache_path) if self.cache_path else None
+        logger.info(f"Experiment {self.experiment_id}: {len(jobs)} runs on {self.processes or 1} process(es)")
+
+        if self.processes == 0:
+            _init_worker(cache_path, rate_budget)
+            pending = list(jobs)
+            while pending:
+                job = pending.pop(0)
+                job.attempts += 1
+                if self._record(job, _run_job(job, str(self.experiment_dir), self.engine_factory)):
+                    pending.append(job)
+            _init_worker(None, None)
+        else:
+            self._run_pool(jobs, context, cache_path, rate_budget)
+
+        return self._write_index(jobs, time.perf_counter() - start)
+
+    def _run_pool(self, jobs: List[ExperimentJob], context, cache_path: Optional[str], rate_budget: Optional[RateBudget]) -> None:
+        def new_executor():
+            return ProcessPoolExecutor(max_workers=self.processes, mp_context=context,
+                                       initializer=_init_worker, initargs=(cache_path, rate_budget))
+
+        executor = new_executor()
+        futures = {}
+        pending = list(jobs)
+        try:
+            while pending or futures:
+                for job in pending:
+                    job.attempts += 1
+                    futures[executor.submit(_run_job, job, str(self.experiment_dir), self.engine_factory)] = job
+                pending = []
+
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as e:
+                        # A worker died (e.g. out of memory); every run in flight is lost with it
+                        broken = True
+                        result = {"simulation_id": job.simulation_id, "config": job.config_path,
+                                  "replicate": job.replicate, "attempts": job.attempts,
+                                  "status": "failed", "error": f"Worker process died: {e}"}
+                    if self._record(job, result):
+                        pending.append(job)
+                if broken:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    executor = new_executor()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _record(self, job: ExperimentJob, result: Dict[str, Any]) -> bool:
+        """Store a job's result; returns whether it should be retried."""
+        self.results[job.simulation_id] = result
+        if result["status"] == "completed":
+            logger.info(f"Run {job.simulation_id} completed in {result['elapsed_seconds']:.1f}s")
+            return False
+        retry = job.attempts <= self.max_retries
+        logger.warning(f"Run {job.simulation_id} failed on attempt {job.attempts}: {result['error']}"
+                       f"{' - retrying' if retry else ''}")
+        return retry
+
+    def _write_index(self, jobs: List[ExperimentJob], elapsed: float) -> Dict[str, Any]:
+        runs = [self.results[job.simulation_id] for job in jobs]
+        cache_stats = [run.get("llm", {}).get("cache", {}) for run in runs]
+        index = {
+            "experiment_id": self.experiment_id,
+            "configs": [str(path) for path in self.config_paths],
+            "replicates": self.replicates,
+            "processes": self.processes,
+            "requests_per_minute": self.requests_per_minute,
+            "elapsed_seconds": round(elapsed, 3),
+            "completed": sum(run["status"] == "completed" for run in runs),
+            "failed": sum(run["status"] == "failed" for run in runs),
+            "llm": {
+                "requests": sum(run.get("llm", {}).get("requests", 0) for run in runs),
+                "cache_hits": sum(stats.get("hits", 0) for stats in cache_stats),
+                "cache_misses": sum(stats.get("misses", 0) for stats in cache_stats)
+            },
+            "runs": runs
+        }
+        with open(self.experiment_dir / "index.json", 'w') as f:
+            json.dump(index, f, indent=2, default=str)
+        logger.info(f"Experiment {self.experiment_id}: {index['completed']} completed, {index['failed']} failed "
+                    f"in {elapsed:.1f}s; index at {self.experiment_dir / 'index.json'}")
+        return index
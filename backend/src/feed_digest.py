@@ -0,0 +1,250 @@
+"""Map-reduce summarization of the social media feed into a per-topic sentiment digest.
+
+Once per epoch the new posts are split into chunks and every chunk is
+classified by one LLM call, all chunks in parallel (map). Each call returns,
+per debate topic, how many posts in the chunk are positive, negative or
+neutral about it plus a few recurring themes. The chunk results are merged
+in Python (reduce): counts are summed and themes ranked by how many chunks
+mention them. Candidates and the mediator then read this one digest instead
+of each prompting with the raw feed.
+"""
+
+import json
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+
+from . import llm_client
+
+logger = logging.getLogger(__name__)
+
+SENTIMENTS = ["positive", "negative", "neutral"]
+
+
+@dataclass
+class TopicSentiment:
+    """Aggregated public sentiment on one debate topic."""
+    topic_id: str
+    title: str
+    positive: int = 0
+    negative: int = 0
+    neutral: int = 0
+    themes: List[str] = field(default_factory=list)
+
+    @property
+    def mentions(self) -> int:
+        return self.positive + self.negative + self.neutral
+
+    def to_text(self) -> str:
+        if self.mentions == 0:
+            return f"{self.title}: not discussed"
+        themes = "; ".join(self.themes) if self.themes else "no recurring themes"
+        return (f"{self.title}: {self.mentions} posts "
+                f"({self.positive} positive, {self.negative} negative, {self.neutral} neutral). "
+                f"Themes: {themes}")
+
+
+@dataclass
+class FeedDigest:
+    """Per-topic sentiment digest of the posts published in one epoch."""
+    epoch: int
+    total_posts: int
+    topics: Dict[str, TopicSentiment]
+    off_topic: int = 0
+    failed_chunks: int = 0
+
+    def topic_text(self, topic_id: str) -> str:
+        """Digest line for one topic."""
+        return self.topics[topic_id].to_text()
+
+    def to_text(self) -> str:
+        """Whole digest as prompt text."""
+        lines = [f"Digest of {self.total_posts} public posts:"]
+        lines.extend(f"- {sentiment.to_text()}" for sentiment in self.topics.values())
+        if self.off_topic:
+            lines.append(f"- {self.off_topic} posts were about other subjects")
+        return "\n".join(lines)
+
+
+def _parse_json(response: str) -> Dict[str, Any]:
+    response_clean = response.strip()
+    if response_clean.startswith("```json"):
+        response_clean = response_clean[7:]
+    if response_clean.startswith("```"):
+        response_clean = response_clean[3:]
+    if response_clean.endswith("```"):
+        response_clean = response_clean[:-3]
+    return json.loads(response_clean.strip())
+
+
+def _count(value: Any) -> int:
+    """Non-negative post count from LLM output (None/missing counts as 0)."""
+    count = int(value or 0)
+    if count < 0:
+        raise ValueError(f"negative count {value!r}")
+    return count
+
+
+def _validate_chunk(result: Any, topic_ids) -> Dict[str, Any]:
+    """
+    Normalize one chunk classification, raising ValueError if it is malformed.
+
+    Returns:
+        {"off_topic": int, "topics": {topic_id: {sentiment: int, "themes": [str]}}} for the
+        known `topic_ids` (other topic ids are dropped)
+    """
+    if not isinstance(result, dict):
+        raise ValueError(f"expected a JSON object, got {type(result).__name__}")
+    topics = result.get("topics") or {}
+    if not isinstance(topics, dict):
+        raise ValueError(f"'topics' must be an object, got {type(topics).__name__}")
+
+    chunk = {"off_topic": _count(result.get("off_topic")), "topics": {}}
+    for topic_id, counts in topics.items():
+        if topic_id not in topic_ids:
+            continue
+        if not isinstance(counts, dict):
+            raise ValueError(f"counts for topic '{topic_id}' must be an object")
+        themes = counts.get("themes") or []
+        if not isinstance(themes, list):
+            raise ValueError(f"themes for topic '{topic_id}' must be a list")
+        chunk["topics"][topic_id] = {name: _count(counts.get(name)) for name in SENTIMENTS}
+        chunk["topics"][topic_id]["themes"] = [str(theme).strip() for theme in themes]
+    return chunk
+
+
+class FeedSummarizer:
+    """Summarizes posts into a FeedDigest with one parallel pass of chunk-level LLM calls."""
+
+    def __init__(
+        self,
+        llm_client_instance,
+        topics: List,
+        chunk_size: int = 50,
+        max_concurrent: int = 20,
+        max_themes: int = 3
+    ):
+        self.llm_client = llm_client_instance
+        self.topics = topics
+        self.chunk_size = chunk_size
+        self.max_concurrent = max_concurrent
+        self.max_themes = max_themes
+
+    def _chunk_prompt(self, chunk: List[str]) -> str:
+        topic_lines = "\n".join(f"- {topic.id}: {topic.title}" for topic in self.topics)
+        post_lines = "\n".join(f"{i + 1}. {post}" for i, post in enumerate(chunk))
+        example = {
+            "topics": {
+                self.topics[0].id if self.topics else "topic_id": {
+                    "positive": 2, "negative": 1, "neutral": 0,
+                    "themes": ["short recurring theme"]
+                }
+            },
+            "off_topic": 1
+        }
+        return f"""Classify these {len(chunk)} social media posts by debate topic and sentiment.
+
+Debate topics:
+{topic_lines}
+
+Posts:
+{post_lines}
+
+For each topic, count the posts that discuss it with positive, negative or neutral sentiment and list
+up to {self.max_themes} short recurring themes. A post may count for several topics; posts about none
+of the topics count as off_topic.
+
+Return ONLY a JSON object like:
+{json.dumps(example)}"""
+
+    async def _summarize_chunk(self, chunk: List[str], semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                response = await llm_client.generate_response_async(
+                    self.llm_client,
+                    self._chunk_prompt(chunk),
+                    "You are a social media analyst. You count and classify posts precisely and return only JSON."
+                )
+                return _parse_json(response)
+            except Exception as e:
+                logger.error(f"Error summarizing feed chunk of {len(chunk)} posts: {e}")
+                return None
+
+    def merge(self, chunk_results: List[Optional[Dict[str, Any]]], total_posts: int, epoch: int = 0) -> FeedDigest:
+        """
+        Reduce chunk-level classifications into one digest.
+
+        Counts are summed per topic and sentiment; themes are ranked by the number of
+        chunks naming them (case-insensitive, first spelling kept). Failed chunks
+        (None) and malformed ones (e.g. non-numeric counts) are counted in
+        failed_chunks but otherwise ignored.
+        """
+        digest = FeedDigest(
+            epoch=epoch,
+            total_posts=total_posts,
+            topics={topic.id: TopicSentiment(topic.id, topic.title) for topic in self.topics}
+        )
+        theme_counts = {topic.id: Counter() for topic in self.topics}
+        theme_spelling: Dict[str, str] = {}
+
+        for result in chunk_results:
+            if result is None:
+                digest.failed_chunks += 1
+                continue
+            try:
+                chunk = _validate_chunk(result, digest.topics)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Skipping malformed feed chunk classification: {e}")
+                digest.failed_chunks += 1
+                continue
+
+            digest.off_topic += chunk["off_topic"]
+            for topic_id, counts in chunk["topics"].items():
+                sentiment = digest.topics[topic_id]
+                for name in SENTIMENTS:
+                    setattr(sentiment, name, getattr(sentiment, name) + counts[name])
+                for theme in counts["themes"]:
+                    key = theme.lower()
+                    if key:
+                        theme_spelling.setdefault(key, theme)
+                        theme_counts[topic_id][key] += 1
+
+        for topic_id, counter in theme_counts.items():
+            digest.topics[topic_id].themes = [theme_spelling[key] for key, _ in counter.most_common(self.max_themes)]
+
+        return digest
+
+    async def summarize_async(self, posts: List[str], epoch: int = 0) -> FeedDigest:
+        """
+        Summarize rendered posts into a FeedDigest.
+
+        Args:
+            posts: Rendered posts (e.g. Post.to_string())
+            epoch: Epoch the digest describes
+
+        Returns:
+            FeedDigest with per-topic sentiment counts and themes
+        """
+        chunks = [posts[i:i + self.chunk_size] for i in range(0, len(posts), self.chunk_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        chunk_results = await asyncio.gather(*[self._summarize_chunk(chunk, semaphore) for chunk in chunks])
+
+        digest = self.merge(chunk_results, len(posts), epoch)
+        logger.info(f"Summarized {len(posts)} posts in {len(chunks)} chunks "
+                    f"({digest.failed_chunks} failed) into a digest of {len(digest.topics)} topics")
+        return digest
+
+    def summarize(self, posts: List[str], epoch: int = 0) -> FeedDigest:
+        """Synchronous wrapper for summarize_async."""
+        try:
+            loop = asyncio.get_event_loop()
+            if loop.is_closed():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+        return loop.run_until_complete(self.summarize_async(posts, epoch))
@@ -1,17 +1,30 @@
 import os
 import json
+import random
+import copy
+import asyncio
 import logging
 import shutil
-from typing import Dict, List, Any
+import dataclasses
+import yaml
+from typing import Dict, List, Any, Callable, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
+import numpy as np
 from dotenv import load_dotenv
 from dataclasses import asdict, is_dataclass
 from .config import Config
 from .population import Population
+from .population_shards import ShardedPopulation
 from .candidate import Candidate
-from .mediator import Mediator, DebateTranscript, MediatorStatement, CandidateStatement
+from .mediator import Mediator, Topic, Question, DebateTranscript, MediatorStatement, CandidateStatement, PlannedQuestion
 from .social_media import SocialMedia, Post
+from .opinion_dynamics import OpinionDynamics
+from .persona_store import PersonaStore
+from .archetypes import persona_feature_matrix
+from .feed_digest import FeedSummarizer, FeedDigest
+from .persona_dataflow import PersonaDataflow
+from .checkpoint import save_checkpoint, load_checkpoint, latest_checkpoint, checkpoint_path
 from . import llm_client
 
 logger = logging.getLogger(__name__)
@@ -27,14 +40,27 @@ class DataclassJSONEncoder(json.JSONEncoder):
 
 class GameEngine:
     def __init__(self, config: Config, config_path: str = None):
+        self._validate_config(config)
         self.config = config
         self.config_path = config_path
         self.current_epoch = 0
-        self.population: Population = Population(world_story=config.world_story)
+        self.epochs_completed = 0  # Next epoch to run; restored from checkpoints on resume
+        self.parent: Optional[Dict[str, Any]] = None  # Parent run and overrides of a forked simulation
+        if config.population_shards and config.population_shards > 1:
+            self.population: Population = ShardedPopulation(config.population_shards, world_story=config.world_story)
+        else:
+            self.population: Population = Population(world_story=config.world_story)
+        if config.archetypes:
+            self.population.enable_archetypes(seed=config.random_seed, **config.archetypes)
         self.candidates: List[Candidate] = []
         self.mediator: Mediator = None
         self.social_media: SocialMedia = None
         self.debate_transcripts: List[DebateTranscript] = []
+        self.opinion_dynamics: OpinionDynamics = None
+        self.opinion_dynamics_rows: List[int] = []  # Surrogate row of each LLM-simulated persona
+        self.feed_summarizer: FeedSummarizer = None  # Created on first use when config.feed_digest is set
+        self.feed_digest: FeedDigest = None  # Digest read at the start of the current epoch
+        self.question_plans: Dict[str, List[PlannedQuestion]] = {}  # topic_id -> planned questions (config.question_planning)
 
         # Initialize simulation output path
         self.simulation_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -48,6 +74,24 @@ class GameEngine:
             raise ValueError("GEMINI_API_KEY not found in environment")
         self.llm_client = llm_client.create_client(api_key)
     
+    @staticmethod
+    def _validate_config(config: Config) -> None:
+        if config.debate_protocol not in ("sequential", "simultaneous"):
+            raise ValueError(f"Unknown debate_protocol '{config.debate_protocol}' (expected 'sequential' or 'simultaneous')")
+        if config.pipeline_belief_updates not in ("per_transcript", "per_epoch"):
+            raise ValueError(
+                f"Unknown pipeline_belief_updates '{config.pipeline_belief_updates}' (expected 'per_transcript' or 'per_epoch')"
+            )
+        if config.opinion_dynamics and (config.population_query or config.population_sampling):
+            # The LLM personas are a random sample of the whole surrogate population
+            raise ValueError("opinion_dynamics cannot be combined with population_query or population_sampling")
+        if config.population_shards and config.population_shards > 1:
+            # Both need every persona in one process (archetype clustering, per-persona dataflow)
+            if config.archetypes:
+                raise ValueError("population_shards cannot be combined with archetypes")
+            if config.persona_dataflow:
+                raise ValueError("population_shards cannot be combined with persona_dataflow")
+
     def initialize_simulation_output(self, base_dir: str = "data/simulation") -> None:
         """
         Initialize the simulation output directory and file.
@@ -64,54 +108,415 @@ class GameEngine:
 
         logger.info(f"Initialized simulation output at: {self.simulation_file}")
 
-    def run(self) -> Dict[str, Any]:
+    def run(self, until_epoch: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run the remaining epochs.
+
+        Args:
+            until_epoch: Pause once this many epochs are completed instead of running to
+                config.num_epochs; a later run() call continues (used by sweeps at branch points)
+        """
         # Initialize simulation output if not already done
         if self.simulation_file is None:
             self.initialize_simulation_output()
 
-        # Serialize constant metadata once at the start
-        self._serialize_simulation_metadata()
+        # One-time setup; a resumed engine already carries it in its restored state
+        if self.epochs_completed == 0:
+            # Serialize constant metadata once at the start
+            self._serialize_simulation_metadata()
+
+            if self.config.agent_memory is not None:
+                self._configure_agent_memory()
 
-        for epoch in range(self.config.num_epochs):
+            if self.social_media and self.config.post_retention_epochs is not None:
+                self.social_media.enable_retention(
+                    self.config.post_retention_epochs,
+                    self.simulation_dir / "post_archive.jsonl"
+                )
+
+        stop = self.config.num_epochs if until_epoch is None else min(until_epoch, self.config.num_epochs)
+        for epoch in range(self.epochs_completed, stop):
             self.current_epoch = epoch
             self._run_epoch()
             # Serialize state after each epoch
             self._serialize_epoch_state()
+            self.epochs_completed = epoch + 1
+            if self.config.checkpoints:
+                save_checkpoint(self)
 
+        if self.epochs_completed < self.config.num_epochs:
+            return None  # Paused
         return self._finalize_experiment()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # LLM clients are not picklable; checkpoint.load_checkpoint attaches a new one
+        state = self.__dict__.copy()
+        state["llm_client"] = None
+        state["feed_summarizer"] = None  # Recreated on first use
+        return state
+
+    @classmethod
+    def resume(cls, simulation_dir) -> 'GameEngine':
+        """
+        Restore a run from the latest checkpoint in its simulation directory.
+
+        Epoch records written after that checkpoint (a crash between writing
+        epochs.jsonl and the checkpoint) are dropped, so the next run() continues
+        with the epoch after the checkpoint without duplicating records.
+        """
+        path = latest_checkpoint(simulation_dir)
+        if path is None:
+            raise FileNotFoundError(f"No checkpoint found in {simulation_dir}")
+
+        engine = cls.from_checkpoint(path, simulation_dir)
+        logger.info(f"Resuming simulation {engine.simulation_id} after epoch {engine.epochs_completed - 1}")
+        return engine
+
+    @classmethod
+    def from_checkpoint(cls, path, simulation_dir) -> 'GameEngine':
+        """Load a checkpoint of the run in `simulation_dir`, dropping output written after it."""
+        engine = load_checkpoint(path)
+        engine.simulation_dir = Path(simulation_dir)
+        engine.simulation_file = engine.simulation_dir / "epochs.jsonl"
+        engine._truncate_epochs_file()
+        if engine.social_media and engine.social_media.archive is not None:
+            engine.social_media.archive.truncate_to_checkpoint()
+        return engine
+
+    @classmethod
+    def fork(
+        cls,
+        parent_dir,
+        epoch: int,
+        overrides: Optional[Dict[str, Any]] = None,
+        base_dir: str = "data/simulation",
+        simulation_id: Optional[str] = None
+    ) -> 'GameEngine':
+        """
+        Start a new simulation from the checkpoint after `epoch` of an existing one.
+
+        The fork gets its own simulation directory holding the parent's epoch records up
+        to `epoch`, a copy of the post archive, and metadata naming the parent and the
+        overrides. run() then continues with epoch + 1 under the overridden config.
+
+        Args:
+            parent_dir: Simulation directory of the parent run
+            epoch: Last parent epoch the fork shares
+            overrides: Config fields to change (see apply_overrides)
+            base_dir: Base directory for the fork's output
+            simulation_id: ID (directory name) of the fork; derived from the parent's by default
+
+        Returns:
+            Engine ready to run the divergent epochs
+        """
+        parent_dir = Path(parent_dir)
+        path = checkpoint_path(parent_dir, epoch)
+        if not path.exists():
+            raise FileNotFoundError(f"No checkpoint of epoch {epoch} in {parent_dir}")
+
+        engine = load_checkpoint(path)
+        overrides = dict(overrides or {})
+        engine.parent = {
+            "simulation_id": engine.simulation_id,
+            "simulation_dir": str(parent_dir),
+            "epoch": epoch,
+            "overrides": overrides
+        }
+        engine.simulation_id = simulation_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_fork_{engine.simulation_id}_e{epoch}"
+        engine.initialize_simulation_output(base_dir)
+        engine._inherit_parent_output(parent_dir)
+        engine.apply_overrides(overrides)
+        engine.write_effective_config()
+        engine._serialize_simulation_metadata()
+
+        logger.info(f"Forked {engine.parent['simulation_id']} after epoch {epoch} into {engine.simulation_dir} "
+                    f"(overrides: {', '.join(overrides) or 'none'})")
+        return engine
+
+    def write_effective_config(self) -> None:
+        """Write the config in effect to the simulation directory, for runs not started from a config file."""
+        self.config_path = self.simulation_dir / "config.yaml"
+        with open(self.config_path, 'w') as f:
+            yaml.safe_dump(dataclasses.asdict(self.config), f, sort_keys=False, allow_unicode=True)
+
+    def _inherit_parent_output(self, parent_dir: Path) -> None:
+        """Copy the parent's epoch records up to the checkpoint and its post archive into this run's directory."""
+        parent_epochs = parent_dir / "epochs.jsonl"
+        if parent_epochs.exists():
+            with open(parent_epochs, 'r') as f:
+                lines = [line for line in f if line.strip() and json.loads(line)["epoch"] < self.epochs_completed]
+            with open(self.simulation_file, 'w') as f:
+                f.writelines(lines)
+
+        archive = self.social_media.archive if self.social_media else None
+        if archive is not None:
+            fork_path = self.simulation_dir / "post_archive.jsonl"
+            with open(archive.path, "rb") as src, open(fork_path, "wb") as dst:
+                dst.write(src.read(archive.checkpoint_size))
+            archive.path = fork_path
+
+    def apply_overrides(self, overrides: Dict[str, Any]) -> None:
+        """
+        Change config fields of a restored (forked) run.
+
+        Any Config field can be overridden; a new random_seed also reseeds the global random
+        generators, so runs forked with different seeds diverge. Two keys also change the
+        simulated world:
+        - candidates: candidate dicts (id, name, description); candidates keeping their ID
+          keep their state, new IDs are created and take initial positions
+        - population_mixture: {"population_file": str, "fraction": float, "seed": int}
+          replaces that share of the personas with fresh ones from another population
+        """
+        overrides = dict(overrides)
+        mixture = overrides.pop("population_mixture", None)
+        field_names = {field.name for field in dataclasses.fields(Config)}
+        unknown = sorted(set(overrides) - field_names)
+        if unknown:
+            raise ValueError(f"Unknown config fields in overrides: {', '.join(unknown)}")
+
+        config = dataclasses.replace(self.config, **overrides)
+        self._validate_config(config)
+        self.config = config
+
+        if "random_seed" in overrides:
+            random.seed(config.random_seed)
+            np.random.seed(config.random_seed)
+        if "candidates" in overrides:
+            self._replace_candidates(config.candidates)
+        if mixture:
+            if self.opinion_dynamics:
+                raise ValueError("population_mixture is not supported in opinion dynamics mode")
+            self.population.mix_in_from_jsonl(
+                mixture["population_file"], mixture.get("fraction", 1.0), seed=mixture.get("seed", config.random_seed)
+            )
+        if "agent_memory" in overrides and config.agent_memory is not None:
+            self._configure_agent_memory()
+        if "post_retention_epochs" in overrides and self.social_media:
+            retention = config.post_retention_epochs
+            if retention is None:
+                self.social_media.retention_epochs = None
+            elif self.social_media.archive is None:
+                self.social_media.enable_retention(retention, self.simulation_dir / "post_archive.jsonl")
+            else:
+                self.social_media.retention_epochs = retention
+
+    def _replace_candidates(self, candidate_configs: List[Dict[str, str]]) -> None:
+        """Keep candidates whose ID is still configured (updating name and character) and create new ones."""
+        existing = {candidate.id: candidate for candidate in self.candidates}
+        new_configs = [candidate_data for candidate_data in candidate_configs if candidate_data["id"] not in existing]
+        created = {candidate.id: candidate for candidate in self._create_candidates(new_configs, self.mediator.topics)}
+
+        candidates = []
+        for candidate_data in candidate_configs:
+            candidate = existing.get(candidate_data["id"]) or created[candidate_data["id"]]
+            candidate.name = candidate.state.name = candidate_data["name"]
+            candidate.character = candidate.state.character = candidate_data["description"]
+            candidates.append(candidate)
+
+        if self.opinion_dynamics and [c.name for c in candidates] != self.opinion_dynamics.candidates:
+            raise ValueError("Changing the candidate set is not supported in opinion dynamics mode")
+        self.candidates = candidates
+        if self.config.agent_memory is not None:
+            self._configure_agent_memory()
+        logger.info(f"Candidates after override: {', '.join(c.name for c in candidates)} ({len(created)} new)")
+
+    def _truncate_epochs_file(self) -> None:
+        """Drop epoch records at or after epochs_completed from epochs.jsonl."""
+        if not self.simulation_file.exists():
+            return
+        with open(self.simulation_file, 'r') as f:
+            lines = [line for line in f if line.strip()]
+        kept = [line for line in lines if json.loads(line)["epoch"] < self.epochs_completed]
+        if len(kept) < len(lines):
+            with open(self.simulation_file, 'w') as f:
+                f.writelines(kept)
+            logger.warning(f"Dropped {len(lines) - len(kept)} epoch records written after the last checkpoint")
     
+    def _memory_agents(self) -> List:
+        return ([self.mediator] if self.mediator else []) + list(self.candidates)
+
+    def _configure_agent_memory(self) -> None:
+        """Apply the config.agent_memory budget to the mediator's and candidates' memory."""
+        settings = self.config.agent_memory
+        for agent in self._memory_agents():
+            if agent.memory_manager is None:
+                continue
+            agent.memory_manager.token_budget = settings.get("token_budget")
+            agent.memory_manager.recent_entries = settings.get("recent_entries", agent.memory_manager.recent_entries)
+
+    def _compact_agent_memory(self) -> None:
+        """Summarize older memory of every agent that is over its token budget, concurrently."""
+        compacted = self._run_async(self._compact_memory_async(self._memory_agents()))
+        if compacted:
+            logger.info(f"Compacted memory of {compacted} agents")
+
+    @staticmethod
+    async def _compact_memory_async(agents: List) -> int:
+        """Compact the memory of `agents` concurrently; returns how many were compacted."""
+        return sum(await asyncio.gather(*[agent.compact_memory_async() for agent in agents]))
+
+    def _run_async(self, coroutine):
+        """Run a coroutine to completion on the persistent event loop (see Population)."""
+        try:
+            loop = asyncio.get_event_loop()
+            if loop.is_closed():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coroutine)
+
+    def setup_candidates(self, candidate_configs: List[Dict[str, str]], topics: List[Topic]) -> None:
+        """
+        Create the candidates and generate all their initial positions concurrently.
+
+        Args:
+            candidate_configs: Candidate dicts from the config (id, name, description)
+            topics: Debate topics every candidate takes a position on
+        """
+        self.candidates = self._create_candidates(candidate_configs, topics)
+        logger.info(f"Initialized {len(self.candidates)} candidates on {len(topics)} topics (parallel)")
+
+    def _create_candidates(self, candidate_configs: List[Dict[str, str]], topics: List[Topic]) -> List[Candidate]:
+        candidates = [
+            Candidate(
+                candidate_data["id"],
+                candidate_data["name"],
+                candidate_data["description"],
+                topics,
+                self.llm_client,
+                world_story=self.config.world_story,
+                initialize=False
+            )
+            for candidate_data in candidate_configs
+        ]
+
+        async def initialize_all():
+            await asyncio.gather(*[candidate.initialize_async() for candidate in candidates])
+
+        self._run_async(initialize_all())
+        return candidates
+
+    def setup_opinion_dynamics(self, store: PersonaStore, rows: List[int]) -> None:
+        """
+        Enable the hybrid mode: a numeric surrogate over every persona in `store`,
+        calibrated each epoch by the LLM-simulated personas at `rows`.
+
+        Args:
+            store: Columnar store of the full population
+            rows: Store row of each persona in self.population, in order
+        """
+        self.opinion_dynamics = OpinionDynamics.from_store(
+            store,
+            [topic.title for topic in self.mediator.topics],
+            [candidate.name for candidate in self.candidates],
+            seed=self.config.random_seed,
+            **(self.config.opinion_dynamics or {})
+        )
+        self.opinion_dynamics_rows = list(rows)
+        logger.info(f"Opinion dynamics surrogate over {len(store)} personas ({len(rows)} LLM-simulated)")
+
     def _run_epoch(self) -> None:
+        if self.opinion_dynamics:
+            stances_before = self.opinion_dynamics.stances[self.opinion_dynamics_rows].copy()
+
+        if self.social_media:
+            self.social_media.current_epoch = self.current_epoch
+            self.social_media.expire_posts()
+
         self._candidates_read_social_media()
 
-        for topic_index in range(len(self.mediator.topics)):
-            self._conduct_debate_on_topic(topic_index)
+        if self.config.question_planning is not None:
+            self._plan_questions()
 
-        self._population_consume_debate()
-        self.population.update_beliefs_from_debate(
-            max_concurrent=self.config.max_concurrent,
-            max_change_percentage=self.config.max_change_percentage
-        )
-        self._personas_chat_with_peers()
-        self.population.update_beliefs_from_chat(
-            max_concurrent=self.config.max_concurrent,
-            max_change_percentage=self.config.max_change_percentage
-        )
-        self._personas_post_to_social_media()
-        self._population_react_to_posts()
-        self.population.update_beliefs_from_social_media(
-            max_concurrent=self.config.max_concurrent,
-            max_change_percentage=self.config.max_change_percentage
+        if self.config.pipeline_debates:
+            self._run_async(self._run_debates_pipelined())
+        else:
+            if self.config.parallel_topics:
+                self._conduct_debates_in_parallel()
+            else:
+                for topic_index in range(len(self.mediator.topics)):
+                    self._conduct_debate_on_topic(topic_index)
+            self._population_consume_debate()
+
+        if self.config.agent_memory is not None:
+            self._compact_agent_memory()
+
+        # Pipelined debates may already have updated beliefs after every transcript
+        updated_from_debate = self.config.pipeline_debates and self.config.pipeline_belief_updates == "per_transcript"
+        if self.config.persona_dataflow:
+            self._run_population_dataflow(update_from_debate=not updated_from_debate)
+        else:
+            if not updated_from_debate:
+                self.population.update_beliefs_from_debate(
+                    max_concurrent=self.config.max_concurrent,
+                    max_change_percentage=self.config.max_change_percentage
+                )
+            self._personas_chat_with_peers()
+            self.population.update_beliefs_from_chat(
+                max_concurrent=self.config.max_concurrent,
+                max_change_percentage=self.config.max_change_percentage
+            )
+            self._personas_post_to_social_media()
+            self._population_react_to_posts()
+            self.population.update_beliefs_from_social_media(
+                max_concurrent=self.config.max_concurrent,
+                max_change_percentage=self.config.max_change_percentage
+            )
+
+        if self.opinion_dynamics:
+            self._advance_opinion_dynamics(stances_before)
+
+    def _advance_opinion_dynamics(self, stances_before) -> None:
+        """Calibrate the surrogate on this epoch's LLM belief shifts and step the full population."""
+        rows = self.opinion_dynamics_rows
+        stances_after = self.opinion_dynamics.stances_from_beliefs(
+            [persona.beliefs for persona in self.population.personas],
+            stances_before
         )
+        self.opinion_dynamics.calibrate(rows, stances_before, stances_after)
+        self.opinion_dynamics.step(pinned_rows=rows, pinned_stances=stances_after)
     
     def _candidates_read_social_media(self) -> None:
+        """Have candidates and the mediator read the posts published since their previous read."""
         logger.info(f"Candidates read latest posts")
-        
-        latest_feed = self.social_media.get_feed()
-        logger.debug(f"Social Media Feed:\n{latest_feed}")
 
-        for candidate in self.candidates:
-            candidate.read_social_media_signals(latest_feed)
+        if self.config.feed_digest is not None:
+            self._read_feed_digest()
+            return
+
+        async def read_all():
+            await asyncio.gather(*[
+                candidate.read_social_media_signals_async(self.social_media.get_feed_since(candidate.id))
+                for candidate in self.candidates
+            ])
+
+        self._run_async(read_all())
+
+        if self.mediator:
+            self.mediator.read_social_media_signals(self.social_media.get_feed_since(self.mediator.id))
     
+    def _read_feed_digest(self) -> None:
+        """Summarize the posts new since the last epoch once and have everyone read the digest."""
+        if self.feed_summarizer is None:
+            self.feed_summarizer = FeedSummarizer(
+                self.llm_client,
+                self.mediator.topics,
+                max_concurrent=self.config.max_concurrent,
+                **self.config.feed_digest
+            )
+
+        new_posts = [post.to_string() for post in self.social_media.read_new_posts("feed_digest", limit=None)]
+        self.feed_digest = self.feed_summarizer.summarize(new_posts, epoch=self.current_epoch)
+
+        async def read_all():
+            await asyncio.gather(*[candidate.read_social_media_digest_async(self.feed_digest) for candidate in self.candidates])
+
+        self._run_async(read_all())
+        if self.mediator:
+            self.mediator.read_social_media_digest(self.feed_digest)
+
     def _conduct_debate_on_topic(self, topic_index: int) -> None:
         """
         Conduct a full debate on a topic with multiple questions.
@@ -129,23 +534,123 @@ class GameEngine:
         if not self.mediator or not self.candidates:
             raise ValueError("No mediator or candidates configured")
 
-        topic = self.mediator.topics[topic_index]
+        self._run_async(self._debate_topic_async(topic_index, self.mediator, self.candidates, self.debate_transcripts))
+
+    def _plan_questions(self) -> None:
+        """Plan every topic's questions and introductions for this epoch, one LLM call per topic, concurrently."""
+        async def plan_all():
+            return await asyncio.gather(*[
+                asyncio.to_thread(self.mediator.plan_questions, topic, self.config.questions_per_topic)
+                for topic in self.mediator.topics
+            ])
+
+        plans = self._run_async(plan_all())
+        self.question_plans = {topic.id: plan for topic, plan in zip(self.mediator.topics, plans)}
+        logger.info(f"Planned {sum(len(plan) for plan in plans)} questions for {len(plans)} topics")
+
+    def _conduct_debates_in_parallel(self) -> None:
+        """Synchronous wrapper for _conduct_debates_in_parallel_async."""
+        self._run_async(self._conduct_debates_in_parallel_async())
+
+    async def _conduct_debates_in_parallel_async(self, on_transcript: Optional[Callable[[DebateTranscript], None]] = None) -> None:
+        """
+        Debate all topics concurrently (config.parallel_topics).
+
+        Each topic runs on its own copies of the mediator and candidates and its own
+        transcript thread (previous epochs' transcripts plus its own questions). When all
+        topics are done, transcripts are appended and each agent's memory additions and
+        changed positions are merged back in topic order, so the result does not depend
+        on which topic finished first.
+        """
+        if not self.mediator or not self.candidates:
+            raise ValueError("No mediator or candidates configured")
+
+        topic_count = len(self.mediator.topics)
+        mediators = [self._fork_agent(self.mediator) for _ in range(topic_count)]
+        candidates = [[self._fork_agent(candidate) for candidate in self.candidates] for _ in range(topic_count)]
+        threads = [list(self.debate_transcripts) for _ in range(topic_count)]
+
+        await asyncio.gather(*[
+            self._debate_topic_async(topic_index, mediators[topic_index], candidates[topic_index], threads[topic_index], on_transcript)
+            for topic_index in range(topic_count)
+        ])
+
+        previous_count = len(self.debate_transcripts)
+        for topic_index in range(topic_count):
+            self.debate_transcripts.extend(threads[topic_index][previous_count:])
+        self._merge_agent_forks(self.mediator, mediators)
+        for candidate_index, candidate in enumerate(self.candidates):
+            self._merge_agent_forks(candidate, [forks[candidate_index] for forks in candidates])
+
+        logger.info(f"Debated {topic_count} topics in parallel")
+
+    @staticmethod
+    def _fork_agent(agent):
+        """Shallow copy of a candidate or mediator with its own copy of the mutable state."""
+        fork = copy.copy(agent)
+        fork.state = copy.deepcopy(agent.state)
+        fork.memory_manager = agent.memory_manager.fork() if agent.memory_manager else None
+        return fork
+
+    @staticmethod
+    def _merge_agent_forks(agent, forks: List) -> None:
+        """Append each fork's new memory entries and apply its changed policy positions, in fork order."""
+        base_positions = dict(getattr(agent.state, "policy_positions", {}))
+        for fork in forks:
+            if fork.memory_manager is not None:
+                # A fork of an agent without memory manager created its own: all its entries are new
+                journal = fork.memory_manager.journal
+                for entry in journal if journal is not None else fork.memory_manager.entries:
+                    agent._remember(entry)
+            for topic_id, position in getattr(fork.state, "policy_positions", {}).items():
+                if position != base_positions.get(topic_id):
+                    agent.state.policy_positions[topic_id] = position
+
+    async def _debate_topic_async(
+        self,
+        topic_index: int,
+        mediator: Mediator,
+        candidates: List[Candidate],
+        transcripts: List[DebateTranscript],
+        on_transcript: Optional[Callable[[DebateTranscript], None]] = None
+    ) -> None:
+        """
+        Debate one topic, appending a transcript per question to `transcripts`.
+
+        The mediator and candidate calls are synchronous LLM chains, so they run in worker
+        threads; the post-question reflections run as concurrent coroutines. `on_transcript`
+        is called with each transcript as soon as it is published.
+
+        With config.question_planning, questions and introductions come from the epoch's plan
+        (see _plan_questions); the remaining questions are re-planned only when a debate
+        diverges from its planned question. Questions missing from the plan are proposed
+        and introduced one by one.
+        """
+        topic = mediator.topics[topic_index]
         logger.info(f"Starting debate on topic: '{topic.title}'")
+        plan = self.question_plans.get(topic.id, []) if self.config.question_planning is not None else []
 
         # Loop through questions for this topic
         for question_index in range(self.config.questions_per_topic):
             logger.info(f"Question {question_index + 1}/{self.config.questions_per_topic} for topic '{topic.title}'")
 
-            # Step 1: Mediator proposes a question (context-aware)
-            question = self.mediator.propose_question(
-                topic=topic,
-                previous_transcripts=self.debate_transcripts
-            )
+            if self.config.agent_memory is not None:
+                # Memory goes into every prompt of the question, so bring it under budget first
+                await self._compact_memory_async([mediator, *candidates])
+
+            if question_index < len(plan):
+                planned = plan[question_index]
+                question, introduction = planned.question, planned.introduction
+            else:
+                planned = None
 
-            # Step 2: Mediator introduces the question
-            introduction = self.mediator.introduce_question(question)
+                # Step 1: Mediator proposes a question (context-aware)
+                question = await asyncio.to_thread(mediator.propose_question, topic=topic)
+
+                # Step 2: Mediator introduces the question
+                introduction = await asyncio.to_thread(mediator.introduce_question, question)
             mediator_intro = MediatorStatement(
-                mediator_id=self.mediator.id,
+                mediator_id=mediator.id,
                 statement=introduction,
                 question=question
             )
@@ -154,19 +659,33 @@ class GameEngine:
             all_statements = [mediator_intro]
 
             # Step 3: Conduct turns on this specific question
+            simultaneous = self.config.debate_protocol == "simultaneous"
             for turn in range(self.config.turns_per_question):
-                turn_statements = self.mediator.orchestrate_debate_turn(
-                    question=question,
-                    candidates=self.candidates,
-                    turn_number=turn,
-                    previous_statements=all_statements
-                )
+                if simultaneous:
+                    turn_statements = await mediator.orchestrate_simultaneous_turn_async(
+                        question, candidates, turn, all_statements
+                    )
+                else:
+                    turn_statements = await asyncio.to_thread(
+                        mediator.orchestrate_debate_turn,
+                        question=question,
+                        candidates=candidates,
+                        turn_number=turn,
+                        previous_statements=all_statements
+                    )
                 all_statements.extend(turn_statements)
                 logger.info(f"Turn {turn + 1}/{self.config.turns_per_question} completed with {len(turn_statements)} statements")
 
+            if simultaneous and self.config.rebuttal_turn:
+                rebuttals = await mediator.orchestrate_simultaneous_turn_async(
+                    question, candidates, self.config.turns_per_question, all_statements, rebuttal=True
+                )
+                all_statements.extend(rebuttals)
+                logger.info(f"Rebuttal turn completed with {len(rebuttals)} statements")
+
 
             # Step 4: Publish transcript for this question
-            transcript = self.mediator.publish_debate_transcript(
+            transcript = mediator.publish_debate_transcript(
                 all_statements=all_statements,
                 topic=topic,
                 question=question,
@@ -174,20 +693,131 @@ class GameEngine:
                 topic_index=topic_index,
                 question_index=question_index
             )
-            self.debate_transcripts.append(transcript)
-
-
-            for candidate in self.candidates:
-                candidate.reflect_on_debate(question, transcript)
+            transcripts.append(transcript)
+            if on_transcript:
+                on_transcript(transcript)
+
+            reflections = [candidate.reflect_on_debate_async(question, transcript) for candidate in candidates]
+            remaining = self.config.questions_per_topic - question_index - 1
+            if planned is not None and remaining > 0 and mediator.debate_diverged(
+                planned, transcript, self.config.question_planning.get("divergence_threshold", 0.34)
+            ):
+                logger.info(f"Debate on '{question.text}' diverged from the plan; re-planning {remaining} question(s)")
+                *_, replanned = await asyncio.gather(
+                    *reflections,
+                    asyncio.to_thread(mediator.plan_questions, topic, remaining, transcript)
+                )
+                plan[question_index + 1:] = replanned
+            else:
+                await asyncio.gather(*reflections)
 
             logger.info(f"Question debate complete. Transcript published (total statements: {len(all_statements)})")
     
+    async def _run_debates_pipelined(self) -> None:
+        """
+        Debate all topics while the population consumes each transcript as it is published.
+
+        Debates push transcripts into a queue; a consumer task has the population consume
+        each one. With config.pipeline_ordering = "deterministic" the consumer processes
+        transcripts in (topic, question) order whatever order they are published in
+        (relevant with parallel_topics), as _population_consume_debate does after
+        non-pipelined debates; "arrival" processes them as they come. With
+        config.pipeline_belief_updates = "per_epoch" (the default) the single belief update is
+        left to _run_epoch, so "deterministic" gives the same personas as the non-pipelined
+        run. "per_transcript" updates beliefs after every transcript as well, overlapping
+        those LLM calls with the mediator/candidate calls of the following questions.
+        """
+        if not self.mediator or not self.candidates:
+            raise ValueError("No mediator or candidates configured")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        consumer = asyncio.create_task(self._population_consume_stream(queue))
+
+        try:
+            if self.config.parallel_topics:
+                await self._conduct_debates_in_parallel_async(on_transcript=queue.put_nowait)
+            else:
+                for topic_index in range(len(self.mediator.topics)):
+                    await self._debate_topic_async(
+                        topic_index, self.mediator, self.candidates, self.debate_transcripts, on_transcript=queue.put_nowait
+                    )
+        finally:
+            queue.put_nowait(None)
+            await consumer
+
+    async def _population_consume_stream(self, queue: asyncio.Queue) -> None:
+        """Consume transcripts from `queue` (None ends the stream), updating beliefs after each one if configured."""
+        deterministic = self.config.pipeline_ordering == "deterministic"
+        pending: Dict[Tuple[int, int], DebateTranscript] = {}
+        order = [
+            (topic_index, question_index)
+            for topic_index in range(len(self.mediator.topics))
+            for question_index in range(self.config.questions_per_topic)
+        ]
+        position = 0
+
+        while True:
+            transcript = await queue.get()
+            if transcript is None:
+                break
+            if not deterministic:
+                await self._population_process_transcript(transcript)
+                continue
+
+            pending[(transcript.topic_index, transcript.question_index)] = transcript
+            while position < len(order) and order[position] in pending:
+                await self._population_process_transcript(pending.pop(order[position]))
+                position += 1
+
+        # Anything still buffered (e.g. an aborted topic) is processed in order
+        for key in sorted(pending):
+            await self._population_process_transcript(pending[key])
+
+    async def _population_process_transcript(self, transcript: DebateTranscript) -> None:
+        self.population.consume_debate_content(transcript)
+        logger.info(f"Population consumed debate on topic: {transcript.topic.title} (question {transcript.question_index + 1})")
+        if self.config.pipeline_belief_updates != "per_transcript":
+            return
+        await self.population.update_beliefs_from_debate_async(
+            max_concurrent=self.config.max_concurrent,
+            max_change_percentage=self.config.max_change_percentage
+        )
+
     def _population_consume_debate(self) -> None:
-        """Have all personas consume the latest debate transcript."""
-        if self.debate_transcripts:
-            latest_transcript = self.debate_transcripts[-1]
-            self.population.consume_debate_content(latest_transcript)
-            logger.info(f"Population consumed debate on topic: {latest_transcript.topic.title}")
+        """Have all personas consume this epoch's debate transcripts in (topic, question) order."""
+        transcripts = sorted(
+            (transcript for transcript in self.debate_transcripts if transcript.epoch == self.current_epoch),
+            key=lambda transcript: (transcript.topic_index, transcript.question_index)
+        )
+        for transcript in transcripts:
+            self.population.consume_debate_content(transcript)
+            logger.info(f"Population consumed debate on topic: {transcript.topic.title} (question {transcript.question_index + 1})")
+
+    def _run_population_dataflow(self, update_from_debate: bool = True) -> None:
+        """Run the population stages of the epoch per persona instead of phase by phase (config.persona_dataflow)."""
+        prior_posts = None
+        if self.social_media:
+            if self.config.feed_size:
+                prior_posts = self._build_feeds()
+            else:
+                posts = [self._post_to_dict(post) for post in self.social_media.posts]
+                prior_posts = {persona.id: posts for persona in self.population.personas}
+
+        dataflow = PersonaDataflow(
+            self.population,
+            self.social_media,
+            post_probability=self.config.post_probability,
+            reaction_probability=self.config.reaction_probability,
+            num_rounds_mean=self.config.num_rounds_mean,
+            num_rounds_variance=self.config.num_rounds_variance,
+            max_concurrent=self.config.max_concurrent,
+            max_change_percentage=self.config.max_change_percentage,
+            update_from_debate=update_from_debate,
+            prior_posts=prior_posts
+        )
+        stats = self._run_async(dataflow.run_async())
+        logger.info(f"Reactions: {stats['total_reactions']} total "
+                    f"({stats['thumbs_up']} 👍, {stats['thumbs_down']} 👎)")
 
     def _personas_chat_with_peers(self) -> None:
         """Orchestrate paired conversations between personas."""
@@ -197,9 +827,39 @@ class GameEngine:
         )
         logger.info(f"Completed {len(conversations)} paired conversations")
 
+    def _post_to_dict(self, post: Post) -> Dict[str, Any]:
+        """Convert a Post into the dict form personas consume, with current like/dislike counts."""
+        # Handle case where content might be a Post object instead of string
+        content = post.content
+        if isinstance(content, Post):
+            content = content.content  # Extract the actual string content
+
+        return {
+            "id": post.id,
+            "persona_id": post.persona_id,
+            "content": content,
+            "likes": post.likes,
+            "dislikes": post.dislikes
+        }
+
+    def _build_feeds(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Rank a personalized top-k feed (config.feed_size) for every persona."""
+        personas = self.population.personas
+        self.social_media.set_persona_profiles(
+            [persona.id for persona in personas],
+            persona_feature_matrix(personas),
+            [persona.features.get("media_diet", {}).get("social_media", 0.5) for persona in personas]
+        )
+        ranked = self.social_media.rank_feeds([persona.id for persona in personas], k=self.config.feed_size)
+        return {
+            persona_id: [self._post_to_dict(post) for post in posts]
+            for persona_id, posts in ranked.items()
+        }
+
     def _personas_post_to_social_media(self) -> None:
         """Have personas create and publish social media posts."""
-        posts = self.population.create_social_media_posts(post_probability=self.config.post_probability)
+        feeds = self._build_feeds() if self.social_media and self.config.feed_size else None
+        posts = self.population.create_social_media_posts(post_probability=self.config.post_probability, feeds=feeds)
         if self.social_media:
             # Add posts to social media platform and get their IDs
             post_ids = []
@@ -209,28 +869,16 @@ class GameEngine:
             logger.info(f"Published {len(post_ids)} posts to social media")
 
     def _population_react_to_posts(self) -> None:
-        """Have personas react to social media posts."""
+        """Have personas react to social media posts (their ranked feed if config.feed_size is set)."""
         if self.social_media:
-            # Convert Post objects to dicts with updated like/dislike counts
-            posts_as_dicts = []
-            for post in self.social_media.posts:
-                # Handle case where content might be a Post object instead of string
-                content = post.content
-                if isinstance(content, Post):
-                    content = content.content  # Extract the actual string content
-
-                posts_as_dicts.append({
-                    "id": post.id,
-                    "persona_id": post.persona_id,
-                    "content": content,
-                    "likes": post.likes,
-                    "dislikes": post.dislikes
-                })
+            feeds = self._build_feeds() if self.config.feed_size else None
+            posts_as_dicts = [] if feeds is not None else [self._post_to_dict(post) for post in self.social_media.posts]
 
             reaction_stats = self.population.react_to_posts(
                 posts_as_dicts,
                 self.social_media,
-                reaction_probability=self.config.reaction_probability
+                reaction_probability=self.config.reaction_probability,
+                feeds=feeds
             )
             logger.info(f"Reactions: {reaction_stats['total_reactions']} total "
                        f"({reaction_stats['thumbs_up']} 👍, {reaction_stats['thumbs_down']} 👎)")
@@ -258,8 +906,26 @@ class GameEngine:
                 "questions_per_topic": self.config.questions_per_topic,
                 "turns_per_question": self.config.turns_per_question,
                 "num_epochs": self.config.num_epochs,
-                "random_seed": self.config.random_seed
+                "random_seed": self.config.random_seed,
+                "population_query": self.config.population_query,
+                "population_sampling": self.config.population_sampling,
+                "archetypes": self.config.archetypes,
+                "opinion_dynamics": self.config.opinion_dynamics,
+                "feed_size": self.config.feed_size,
+                "post_retention_epochs": self.config.post_retention_epochs,
+                "feed_digest": self.config.feed_digest,
+                "parallel_topics": self.config.parallel_topics,
+                "pipeline_debates": self.config.pipeline_debates,
+                "pipeline_ordering": self.config.pipeline_ordering,
+                "pipeline_belief_updates": self.config.pipeline_belief_updates,
+                "persona_dataflow": self.config.persona_dataflow,
+                "population_shards": self.config.population_shards,
+                "agent_memory": self.config.agent_memory,
+                "question_planning": self.config.question_planning,
+                "debate_protocol": self.config.debate_protocol,
+                "rebuttal_turn": self.config.rebuttal_turn
             },
+            "parent": self.parent,
             "topics": self._serialize_topics(),
             "candidates": self._serialize_candidate_profiles(),
             "population": self._serialize_population_profiles()
@@ -272,8 +938,10 @@ class GameEngine:
         logger.info(f"Serialized simulation metadata to {metadata_file}")
 
         # Copy the config file to the simulation directory
-        if self.config_path and os.path.exists(self.config_path):
-            config_dest = self.simulation_dir / "config.yaml"
+        config_dest = self.simulation_dir / "config.yaml"
+        if self.config_path and Path(self.config_path) == config_dest:
+            pass  # Written in place (forks)
+        elif self.config_path and os.path.exists(self.config_path):
             shutil.copy2(self.config_path, config_dest)
             logger.info(f"Copied config file to {config_dest}")
         else:
@@ -332,6 +1000,7 @@ class GameEngine:
         - debates: List of debate transcripts for this epoch (with topic_id references only)
         - newsfeed: Social media posts from this epoch
         - candidates: Candidate dynamic state (policy positions and memory)
+        - agent_memory: Approximate memory size of the mediator and each candidate
         - population_votes: Population dynamic state (beliefs and votes)
         """
         if self.simulation_file is None:
@@ -345,6 +1014,25 @@ class GameEngine:
             "candidates": self._serialize_candidates(),
             "population_votes": self._serialize_population_votes()
         }
+        if self.opinion_dynamics:
+            epoch_data["opinion_dynamics"] = {
+                "population_size": self.opinion_dynamics.size,
+                "step_size": self.opinion_dynamics.step_size,
+                "vote_shares": self.opinion_dynamics.vote_shares()
+            }
+        if self.feed_digest is not None:
+            epoch_data["feed_digest"] = self.feed_digest
+        epoch_data["agent_memory"] = {
+            agent.id: agent.memory_manager.stats()
+            for agent in self._memory_agents() if agent.memory_manager is not None
+        }
+        if self.population.archetype_settings:
+            epoch_data["archetype_stats"] = self.population.archetype_stats
+            self.population.archetype_stats = []
+        if self.population.is_weighted():
+            epoch_data["population_vote_estimate"] = self.population.estimate_belief_vote_shares(
+                [candidate.name for candidate in self.candidates]
+            )
 
         # Append to JSONL file (one JSON object per line)
         with open(self.simulation_file, 'a') as f:
@@ -387,26 +1075,14 @@ class GameEngine:
         return debates
 
     def _serialize_social_media(self) -> Dict[str, Any]:
-        """Serialize social media posts."""
+        """Serialize social media posts and this epoch's reactions ([post_id, persona_id, +1/-1] rows)."""
         if not self.social_media:
-            return {"posts": []}
-
-        posts = []
-        for post in self.social_media.posts:
-            # Handle case where content might be a Post object instead of string
-            content = post.content
-            if isinstance(content, Post):
-                content = content.content  # Extract the actual string content
-
-            posts.append({
-                "id": post.id,
-                "persona_id": post.persona_id,
-                "content": content,
-                "likes": post.likes,
-                "dislikes": post.dislikes
-            })
+            return {"posts": [], "reactions": []}
 
-        return {"posts": posts}
+        return {
+            "posts": [self._post_to_dict(post) for post in self.social_media.posts],
+            "reactions": self.social_media.reaction_log.epoch_records(self.current_epoch)
+        }
 
     def _serialize_candidates(self) -> List[Dict[str, Any]]:
         """Serialize candidate dynamic state (policy positions and memory only)."""
@@ -437,6 +1113,9 @@ class GameEngine:
         """
         Save the final vote results to a JSON file in the simulation directory.
 
+        For a stratified (weighted) population, the extrapolated vote shares of the target
+        population are saved next to it in final_vote_estimate.json.
+
         Args:
             vote_results: Dictionary containing the final vote results
         """
@@ -448,4 +1127,14 @@ class GameEngine:
         with open(final_vote_file, 'w') as f:
             json.dump(vote_results, f, indent=2)
 
-        logger.info(f"Saved final vote results to {final_vote_file}")
\ No newline at end of file
+        logger.info(f"Saved final vote results to {final_vote_file}")
+
+        if self.population.is_weighted():
+            estimate = {
+                "weighted_shares": self.population.estimate_vote_shares([candidate.name for candidate in self.candidates]),
+                "target_population_size": sum(self.population.stratum_sizes.values())
+            }
+            estimate_file = self.simulation_dir / "final_vote_estimate.json"
+            with open(estimate_file, 'w') as f:
+                json.dump(estimate, f, indent=2)
+            logger.info(f"Saved weighted final vote estimate to {estimate_file}")
\ No newline at end of file
@@ -2,6 +2,10 @@
 
 import google.generativeai as genai
 
+# Optional sharing across the runs of an experiment (see configure_sharing)
+_response_cache = None
+_rate_budget = None
+
 
 def create_client(api_key: str):
     """Create Gemini client by configuring API key."""
@@ -9,6 +13,30 @@ def create_client(api_key: str):
     return genai  # Return the module itself since it's stateless
 
 
+def configure_sharing(response_cache=None, rate_budget=None) -> None:
+    """
+    Route every request of this process through a shared response cache and rate budget.
+
+    Args:
+        response_cache: ResponseCache answering repeated requests (None: no caching)
+        rate_budget: RateBudget every uncached request waits for (None: no limit)
+    """
+    global _response_cache, _rate_budget
+    _response_cache = response_cache
+    _rate_budget = rate_budget
+
+
+def sharing_state():
+    """Occurrence counts of the configured response cache (saved with checkpoints), or None."""
+    return _response_cache.occurrence_state() if _response_cache is not None else None
+
+
+def restore_sharing_state(state) -> None:
+    """Continue the configured response cache's occurrence counts from a checkpoint."""
+    if _response_cache is not None and state is not None:
+        _response_cache.restore_occurrences(state)
+
+
 def generate_response(
     client,
     prompt: str,
@@ -18,6 +46,14 @@ def generate_response(
     model: str = 'gemini-2.0-flash-lite'
 ) -> str:
     """Generate LLM response with system instruction."""
+    key = _response_cache.key(model, system_instruction, prompt, temperature, max_output_tokens) if _response_cache is not None else None
+    if key is not None:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            return cached
+    if _rate_budget is not None:
+        _rate_budget.wait()
+
     model = client.GenerativeModel(
         model,
         system_instruction=system_instruction
@@ -29,6 +65,8 @@ def generate_response(
             max_output_tokens=max_output_tokens
         )
     )
+    if key is not None:
+        _response_cache.put(key, response.text)
     return response.text
 
 
@@ -40,8 +78,17 @@ async def generate_response_async(
     max_output_tokens: int = 8000
 ) -> str:
     """Async version of generate_response for parallel execution."""
+    model_name = 'gemini-2.5-flash-lite'  # 'gemini-2.0-flash-lite'
+    key = _response_cache.key(model_name, system_instruction, prompt, temperature, max_output_tokens) if _response_cache is not None else None
+    if key is not None:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            return cached
+    if _rate_budget is not None:
+        await _rate_budget.wait_async()
+
     model = client.GenerativeModel(
-        'gemini-2.5-flash-lite',  # 'gemini-2.0-flash-lite',
+        model_name,
         system_instruction=system_instruction
     )
     response = await model.generate_content_async(
@@ -51,4 +98,6 @@ async def generate_response_async(
             max_output_tokens=max_output_tokens
         )
     )
+    if key is not None:
+        _response_cache.put(key, response.text)
     return response.text
@@ -1,7 +1,11 @@
+import re
+import json
+import asyncio
 import logging
-from typing import List
-from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from . import llm_client
+from .agent_memory import AgentMemory
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +63,41 @@ class DebateTranscript:
     question: Question
 
 
+@dataclass
+class TopicHistory:
+    """Index of the debates published on one topic, used when proposing the next question."""
+    questions: List[str] = field(default_factory=list)
+    sample_statements: List[CandidateStatement] = field(default_factory=list)  # First few candidate statements
+
+
+@dataclass
+class PlannedQuestion:
+    """A question planned ahead together with its introduction and the points answers should cover."""
+    question: Question
+    introduction: str
+    key_terms: List[str] = field(default_factory=list)
+
+
+# Words ignored when checking whether a debate stayed on its question
+STOPWORDS = {
+    "about", "after", "also", "been", "being", "could", "does", "from", "have", "into", "more", "most",
+    "should", "such", "than", "that", "their", "them", "there", "these", "they", "this", "those", "what",
+    "when", "where", "which", "while", "will", "with", "would", "your"
+}
+
+
+def _content_words(text: str) -> Set[str]:
+    return {word for word in re.findall(r"[a-z]+", text.lower()) if len(word) > 3 and word not in STOPWORDS}
+
+
+def _transcript_key(transcript: DebateTranscript) -> Tuple[int, str, int, str]:
+    return (transcript.epoch, transcript.topic.id, transcript.question_index, transcript.question.id)
+
+
 class Mediator:
+    # Candidate statements kept per topic as a sample of previous positions
+    SAMPLE_STATEMENTS = 5
+
     def __init__(self, mediator_id: str, topics: List[Topic] = None, llm_client_instance=None, world_story: str = None):
         self.id = mediator_id
         self.topics = topics if topics is not None else []
@@ -76,16 +114,51 @@ You are a debate moderator in this world. Frame questions and introductions with
 """
             logger.debug(f"Mediator: Initialized with world context in memory ({len(world_story)} chars)")
 
+        self.memory_manager = AgentMemory(pinned=initial_memory)
+
+        # Per-topic index of published transcripts, maintained by index_transcript. Topic-parallel
+        # forks (copy.copy) share it; each fork only touches the entry of its own topic.
+        self.topic_histories: Dict[str, TopicHistory] = {}
+        self._indexed_transcripts: Set[Tuple[int, str, int, str]] = set()
+
+        # Running digest of all debates reviewed by read_previous_debates
+        self.debates_digest = ""
+        self._reviewed_transcripts: Set[Tuple[int, str, int, str]] = set()
         self.state = MediatorState(
             id=mediator_id,
             memory=initial_memory,
             world_context=world_story if world_story else ""
         )
 
+    def _remember(self, entry: str) -> None:
+        """Append an entry to memory and refresh the memory text used in prompts."""
+        self.memory_manager.append(entry)
+        self.state.memory = self.memory_manager.render()
+
+    async def compact_memory_async(self) -> bool:
+        """Summarize older memory entries if memory is over its token budget (see AgentMemory)."""
+        compacted = await self.memory_manager.compact_async(self.llm_client, "the debate moderator")
+        if compacted:
+            self.state.memory = self.memory_manager.render()
+        return compacted
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # LLM clients are not picklable; checkpoint.load_checkpoint attaches a new one
+        state = self.__dict__.copy()
+        state["llm_client"] = None
+        return state
+
     def add_topic(self, topic: Topic) -> None:
         """Add a topic to the mediator's topic pool."""
         self.topics.append(topic)
 
+    def read_social_media_digest(self, digest) -> None:
+        """Read a shared FeedDigest instead of the raw feed."""
+        if digest.total_posts == 0:
+            logger.debug("Mediator: Empty social media digest")
+            return
+        self.read_social_media_signals(digest.to_text())
+
     def read_social_media_signals(self, social_media_feed: str) -> None:
         """Read social media signals to understand current public sentiment and key themes."""
         logger.debug(f"Mediator: read_social_media_signals called with feed length: {len(social_media_feed) if social_media_feed else 0}")
@@ -116,23 +189,44 @@ Summarize the key themes and sentiment in 2-3 sentences."""
         )
 
         # Update memory
-        self.state.memory += f"Social media review: {analysis.strip()}\n"
+        self._remember(f"Social media review: {analysis.strip()}\n")
         logger.info(f"Mediator analyzed social media: {analysis.strip()[:100]}...")
         logger.debug(f"Mediator: Memory updated. Total memory length: {len(self.state.memory)}")
 
+    def index_transcript(self, transcript: DebateTranscript) -> None:
+        """Add a published transcript to its topic's history (no-op if already indexed)."""
+        key = _transcript_key(transcript)
+        if key in self._indexed_transcripts:
+            return
+        self._indexed_transcripts.add(key)
+
+        history = self.topic_histories.setdefault(transcript.topic.id, TopicHistory())
+        history.questions.append(transcript.question.text)
+        for stmt in transcript.statements:
+            if len(history.sample_statements) >= self.SAMPLE_STATEMENTS:
+                break
+            if isinstance(stmt, CandidateStatement):
+                history.sample_statements.append(stmt)
+
     def read_previous_debates(self, previous_transcripts: List[DebateTranscript]) -> None:
-        """Read previous debate transcripts to understand how candidate positions have evolved."""
+        """
+        Read previous debate transcripts to understand how candidate positions have evolved.
+
+        Only transcripts not reviewed before are summarized; the LLM merges them into the
+        running digest of earlier reviews, so the prompt does not grow with run length.
+        """
         logger.debug(f"Mediator: read_previous_debates called with {len(previous_transcripts)} transcripts")
 
-        if not previous_transcripts:
-            logger.debug("Mediator: No previous debates to review")
+        new_transcripts = [t for t in previous_transcripts if _transcript_key(t) not in self._reviewed_transcripts]
+        if not new_transcripts:
+            logger.debug("Mediator: No new previous debates to review")
             return
 
-        logger.info(f"Mediator reviewing {len(previous_transcripts)} previous debate(s)...")
+        logger.info(f"Mediator reviewing {len(new_transcripts)} new previous debate(s)...")
 
-        # Build summary of previous debates
+        # Build summary of the new debates
         debate_summary = ""
-        for transcript in previous_transcripts:
+        for transcript in new_transcripts:
             debate_summary += f"\nEpoch {transcript.epoch}, Topic: {transcript.topic.title}\n"
             for stmt in transcript.statements:
                 if isinstance(stmt, CandidateStatement):
@@ -140,15 +234,17 @@ Summarize the key themes and sentiment in 2-3 sentences."""
 
         logger.debug(f"Mediator: Debate summary length: {len(debate_summary)}")
 
+        digest = f"Your digest of the debates reviewed so far:\n{self.debates_digest}\n\n" if self.debates_digest else ""
+
         prompt = f"""Review these previous debate transcripts and identify:
 1. Key positions each candidate has taken
 2. How positions have evolved over time
 3. Areas of agreement and disagreement
 
-Previous debates:
+{digest}Previous debates:
 {debate_summary}
 
-Summarize the key insights in 2-3 sentences."""
+Summarize the key insights in 2-3 sentences{", merging them with your digest" if self.debates_digest else ""}."""
 
         system_instruction = "You are a debate moderator. Analyze previous debates to understand candidate positions and their evolution."
 
@@ -159,32 +255,34 @@ Summarize the key insights in 2-3 sentences."""
             system_instruction
         )
 
+        self.debates_digest = analysis.strip()
+        self._reviewed_transcripts.update(_transcript_key(t) for t in new_transcripts)
+
         # Update memory
-        self.state.memory += f"Previous debates review: {analysis.strip()}\n"
+        self._remember(f"Previous debates review: {analysis.strip()}\n")
         logger.info(f"Mediator analyzed previous debates: {analysis.strip()[:100]}...")
         logger.debug(f"Mediator: Memory updated. Total memory length: {len(self.state.memory)}")
 
     def propose_question(
         self,
         topic: Topic,
-        previous_transcripts: List[DebateTranscript]
+        previous_transcripts: Optional[List[DebateTranscript]] = None
     ) -> Question:
         """Propose a new question for debate on the given topic.
 
         Uses context from previous questions, candidate positions, and social media.
+        Previous questions on the topic come from the per-topic index of published
+        transcripts; `previous_transcripts` not published by this mediator are indexed first.
         """
         logger.debug(f"Mediator: propose_question for topic '{topic.title}'")
 
-        # Extract previous questions and statements for THIS topic only
-        previous_questions = []
-        previous_statements = []
-        for transcript in previous_transcripts:
-            if transcript.topic.id == topic.id:
-                previous_questions.append(transcript.question.text)
-                previous_statements.extend([
-                    s for s in transcript.statements
-                    if isinstance(s, CandidateStatement)
-                ])
+        for transcript in previous_transcripts or []:
+            self.index_transcript(transcript)
+
+        # Previous questions and statements for THIS topic only
+        history = self.topic_histories.get(topic.id, TopicHistory())
+        previous_questions = history.questions
+        previous_statements = history.sample_statements
 
         logger.debug(f"Mediator: Found {len(previous_questions)} previous questions on this topic")
 
@@ -240,6 +338,123 @@ Return ONLY the question text as a single, concise sentence."""
             topic=topic
         )
 
+    def _plan_prompt(self, topic: Topic, count: int, diverged_transcript: Optional[DebateTranscript]) -> str:
+        history = self.topic_histories.get(topic.id, TopicHistory())
+        prompt = f"""Topic: {topic.title}
+Description: {topic.description}"""
+
+        if history.questions:
+            prompt += "\n\nQuestions already asked:\n"
+            for i, q in enumerate(history.questions, 1):
+                prompt += f"{i}. {q}\n"
+
+        if diverged_transcript is not None:
+            prompt += f"\n\nThe last debate, on \"{diverged_transcript.question.text}\", moved away from the planned questions:\n"
+            for stmt in diverged_transcript.statements:
+                if isinstance(stmt, CandidateStatement):
+                    prompt += f"- {stmt.candidate_name}: {stmt.statement[:150]}...\n"
+            prompt += "Plan the remaining questions so they follow up on where the debate actually went."
+        elif history.sample_statements:
+            prompt += "\n\nPrevious candidate positions (sample):\n"
+            for stmt in history.sample_statements:
+                prompt += f"- {stmt.candidate_name}: {stmt.statement[:80]}...\n"
+
+        if self.state.memory:
+            prompt += f"\n\nYour preparation context:\n{self.state.memory}"
+
+        example = [{"question": "...", "introduction": "...", "key_terms": ["...", "..."]}]
+        prompt += f"""
+
+Plan the next {count} debate question(s) on this topic, in the order they will be asked. Each question must:
+- Not repeat a question already asked or planned
+- Build on the previous questions, so the sequence deepens the discussion
+- Be CONCISE (one clear sentence, maximum 20 words), NEUTRAL, and addressed to ALL candidates
+
+For each question also write a 2-4 sentence introduction (reference the world setting, public sentiment or
+previous debate positions only where directly relevant; stay neutral) and 3-5 key terms a relevant answer
+is expected to use.
+
+Return ONLY a JSON list of {count} objects like:
+{json.dumps(example)}"""
+        return prompt
+
+    def plan_questions(
+        self,
+        topic: Topic,
+        count: int,
+        diverged_transcript: Optional[DebateTranscript] = None
+    ) -> List[PlannedQuestion]:
+        """
+        Plan the next `count` questions on a topic, with introductions, in one structured LLM call.
+
+        Replaces a propose_question + introduce_question round trip per question. Pass the
+        transcript of a debate that diverged from the plan (see debate_diverged) to re-plan
+        the remaining questions around it.
+
+        Returns:
+            Planned questions in order; an empty list if the response could not be parsed
+        """
+        if count <= 0:
+            return []
+
+        history = self.topic_histories.get(topic.id, TopicHistory())
+        system_instruction = "You are a debate moderator planning a sequence of thoughtful, specific questions. Return only JSON."
+
+        logger.debug(f"Mediator: Planning {count} questions for topic '{topic.title}'")
+        response = llm_client.generate_response(self.llm_client, self._plan_prompt(topic, count, diverged_transcript), system_instruction)
+
+        try:
+            response_clean = response.strip()
+            if response_clean.startswith("```json"):
+                response_clean = response_clean[7:]
+            if response_clean.startswith("```"):
+                response_clean = response_clean[3:]
+            if response_clean.endswith("```"):
+                response_clean = response_clean[:-3]
+            items = json.loads(response_clean.strip())
+            planned = [
+                PlannedQuestion(
+                    question=Question(
+                        id=f"{topic.id}_q{len(history.questions) + i + 1}",
+                        text=str(item["question"]).strip(),
+                        topic=topic
+                    ),
+                    introduction=str(item.get("introduction", "")).strip() or f"Today's question: {item['question']}",
+                    key_terms=[str(term) for term in item.get("key_terms", [])]
+                )
+                for i, item in enumerate(items[:count])
+            ]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Mediator: Could not parse question plan for '{topic.title}': {e}")
+            return []
+
+        logger.info(f"Mediator planned {len(planned)} question(s) for '{topic.title}'")
+        return planned
+
+    @staticmethod
+    def debate_diverged(planned: PlannedQuestion, transcript: DebateTranscript, threshold: float = 0.34) -> bool:
+        """
+        Whether the candidates' answers drifted away from a planned question.
+
+        The debate diverged if the candidate statements use less than `threshold` of the
+        question's key terms (or of the question's content words if it has none).
+        """
+        terms = set()
+        for term in planned.key_terms:
+            terms |= _content_words(term)
+        if not terms:
+            terms = _content_words(planned.question.text)
+        if not terms:
+            return False
+
+        spoken = set()
+        for stmt in transcript.statements:
+            if isinstance(stmt, CandidateStatement):
+                spoken |= _content_words(stmt.statement)
+        coverage = len(terms & spoken) / len(terms)
+        logger.debug(f"Mediator: Debate on '{planned.question.text}' covered {coverage:.0%} of its key terms")
+        return coverage < threshold
+
     def introduce_question(self, question: Question) -> str:
         """Generate introduction for the debate question.
 
@@ -311,6 +526,39 @@ INSTRUCTIONS:
 
         return statements
 
+    async def orchestrate_simultaneous_turn_async(
+        self,
+        question: Question,
+        candidates: List,
+        turn_number: int,
+        previous_statements: List,
+        rebuttal: bool = False
+    ) -> List[CandidateStatement]:
+        """
+        Orchestrate a debate turn in which all candidates answer at once.
+
+        Unlike orchestrate_debate_turn, no candidate sees another's statement from the same
+        turn; everyone answers from the statements of previous turns, concurrently.
+
+        Args:
+            question: The Question being debated
+            candidates: List of Candidate objects
+            turn_number: Current turn number (0-indexed)
+            previous_statements: All statements from previous turns and mediator introduction
+            rebuttal: Ask candidates to rebut the answers of the previous turn
+
+        Returns:
+            List of CandidateStatements from this turn, in candidate order
+        """
+        context = list(previous_statements)
+        statements = await asyncio.gather(*[
+            candidate.craft_debate_statement_async(question, turn_number, context, rebuttal=rebuttal)
+            for candidate in candidates
+        ])
+        for statement in statements:
+            logger.debug(f"[Turn {turn_number}{' rebuttal' if rebuttal else ''}] {statement.candidate_name}: {statement.statement}")
+        return list(statements)
+
     def publish_debate_transcript(
         self,
         all_statements: List,
@@ -334,7 +582,7 @@ INSTRUCTIONS:
         Returns:
             DebateTranscript with all statements and metadata
         """
-        return DebateTranscript(
+        transcript = DebateTranscript(
             statements=all_statements,
             mediator_id=self.id,
             epoch=epoch,
@@ -343,3 +591,5 @@ INSTRUCTIONS:
             topic=topic,
             question=question
         )
+        self.index_transcript(transcript)
+        return transcript
@@ -0,0 +1,183 @@
+"""Vectorized numeric opinion dynamics as a surrogate for LLM belief updates.
+
+Every persona in a (possibly very large) persona file gets a stance tensor:
+for each topic, a probability distribution over the candidates. Only a
+sampled subset of personas is simulated with LLM belief updates; their
+before/after stances calibrate a bounded-confidence DeGroot model that then
+advances everyone else in one NumPy pass:
+
+    S_i += mu * s_i * (w_i * mean_{j in N_i, |S_j - S_i| < eps_i} (S_j - S_i)
+                       + (1 - w_i) * (D - S_i))
+
+where ``s_i`` is the persona's ``susceptibility``, ``w_i`` its
+``social_network_influence``, ``eps_i = confidence * (1 - confirmation_bias_i)``
+its confidence bound, ``N_i`` a fixed random peer set and ``D`` the debate
+target (the mean stance the LLM subset moved to). The step size ``mu`` is
+fitted by least squares to the LLM subset's observed shifts.
+"""
+
+import logging
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from .persona_store import PersonaStore
+
+logger = logging.getLogger(__name__)
+
+OVERALL = "overall"
+
+# Rows per chunk when gathering neighbor stances (bounds peak memory)
+CHUNK_SIZE = 100_000
+
+
+def _trait(store: PersonaStore, name: str, default: float) -> np.ndarray:
+    if name not in store.columns:
+        return np.full(len(store), default, dtype=np.float32)
+    values = np.asarray(store.numeric(name), dtype=np.float32)
+    return np.where(np.isnan(values), default, values)
+
+
+class OpinionDynamics:
+    """Population-wide stance tensor advanced by calibrated bounded-confidence dynamics."""
+
+    def __init__(
+        self,
+        susceptibility: np.ndarray,
+        confirmation_bias: np.ndarray,
+        social_influence: np.ndarray,
+        topics: List[str],
+        candidates: List[str],
+        neighbors: int = 8,
+        confidence: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.topics = list(topics) + [OVERALL]
+        self.candidates = list(candidates)
+        self.size = len(susceptibility)
+
+        self.susceptibility = np.clip(susceptibility, 0.0, 1.0).astype(np.float32)
+        self.social_influence = np.clip(social_influence, 0.0, 1.0).astype(np.float32)
+        self.confidence_bound = (confidence * (1.0 - np.clip(confirmation_bias, 0.0, 1.0))).astype(np.float32)
+
+        # Fixed random peer graph; self-loops are harmless (zero pull)
+        self.neighbors = self.rng.integers(0, self.size, size=(self.size, neighbors), dtype=np.int64)
+
+        # Start undecided with a little noise so ties break differently per persona
+        shape = (self.size, len(self.topics), len(self.candidates))
+        noise = self.rng.uniform(0.9, 1.1, size=shape).astype(np.float32)
+        self.stances = noise / noise.sum(axis=2, keepdims=True)
+
+        self.step_size = 0.5
+        self.debate_target = np.full((len(self.topics), len(self.candidates)), 1.0 / len(self.candidates), dtype=np.float32)
+
+    @classmethod
+    def from_store(cls, store: PersonaStore, topics: List[str], candidates: List[str], **kwargs) -> 'OpinionDynamics':
+        """Build the surrogate over every persona in a columnar store."""
+        return cls(
+            _trait(store, "susceptibility", 0.5),
+            _trait(store, "confirmation_bias", 0.5),
+            _trait(store, "social_network_influence", 0.5),
+            topics,
+            candidates,
+            **kwargs
+        )
+
+    def stances_from_beliefs(self, beliefs_list: List[Dict[str, Any]], current: np.ndarray) -> np.ndarray:
+        """
+        Convert LLM beliefs into stance rows (one-hot on the preferred candidate).
+
+        Belief keys are free-form, so a topic matches a belief whose key equals the
+        topic name or contains/is contained in it; unmatched topics fall back to the
+        overall vote, and rows without any usable vote keep their current stance.
+        """
+        stances = current.copy()
+        for row, beliefs in enumerate(beliefs_list):
+            overall = beliefs.get("overall_vote") if isinstance(beliefs.get("overall_vote"), str) else None
+            topic_votes = {
+                key.lower(): value.get("vote") for key, value in beliefs.items()
+                if isinstance(value, dict)
+            }
+            for t, topic in enumerate(self.topics):
+                vote = overall
+                if topic != OVERALL:
+                    needle = topic.lower()
+                    for key, topic_vote in topic_votes.items():
+                        if key == needle or key in needle or needle in key:
+                            vote = topic_vote
+                            break
+                if vote in self.candidates:
+                    stances[row, t] = 0.0
+                    stances[row, t, self.candidates.index(vote)] = 1.0
+        return stances
+
+    def _pull(self, rows: np.ndarray, stances: np.ndarray) -> np.ndarray:
+        """Unit-step shift (mu = 1) for the given rows, computed from `stances`."""
+        current = stances[rows]  # (r, T, C)
+        peers = stances[self.neighbors[rows]]  # (r, k, T, C)
+        difference = peers - current[:, None]
+        distance = 0.5 * np.abs(difference).sum(axis=3)  # total variation, (r, k, T)
+        close = (distance < self.confidence_bound[rows, None, None]).astype(np.float32)
+        count = close.sum(axis=1)  # (r, T)
+        peer_pull = (difference * close[..., None]).sum(axis=1) / np.maximum(count, 1.0)[..., None]
+
+        media_pull = self.debate_target[None] - current
+        w = self.social_influence[rows, None, None]
+        s = self.susceptibility[rows, None, None]
+        return s * (w * peer_pull + (1.0 - w) * media_pull)
+
+    def calibrate(self, rows: np.ndarray, before: np.ndarray, after: np.ndarray) -> None:
+        """
+        Fit the debate target and step size to the LLM subset's observed shifts.
+
+        Args:
+            rows: Surrogate rows of the LLM-simulated personas
+            before: Their stances before this epoch's LLM belief updates
+            after: Their stances after the updates
+        """
+        if len(rows) == 0:
+            return
+
+        self.debate_target = after.mean(axis=0).astype(np.float32)
+
+        saved = self.stances[rows].copy()
+        self.stances[rows] = before
+        predicted = self._pull(rows, self.stances)
+        self.stances[rows] = saved
+
+        observed = after - before
+        denominator = float((predicted * predicted).sum())
+        if denominator > 0:
+            self.step_size = float(np.clip((observed * predicted).sum() / denominator, 0.0, 1.0))
+
+        logger.info(f"Opinion dynamics calibrated on {len(rows)} personas: step size {self.step_size:.3f}")
+
+    def step(self, pinned_rows: Optional[np.ndarray] = None, pinned_stances: Optional[np.ndarray] = None) -> None:
+        """
+        Advance every persona by one synchronous update.
+
+        Args:
+            pinned_rows: Rows whose stances come from the LLM instead of the surrogate
+            pinned_stances: Stances for the pinned rows
+        """
+        previous = self.stances
+        updated = np.empty_like(previous)
+        for start in range(0, self.size, CHUNK_SIZE):
+            rows = np.arange(start, min(start + CHUNK_SIZE, self.size))
+            updated[rows] = previous[rows] + self.step_size * self._pull(rows, previous)
+
+        np.clip(updated, 0.0, None, out=updated)
+        updated /= np.maximum(updated.sum(axis=2, keepdims=True), 1e-9)
+        if pinned_rows is not None:
+            updated[pinned_rows] = pinned_stances
+        self.stances = updated
+
+    def vote_shares(self, weights: Optional[np.ndarray] = None) -> Dict[str, Dict[str, float]]:
+        """Expected share of votes for each candidate, per topic (stances read as vote probabilities)."""
+        weights = np.ones(self.size, dtype=np.float64) if weights is None else np.asarray(weights, dtype=np.float64)
+        expected = np.tensordot(weights, self.stances, axes=(0, 0)) / weights.sum()  # (T, C)
+        return {
+            topic: {candidate: float(expected[t, c]) for c, candidate in enumerate(self.candidates)}
+            for t, topic in enumerate(self.topics)
+        }
@@ -31,6 +31,8 @@ class Persona:
         self.social_media_knowledge = []  # List of social media posts seen
         self.posts = []  # List of posts made by this persona
         self.beliefs = {}  # Dict of current beliefs (evolve via LLM, don't use prior_beliefs)
+        self.weight = 1.0  # Post-stratification weight (see stratified_sampling.py)
+        self.stratum = None  # Stratum label when drawn by stratified sampling
 
         # Initialize LLM client for persona
         load_dotenv()
@@ -39,6 +41,12 @@ class Persona:
             raise ValueError("GEMINI_API_KEY not found in environment")
         self.llm_client = llm_client.create_client(api_key)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # LLM clients are not picklable; checkpoint.load_checkpoint attaches a new one
+        state = self.__dict__.copy()
+        state["llm_client"] = None
+        return state
+
     def _format_full_identity(self) -> str:
         """Format complete persona identity for use in prompts."""
         if not self.features:
@@ -363,8 +371,8 @@ are shaped by this context.
         # Add social media feed
         lines.append("=== SOCIAL MEDIA FEED ===")
         if existing_posts:
-            # Show last 5 posts
-            for post in existing_posts[-5:]:
+            # Show the top 5 posts of the (ranked) feed
+            for post in existing_posts[:5]:
                 lines.append(f"@{post.get('persona_id', 'Unknown')}: {post.get('content', '')}")
         else:
             lines.append("(No posts yet)")
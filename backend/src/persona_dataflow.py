@@ -0,0 +1,256 @@
+"""Per-persona dataflow execution of the population part of an epoch.
+
+The phase-by-phase epoch (debate belief update -> chat -> chat belief update
+-> post -> react -> social belief update) waits for the slowest persona at
+every phase boundary. Here every persona runs through those stages as its
+own coroutine and only waits where another persona's output is needed:
+
+- a chat starts once both partners have finished their debate belief update
+- a reaction to a post of this epoch waits for that one post to be published
+- a post is published once the posts of earlier posters (in plan order) are
+
+All random decisions (pairs, chat rounds, who posts, which posts get a
+reaction) are drawn up front or from per-(persona, post) seeds, and posts
+reach the platform in plan order however their LLM calls interleave, so
+nothing depends on the order in which coroutines happen to finish. LLM calls of
+all stages share one semaphore, so throughput is bound by the configured
+concurrency rather than by the slowest persona of each phase.
+"""
+
+import random
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional
+
+from .persona import Persona
+
+logger = logging.getLogger(__name__)
+
+
+class PersonaDataflow:
+    """Runs one epoch's population stages with per-persona dependencies instead of global barriers."""
+
+    def __init__(
+        self,
+        population,
+        social_media=None,
+        post_probability: float = 0.07,
+        reaction_probability: float = 0.4,
+        num_rounds_mean: int = 3,
+        num_rounds_variance: int = 1,
+        max_concurrent: int = 20,
+        max_change_percentage: float = 0.5,
+        update_from_debate: bool = True,
+        prior_posts: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ):
+        """
+        Args:
+            population: Population whose personas advance through the stages
+            social_media: Platform that new posts and reactions are published to
+            post_probability: Probability that a persona posts this epoch
+            reaction_probability: Probability that a persona reacts to a visible post
+            num_rounds_mean: Average number of chat rounds per pair
+            num_rounds_variance: Variance in number of chat rounds
+            max_concurrent: Maximum number of concurrent LLM calls across all stages
+            max_change_percentage: Passed to belief updates
+            update_from_debate: Run the debate belief update stage (False if already done)
+            prior_posts: persona_id -> posts from earlier epochs the persona sees (and reacts to)
+        """
+        self.population = population
+        self.social_media = social_media
+        self.post_probability = post_probability
+        self.reaction_probability = reaction_probability
+        self.num_rounds_mean = num_rounds_mean
+        self.num_rounds_variance = num_rounds_variance
+        self.max_concurrent = max_concurrent
+        self.max_change_percentage = max_change_percentage
+        self.update_from_debate = update_from_debate
+        self.prior_posts = prior_posts or {}
+
+    def _plan(self, personas: List[Persona]) -> None:
+        """Draw every random decision of the epoch before any persona starts."""
+        shuffled = personas.copy()
+        random.shuffle(shuffled)
+        self.pairs = [(shuffled[i], shuffled[i + 1]) for i in range(0, len(shuffled) - 1, 2)]
+        self.rounds = [
+            max(1, self.num_rounds_mean + random.randint(-self.num_rounds_variance, self.num_rounds_variance))
+            for _ in self.pairs
+        ]
+        self.pair_of = {}
+        for index, (persona_a, persona_b) in enumerate(self.pairs):
+            self.pair_of[persona_a.id] = index
+            self.pair_of[persona_b.id] = index
+
+        self.posters = [persona for persona in personas if random.random() < self.post_probability]
+        self.reaction_seed = random.random()
+
+    def _will_react(self, persona: Persona, post_key: str) -> bool:
+        # Seeded per (persona, post) so the draw does not depend on completion order
+        return random.Random(f"{self.reaction_seed}:{persona.id}:{post_key}").random() < self.reaction_probability
+
+    async def _limited(self, coroutine):
+        async with self.semaphore:
+            return await coroutine
+
+    async def _chat(self, persona: Persona) -> None:
+        index = self.pair_of.get(persona.id)
+        if index is None:
+            return
+        persona_a, persona_b = self.pairs[index]
+        if persona is persona_b:
+            await self.chat_done[index].wait()
+            return
+
+        await self.ready[persona_b.id].wait()
+        try:
+            conversation = await self.population.chat_pair_async(
+                _LimitedPersona(persona_a, self.semaphore),
+                _LimitedPersona(persona_b, self.semaphore),
+                self.rounds[index]
+            )
+            self.conversations[index] = conversation
+        finally:
+            self.chat_done[index].set()
+
+    async def _post(self, persona: Persona) -> None:
+        if persona.id not in self.post_futures:
+            return
+        created = None
+        try:
+            created = await self._limited(persona.create_social_media_post_async(self.prior_posts.get(persona.id, [])))
+        finally:
+            await self._publish(persona, created)
+
+    async def _publish(self, persona: Persona, created) -> None:
+        """
+        Publish a poster's post (None: no post) after the posts of earlier posters.
+
+        The order of social_media.posts feeds the next epoch's feeds and digests, so it
+        follows the plan rather than LLM latency.
+        """
+        future = self.post_futures[persona.id]
+        previous = self.previous_poster.get(persona.id)
+        if previous is not None:
+            await self.post_futures[previous]
+
+        post = None
+        try:
+            if created is not None:
+                post = {"persona_id": created.persona_id, "content": created.content, "likes": 0, "dislikes": 0}
+                if self.social_media:
+                    post["id"] = self.social_media.add_post({"persona_id": created.persona_id, "content": created.content})
+                else:
+                    post["id"] = created.id
+        finally:
+            future.set_result(post)
+
+    async def _react(self, persona: Persona) -> None:
+        async def react_to(post: Optional[Dict[str, Any]], post_key: str) -> Optional[str]:
+            if post is None or post.get("persona_id") == persona.id or not self._will_react(persona, post_key):
+                return None
+            return await self._limited(persona.react_to_post_async(post))
+
+        async def react_when_published(poster: Persona) -> Optional[str]:
+            return await react_to(await self.post_futures[poster.id], poster.id)
+
+        prior = [post for post in self.prior_posts.get(persona.id, []) if post.get("persona_id") != persona.id]
+        others = [poster for poster in self.posters if poster is not persona]
+        reactions = await asyncio.gather(
+            *[react_to(post, post.get("id", "")) for post in prior],
+            *[react_when_published(poster) for poster in others]
+        )
+
+        # Knowledge and reactions are applied in a fixed order (prior posts, then posters in plan order)
+        visible = prior + [self.post_futures[poster.id].result() for poster in others]
+        applied = []
+        for post, reaction in zip(visible, reactions):
+            if post is None:
+                continue
+            persona.social_media_knowledge.append(post)
+            if reaction and post.get("id"):
+                applied.append((post["id"], persona.id, reaction))
+                self.reaction_counts[reaction] += 1
+
+        if applied and self.social_media:
+            self.social_media.add_reactions(applied)
+
+    async def _update_beliefs(self, persona: Persona, knowledge_category: str) -> None:
+        await self._limited(persona.update_beliefs_async(knowledge_category, self.max_change_percentage))
+
+    async def _run_persona(self, persona: Persona) -> None:
+        try:
+            try:
+                if self.update_from_debate:
+                    await self._update_beliefs(persona, "debate_knowledge")
+            finally:
+                self.ready[persona.id].set()
+
+            await self._chat(persona)
+            if persona.chats:
+                await self._update_beliefs(persona, "chats")
+
+            await self._post(persona)
+            await self._react(persona)
+            if persona.social_media_knowledge:
+                await self._update_beliefs(persona, "social_media_knowledge")
+        finally:
+            # Never leave other personas waiting on a stage this persona did not reach
+            future = self.post_futures.get(persona.id)
+            if future is not None and not future.done():
+                await self._publish(persona, None)
+            index = self.pair_of.get(persona.id)
+            if index is not None and self.pairs[index][0] is persona:
+                self.chat_done[index].set()
+
+    async def run_async(self) -> Dict[str, Any]:
+        """
+        Run every persona through the epoch's population stages.
+
+        Returns:
+            Stats: conversations, posts and reactions of the epoch
+        """
+        personas = self.population.personas
+        self._plan(personas)
+
+        loop = asyncio.get_running_loop()
+        self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.ready = {persona.id: asyncio.Event() for persona in personas}
+        self.chat_done = [asyncio.Event() for _ in self.pairs]
+        self.conversations: List[Optional[Dict[str, Any]]] = [None] * len(self.pairs)
+        self.post_futures = {persona.id: loop.create_future() for persona in self.posters}
+        self.previous_poster = {
+            poster.id: previous.id for previous, poster in zip(self.posters, self.posters[1:])
+        }
+        self.reaction_counts = {"thumbs_up": 0, "thumbs_down": 0}
+
+        logger.info(f"Persona dataflow: {len(personas)} personas, {len(self.pairs)} chat pairs, "
+                    f"{len(self.posters)} posters (max {self.max_concurrent} concurrent LLM calls)")
+
+        await asyncio.gather(*[self._run_persona(persona) for persona in personas])
+
+        posts = [future.result() for future in self.post_futures.values() if future.result() is not None]
+        stats = {
+            "conversations": sum(1 for conversation in self.conversations if conversation is not None),
+            "posts": len(posts),
+            "total_reactions": sum(self.reaction_counts.values()),
+            "thumbs_up": self.reaction_counts["thumbs_up"],
+            "thumbs_down": self.reaction_counts["thumbs_down"]
+        }
+        logger.info(f"Persona dataflow complete: {stats['conversations']} conversations, {stats['posts']} posts, "
+                    f"{stats['total_reactions']} reactions")
+        return stats
+
+
+class _LimitedPersona:
+    """Proxy that bounds a persona's chat LLM calls by the dataflow semaphore."""
+
+    def __init__(self, persona: Persona, semaphore: asyncio.Semaphore):
+        self._persona = persona
+        self._semaphore = semaphore
+
+    def __getattr__(self, name):
+        return getattr(self._persona, name)
+
+    async def chat_with_peers_async(self, *args, **kwargs) -> str:
+        async with self._semaphore:
+            return await self._persona.chat_with_peers_async(*args, **kwargs)
@@ -0,0 +1,334 @@
+"""Binary columnar storage for persona datasets.
+
+A persona JSONL file is converted on demand into a sibling ``<file>.cols``
+directory holding one file per column:
+
+- numeric fields (``age``, ``susceptibility``, ``media_diet.social_media`` ...)
+  become float64 ``.npy`` arrays that are memory-mapped on load
+- low-cardinality strings (``education_level``, ``ethnicity`` ...) become
+  int32 category codes plus a category table
+- free-text strings (``name``, ``backstory`` ...) and the raw JSON record of
+  every persona live in a UTF-8 blob indexed by an int64 offsets array
+
+The cache is rebuilt whenever the JSONL file's mtime or size changes, so the
+JSONL stays the source of truth.
+"""
+
+import os
+import json
+import shutil
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+CACHE_SUFFIX = ".cols"
+RECORD_COLUMN = "_record"
+
+# A string column is stored as categories when it has at most this many
+# distinct values and they cover at most half of the rows.
+MAX_CATEGORIES = 4096
+
+
+def cache_dir_for(jsonl_path) -> Path:
+    """Return the columnar cache directory for a JSONL file."""
+    jsonl_path = Path(jsonl_path)
+    return jsonl_path.with_name(jsonl_path.name + CACHE_SUFFIX)
+
+
+def _flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested dicts into dotted keys (``media_diet.tv``); lists are skipped."""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix=f"{name}."))
+        elif isinstance(value, list):
+            continue
+        else:
+            flat[name] = value
+    return flat
+
+
+def _source_signature(jsonl_path: Path) -> Dict[str, int]:
+    stat = jsonl_path.stat()
+    return {"source_mtime_ns": stat.st_mtime_ns, "source_size": stat.st_size}
+
+
+def _write_text_column(directory: Path, stem: str, values: List[Optional[str]]) -> None:
+    """Write strings as a UTF-8 blob plus an offsets array (missing values are empty)."""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    with open(directory / f"{stem}.blob", "wb") as blob:
+        position = 0
+        for i, value in enumerate(values):
+            if value:
+                encoded = value.encode("utf-8")
+                blob.write(encoded)
+                position += len(encoded)
+            offsets[i + 1] = position
+    np.save(directory / f"{stem}.offsets.npy", offsets)
+
+
+def build_columnar(jsonl_path, cache_dir=None, force: bool = False) -> Path:
+    """
+    Convert a persona JSONL file into the columnar cache format.
+
+    Args:
+        jsonl_path: Path to the persona JSONL file
+        cache_dir: Output directory (default: ``<jsonl_path>.cols``)
+        force: Replace an existing cache even if it is fresh (otherwise a fresh cache
+            installed by a concurrent builder is kept and this build discarded)
+
+    Returns:
+        Path to the written cache directory
+    """
+    jsonl_path = Path(jsonl_path)
+    cache_dir = Path(cache_dir) if cache_dir else cache_dir_for(jsonl_path)
+    signature = _source_signature(jsonl_path)
+
+    logger.debug(f"Building columnar persona cache for {jsonl_path}")
+
+    raw_records: List[str] = []
+    values: Dict[str, List[Any]] = {}
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Malformed persona JSON on line {line_num} of {jsonl_path}: {e}")
+
+            row = len(raw_records)
+            raw_records.append(line)
+            for name, value in _flatten(record).items():
+                column = values.setdefault(name, [])
+                if len(column) < row:
+                    column.extend([None] * (row - len(column)))
+                column.append(value)
+
+    count = len(raw_records)
+    for column in values.values():
+        column.extend([None] * (count - len(column)))
+
+    # Every builder writes to its own directory: processes of an experiment may build
+    # the cache of a shared population file at the same time
+    cache_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=cache_dir.name + ".tmp-", dir=cache_dir.parent))
+
+    columns: Dict[str, Dict[str, Any]] = {}
+    for index, (name, column) in enumerate(sorted(values.items())):
+        stem = f"c{index}"
+        present = [v for v in column if v is not None]
+        is_numeric = all(isinstance(v, (int, float)) for v in present)
+
+        if is_numeric:
+            array = np.array([np.nan if v is None else float(v) for v in column], dtype=np.float64)
+            np.save(tmp_dir / f"{stem}.npy", array)
+            columns[name] = {"kind": "numeric", "file": stem}
+            continue
+
+        strings = [None if v is None else str(v) for v in column]
+        categories = sorted(set(s for s in strings if s is not None))
+        if len(categories) <= MAX_CATEGORIES and len(categories) * 2 <= max(count, 1):
+            lookup = {category: code for code, category in enumerate(categories)}
+            codes = np.array([-1 if s is None else lookup[s] for s in strings], dtype=np.int32)
+            np.save(tmp_dir / f"{stem}.npy", codes)
+            columns[name] = {"kind": "category", "file": stem, "categories": categories}
+        else:
+            _write_text_column(tmp_dir, stem, strings)
+            columns[name] = {"kind": "text", "file": stem}
+
+    _write_text_column(tmp_dir, "records", raw_records)
+    columns[RECORD_COLUMN] = {"kind": "text", "file": "records"}
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "source": jsonl_path.name,
+        "count": count,
+        "columns": columns,
+        **signature
+    }
+    with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    if not _install(tmp_dir, cache_dir, jsonl_path, force):
+        logger.info(f"Columnar persona cache {cache_dir} was built concurrently by another process")
+        return cache_dir
+
+    logger.info(f"Built columnar persona cache {cache_dir} ({count} personas, {len(columns) - 1} columns)")
+    return cache_dir
+
+
+def _install(tmp_dir: Path, cache_dir: Path, jsonl_path: Path, force: bool = False) -> bool:
+    """
+    Move a finished build into place without deleting a cache other processes may have mapped.
+
+    A stale cache (any existing cache if `force`) is renamed aside before it is
+    removed (open memory maps stay valid). Otherwise, if another builder installed
+    an up-to-date cache first, this build is discarded.
+
+    Returns:
+        False if the race was lost to another builder
+    """
+    while True:
+        if cache_dir.exists():
+            try:
+                fresh = not force and not is_stale(jsonl_path, cache_dir)
+            except FileNotFoundError:
+                continue  # Moved aside by another builder while reading its metadata
+            if fresh:
+                shutil.rmtree(tmp_dir)
+                return False
+            old_dir = Path(tempfile.mkdtemp(prefix=cache_dir.name + ".old-", dir=cache_dir.parent))
+            try:
+                os.replace(cache_dir, old_dir)
+            except FileNotFoundError:
+                pass  # Another builder moved it first
+            shutil.rmtree(old_dir, ignore_errors=True)
+        try:
+            os.replace(tmp_dir, cache_dir)
+            return True
+        except OSError:
+            if not cache_dir.exists():
+                raise
+            # Another builder installed its cache in between: check it again
+
+
+def is_stale(jsonl_path, cache_dir=None) -> bool:
+    """Return True if the cache is missing or was built from a different version of the JSONL file."""
+    jsonl_path = Path(jsonl_path)
+    cache_dir = Path(cache_dir) if cache_dir else cache_dir_for(jsonl_path)
+    meta_file = cache_dir / "meta.json"
+    if not meta_file.exists():
+        return True
+
+    with open(meta_file, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    signature = _source_signature(jsonl_path)
+    return (
+        meta.get("version") != FORMAT_VERSION
+        or meta.get("source_mtime_ns") != signature["source_mtime_ns"]
+        or meta.get("source_size") != signature["source_size"]
+    )
+
+
+class TextColumn:
+    """Read-only view over an offset-indexed UTF-8 blob."""
+
+    def __init__(self, blob_path: Path, offsets_path: Path):
+        self.offsets = np.load(offsets_path, mmap_mode="r")
+        size = int(self.offsets[-1]) if len(self.offsets) else 0
+        # np.memmap cannot map empty files
+        self.blob = np.memmap(blob_path, dtype=np.uint8, mode="r") if size else np.zeros(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+
+class PersonaStore:
+    """Memory-mapped columnar view over a persona dataset."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        with open(self.cache_dir / "meta.json", "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self._columns: Dict[str, Any] = {}
+
+    @classmethod
+    def open(cls, jsonl_path, rebuild: bool = False) -> 'PersonaStore':
+        """
+        Open the columnar cache for a JSONL file, (re)building it if needed.
+
+        Args:
+            jsonl_path: Path to the persona JSONL file
+            rebuild: Force a rebuild even if the cache is fresh
+
+        Returns:
+            PersonaStore backed by the cache directory
+        """
+        cache_dir = cache_dir_for(jsonl_path)
+        if rebuild or is_stale(jsonl_path, cache_dir):
+            build_columnar(jsonl_path, cache_dir, force=rebuild)
+        return cls(cache_dir)
+
+    def __len__(self) -> int:
+        return self.meta["count"]
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of all persona columns (dotted for nested fields)."""
+        return [name for name in self.meta["columns"] if name != RECORD_COLUMN]
+
+    def kind(self, name: str) -> str:
+        """Return the storage kind of a column: numeric, category or text."""
+        if name not in self.meta["columns"]:
+            raise KeyError(f"Unknown persona column: {name}")
+        return self.meta["columns"][name]["kind"]
+
+    def _load(self, name: str):
+        if name not in self._columns:
+            spec = self.meta["columns"][name] if name in self.meta["columns"] else None
+            if spec is None:
+                raise KeyError(f"Unknown persona column: {name}")
+            stem = self.cache_dir / spec["file"]
+            if spec["kind"] == "text":
+                self._columns[name] = TextColumn(
+                    stem.with_suffix(".blob"),
+                    stem.with_name(stem.name + ".offsets.npy")
+                )
+            else:
+                self._columns[name] = np.load(stem.with_suffix(".npy"), mmap_mode="r")
+        return self._columns[name]
+
+    def numeric(self, name: str) -> np.ndarray:
+        """Memory-mapped float64 array for a numeric column (NaN where missing)."""
+        if self.kind(name) != "numeric":
+            raise TypeError(f"Column {name} is not numeric")
+        return self._load(name)
+
+    def categorical(self, name: str) -> Tuple[np.ndarray, List[str]]:
+        """Memory-mapped int32 codes (-1 where missing) and the category table for a column."""
+        if self.kind(name) != "category":
+            raise TypeError(f"Column {name} is not categorical")
+        return self._load(name), self.meta["columns"][name]["categories"]
+
+    def text(self, name: str) -> TextColumn:
+        """Lazily decoded view over a free-text column."""
+        if self.kind(name) != "text":
+            raise TypeError(f"Column {name} is not a text column")
+        return self._load(name)
+
+    def values(self, name: str, indices: Optional[Iterable[int]] = None) -> List[Any]:
+        """Decode a column (or a subset of rows) into Python values."""
+        rows = range(len(self)) if indices is None else indices
+        kind = self.kind(name)
+        if kind == "numeric":
+            array = self.numeric(name)
+            return [None if np.isnan(array[i]) else float(array[i]) for i in rows]
+        if kind == "category":
+            codes, categories = self.categorical(name)
+            return [categories[codes[i]] if codes[i] >= 0 else None for i in rows]
+        column = self.text(name)
+        return [column[i] for i in rows]
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Return the full original persona record for a row."""
+        return json.loads(self._load(RECORD_COLUMN)[index])
+
+    def records(self, indices: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield full persona records for the given rows (all rows by default)."""
+        rows = range(len(self)) if indices is None else indices
+        for index in rows:
+            yield self.record(index)
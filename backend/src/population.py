@@ -1,7 +1,11 @@
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from .persona import Persona
+from .persona_store import PersonaStore
+from .population_query import PopulationIndex, PopulationQuery
+from .stratified_sampling import draw_stratified_sample, estimate_shares
+from .archetypes import cluster_personas, propagate_beliefs
 import asyncio
 
 logger = logging.getLogger(__name__)
@@ -11,32 +15,203 @@ class Population:
     def __init__(self, world_story: str = None):
         self.personas: List[Persona] = []
         self.world_story = world_story if world_story else ""
+        self.stratum_sizes: Dict[str, float] = {}  # Target population size per stratum (stratified mode only)
+        self.last_votes: Dict[str, str] = {}  # persona_id -> candidate from the latest conduct_vote
+        self.archetype_settings: Optional[Dict[str, Any]] = None  # Set by enable_archetypes()
+        self.archetype_stats: List[Dict[str, Any]] = []  # One entry per archetype-shared belief update
     
     def load_from_jsonl(self, file_path: str, limit: Optional[int] = None) -> None:
         import random
         
         logger.debug(f"Loading personas from {file_path}" + (f" (limit: {limit})" if limit else ""))
         
-        # First, read all lines from the file
-        with open(file_path, 'r') as f:
-            all_lines = [line.strip() for line in f if line.strip()]
+        # Open the memory-mapped columnar cache (built from the JSONL on first use)
+        store = PersonaStore.open(file_path)
+        total = len(store)
         
-        # If limit is specified and less than total lines, randomly sample
-        if limit is not None and limit < len(all_lines):
-            selected_lines = random.sample(all_lines, limit)
+        # If limit is specified and less than total rows, randomly sample
+        if limit is not None and limit < total:
+            selected_rows = random.sample(range(total), limit)
         else:
-            selected_lines = all_lines
+            selected_rows = range(total)
         
-        # Load personas from selected lines
+        # Load personas from selected rows
         personas_loaded = 0
-        for line in selected_lines:
-            persona_data = json.loads(line)
+        for persona_data in store.records(selected_rows):
             persona = Persona(persona_data['id'], persona_data, world_story=self.world_story)  # Pass full data and world_story
             self.personas.append(persona)
             personas_loaded += 1
             
-        logger.info(f"Loaded {personas_loaded} personas from {file_path} (randomly sampled from {len(all_lines)} total)")
+        logger.info(f"Loaded {personas_loaded} personas from {file_path} (randomly sampled from {total} total)")
     
+    def load_from_query(
+        self,
+        file_path: str,
+        query: Dict[str, Any],
+        limit: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Load personas matching a demographic query from a persona file.
+
+        Args:
+            file_path: Path to the persona JSONL file
+            query: Query dict with optional "filters" and "stratify" keys
+            limit: Number of personas to select (default: all matches)
+            seed: Seed for the random draw within each stratum
+        """
+        logger.debug(f"Loading personas from {file_path} with query {query}" + (f" (limit: {limit})" if limit else ""))
+
+        store = PersonaStore.open(file_path)
+        rows = PopulationIndex(store).select(PopulationQuery.from_dict(query), size=limit, seed=seed)
+
+        self.load_from_store(store, rows.tolist())
+
+        logger.info(f"Loaded {len(rows)} personas from {file_path} matching query (out of {len(store)} total)")
+
+    def load_from_store(self, store: PersonaStore, rows: List[int]) -> List[Persona]:
+        """Create personas for the given rows of a columnar store, in row order."""
+        loaded = [
+            Persona(persona_data['id'], persona_data, world_story=self.world_story)
+            for persona_data in store.records(rows)
+        ]
+        self.personas.extend(loaded)
+        return loaded
+
+    def load_stratified_sample(
+        self,
+        file_path: str,
+        strata: Dict[str, Optional[List[float]]],
+        sample_size: int,
+        target_size: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Load a stratified sample of personas, each carrying a post-stratification weight.
+
+        Args:
+            file_path: Path to the persona JSONL file
+            strata: Stratum fields; categorical fields map to None, numeric fields to bin edges
+            sample_size: Number of personas to sample
+            target_size: Size of the population the sample stands for (default: the whole file)
+            filters: Optional query filters restricting the sampling frame
+            seed: Seed for the within-stratum draws
+        """
+        store = PersonaStore.open(file_path)
+        sample = draw_stratified_sample(store, strata, sample_size, target_size=target_size, filters=filters, seed=seed)
+
+        for persona_data, stratum, weight in zip(store.records(sample.rows.tolist()), sample.strata, sample.weights):
+            persona = Persona(persona_data['id'], persona_data, world_story=self.world_story)
+            persona.stratum = stratum
+            persona.weight = float(weight)
+            self.personas.append(persona)
+
+        self.stratum_sizes.update(sample.stratum_sizes)
+        logger.info(f"Loaded stratified sample of {len(sample.rows)} personas from {file_path} "
+                    f"representing {int(sum(sample.stratum_sizes.values()))}")
+
+    def is_weighted(self) -> bool:
+        """Whether personas were drawn by stratified sampling and carry weights."""
+        return bool(self.stratum_sizes)
+
+    def estimate_vote_shares(self, candidates: List[str], choices: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Estimate weighted vote shares with 95% confidence intervals.
+
+        Args:
+            candidates: Candidate names to estimate shares for
+            choices: persona_id -> chosen candidate (default: the latest conduct_vote)
+
+        Returns:
+            Dict of candidate -> {"share", "ci_low", "ci_high", "std_error"}
+        """
+        choices = self.last_votes if choices is None else choices
+        voters = [persona for persona in self.personas if persona.id in choices]
+        votes = [choices[persona.id] for persona in voters]
+        if not self.is_weighted():
+            # Simple random sample of an unknown, larger population: one stratum, no finite
+            # population correction (the sample is not a census of itself)
+            return estimate_shares(votes, ["all"] * len(voters), {"all": float(len(voters))}, candidates,
+                                   finite_population=False)
+        return estimate_shares(votes, [persona.stratum for persona in voters], self.stratum_sizes, candidates)
+
+    def estimate_belief_vote_shares(self, candidates: List[str]) -> Dict[str, Dict[str, float]]:
+        """Estimate weighted shares of the current overall_vote beliefs."""
+        choices = {
+            persona.id: persona.beliefs.get("overall_vote", "")
+            for persona in self.personas
+        }
+        return self.estimate_vote_shares(candidates, choices)
+
+    def enable_archetypes(
+        self,
+        num_archetypes: int,
+        susceptibility_threshold: float = 0.8,
+        perturbation: float = 0.3,
+        categories: Optional[List[str]] = None,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Share belief-update LLM calls across clusters of similar personas.
+
+        Args:
+            num_archetypes: Number of k-means clusters (one LLM call per representative)
+            susceptibility_threshold: Personas above this susceptibility always get their own call
+            perturbation: Scale of the chance a member keeps its own prior topic beliefs
+            categories: Knowledge categories to share (default: debate and social media, whose
+                content is the same for everyone; chats are personal and stay individual)
+            seed: Seed for clustering and perturbation
+        """
+        self.archetype_settings = {
+            "num_archetypes": num_archetypes,
+            "susceptibility_threshold": susceptibility_threshold,
+            "perturbation": perturbation,
+            "categories": categories if categories is not None else ["debate_knowledge", "social_media_knowledge"],
+            "seed": seed
+        }
+        logger.info(f"Archetype belief sharing enabled: {num_archetypes} archetypes, "
+                    f"susceptibility threshold {susceptibility_threshold}")
+
+    def mix_in_from_jsonl(self, file_path: str, fraction: float, seed: Optional[int] = None) -> List[str]:
+        """
+        Replace a random fraction of the personas with fresh personas from another population file.
+
+        Incoming personas start without knowledge, chats or beliefs; personas whose IDs are
+        already present are not drawn.
+
+        Args:
+            file_path: Population JSONL to draw the incoming personas from
+            fraction: Share of the current personas to replace (0-1)
+            seed: Seed for choosing who is replaced and who comes in
+
+        Returns:
+            IDs of the replaced personas
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError(f"fraction must be between 0 and 1 (got {fraction})")
+        if self.is_weighted():
+            raise ValueError("Cannot mix personas into a weighted (stratified) population")
+        import random
+
+        rng = random.Random(seed)
+        store = PersonaStore.open(file_path)
+        present = {persona.id for persona in self.personas}
+        candidates = [row for row, persona_id in enumerate(store.values('id')) if persona_id not in present]
+        count = min(round(fraction * len(self.personas)), len(candidates))
+
+        replaced_indices = sorted(rng.sample(range(len(self.personas)), count))
+        incoming_rows = rng.sample(candidates, count)
+        replaced = [self.personas[index].id for index in replaced_indices]
+        for index, persona_data in zip(replaced_indices, store.records(incoming_rows)):
+            self.personas[index] = Persona(persona_data['id'], persona_data, world_story=self.world_story)
+
+        logger.info(f"Replaced {count} of {len(self.personas)} personas with personas from {file_path}")
+        return replaced
+
+    def close(self) -> None:
+        """Release resources held for the personas (worker processes of a ShardedPopulation)."""
+
     def add_persona(self, persona: Persona) -> None:
         self.personas.append(persona)
 
@@ -82,7 +257,11 @@ class Population:
         logger.info(f"Completed {len(conversations)} paired conversations")
         return conversations
     
-    def create_social_media_posts(self, post_probability: float = 0.07) -> List[Dict[str, Any]]:
+    def create_social_media_posts(
+        self,
+        post_probability: float = 0.07,
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
         """Synchronous wrapper for parallel social media post creation."""
         logger.debug(f"Creating social media posts: {len(self.personas)} personas, {int(post_probability*100)}% probability")
         
@@ -98,7 +277,7 @@ class Population:
         
         # Run async version on persistent loop
         posts = loop.run_until_complete(
-            self.create_social_media_posts_async(post_probability)
+            self.create_social_media_posts_async(post_probability, feeds)
         )
         
         logger.info(f"Published {len(posts)} posts to social media")
@@ -108,7 +287,8 @@ class Population:
         self,
         posts: List[Dict[str, Any]],
         social_media_platform=None,
-        reaction_probability: float = 0.4
+        reaction_probability: float = 0.4,
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]] = None
     ) -> Dict[str, Any]:
         """Synchronous wrapper for parallel reactions to posts."""
         logger.debug(f"Processing reactions: {len(self.personas)} personas, {len(posts)} posts, {int(reaction_probability*100)}% probability")
@@ -125,7 +305,7 @@ class Population:
         
         # Run async version on persistent loop
         reaction_stats = loop.run_until_complete(
-            self.react_to_posts_async(posts, social_media_platform, reaction_probability)
+            self.react_to_posts_async(posts, social_media_platform, reaction_probability, feeds)
         )
         
         logger.info(f"Reactions: {reaction_stats['total_reactions']} total "
@@ -187,89 +367,129 @@ class Population:
         Within each pair, personas still alternate turns (synchronous within pair),
         but all pairs chat in parallel, dramatically speeding up the process.
         """
-        import random
-
         logger.debug(f"Orchestrating parallel peer chats: {len(self.personas)} personas, target {num_rounds_mean}±{num_rounds_variance} rounds")
 
-        # Create pairs
+        # Execute all pair conversations in parallel
+        all_conversations = await asyncio.gather(*[
+            self.chat_pair_async(persona_a, persona_b, num_rounds)
+            for persona_a, persona_b, num_rounds in self.plan_chat_pairs(num_rounds_mean, num_rounds_variance)
+        ])
+
+        return all_conversations
+
+    # Planning draws every random decision of a phase up front, in a fixed order, so that
+    # executing the plan (in this process or spread over shards, see population_shards.py)
+    # gives the same result for the same seed.
+
+    def plan_chat_pairs(self, num_rounds_mean: int = 3, num_rounds_variance: int = 1) -> List[Tuple[Persona, Persona, int]]:
+        """Randomly pair personas and draw each pair's number of rounds (persona_a speaks first)."""
+        import random
+
         available_personas = self.personas.copy()
         random.shuffle(available_personas)
 
-        pairs = []
-        for i in range(0, len(available_personas) - 1, 2):
-            pairs.append((available_personas[i], available_personas[i + 1]))
-
+        pairs = [
+            (available_personas[i], available_personas[i + 1])
+            for i in range(0, len(available_personas) - 1, 2)
+        ]
         logger.info(f"Created {len(pairs)} conversation pairs from {len(available_personas)} personas")
 
-        # Define async function for a single pair conversation
-        async def chat_pair(persona_a: Persona, persona_b: Persona) -> Dict[str, Any]:
-            num_rounds = max(1, num_rounds_mean + random.randint(-num_rounds_variance, num_rounds_variance))
-            conversation_history = []
-
-            for _ in range(num_rounds):
-                # Persona A's turn
-                message_a = await persona_a.chat_with_peers_async(
-                    conversation_history, 
-                    persona_b.id,
-                    persona_b.features.get('name', persona_b.id)
-                )
-                conversation_history.append({
-                    "speaker_id": persona_a.id,
-                    "message": message_a
-                })
-
-                # Persona B's turn
-                message_b = await persona_b.chat_with_peers_async(
-                    conversation_history, 
-                    persona_a.id,
-                    persona_a.features.get('name', persona_a.id)
-                )
-                conversation_history.append({
-                    "speaker_id": persona_b.id,
-                    "message": message_b
-                })
-
-            return {
-                "participants": [persona_a.id, persona_b.id],
-                "num_rounds": num_rounds,
-                "conversation": conversation_history
-            }
-
-        # Execute all pair conversations in parallel
-        all_conversations = await asyncio.gather(*[
-            chat_pair(persona_a, persona_b)
+        return [
+            (persona_a, persona_b, max(1, num_rounds_mean + random.randint(-num_rounds_variance, num_rounds_variance)))
             for persona_a, persona_b in pairs
-        ])
+        ]
 
-        return all_conversations
+    def plan_posters(self, post_probability: float = 0.07) -> List[Persona]:
+        """Draw which personas post this epoch."""
+        import random
+
+        return [
+            persona for persona in self.personas
+            if random.random() < post_probability
+        ]
+
+    @staticmethod
+    def visible_posts(
+        persona: Persona,
+        posts: List[Dict[str, Any]],
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Posts a persona sees: its ranked feed if feeds are given, otherwise every post."""
+        return feeds.get(persona.id, []) if feeds is not None else posts
+
+    def plan_reactions(
+        self,
+        posts: List[Dict[str, Any]],
+        reaction_probability: float = 0.4,
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[Tuple[Persona, int]]:
+        """Draw which personas react to which of their visible posts (persona, index into its visible posts)."""
+        import random
+
+        return [
+            (persona, index)
+            for persona in self.personas
+            for index, _ in enumerate(self.visible_posts(persona, posts, feeds))
+            if random.random() < reaction_probability
+        ]
+
+    async def chat_pair_async(self, persona_a: Persona, persona_b: Persona, num_rounds: int) -> Dict[str, Any]:
+        """Have two personas alternate chat messages for `num_rounds` rounds (persona_a speaks first)."""
+        conversation_history = []
+
+        for _ in range(num_rounds):
+            # Persona A's turn
+            message_a = await persona_a.chat_with_peers_async(
+                conversation_history, 
+                persona_b.id,
+                persona_b.features.get('name', persona_b.id)
+            )
+            conversation_history.append({
+                "speaker_id": persona_a.id,
+                "message": message_a
+            })
+
+            # Persona B's turn
+            message_b = await persona_b.chat_with_peers_async(
+                conversation_history, 
+                persona_a.id,
+                persona_a.features.get('name', persona_a.id)
+            )
+            conversation_history.append({
+                "speaker_id": persona_b.id,
+                "message": message_b
+            })
+
+        return {
+            "participants": [persona_a.id, persona_b.id],
+            "num_rounds": num_rounds,
+            "conversation": conversation_history
+        }
 
-    async def create_social_media_posts_async(self, post_probability: float = 0.07) -> List[Dict[str, Any]]:
+    async def create_social_media_posts_async(
+        self,
+        post_probability: float = 0.07,
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Have personas create social media posts in parallel.
 
         All eligible personas generate posts concurrently, dramatically speeding up the process.
+        If `feeds` (persona_id -> ranked posts) is given, each persona sees its own feed while writing.
         """
-        import random
-
         logger.debug(f"Creating social media posts in parallel: {len(self.personas)} personas, {int(post_probability*100)}% probability")
 
         # Determine which personas will post
-        posting_personas = [
-            persona for persona in self.personas
-            if random.random() < post_probability
-        ]
+        posting_personas = self.plan_posters(post_probability)
 
         logger.debug(f"{len(posting_personas)} personas eligible to post")
 
         if not posting_personas:
             return []
 
-        # Get existing posts (empty for first batch, or could pass in existing)
-        existing_posts = []
-
-        # Generate all posts in parallel
+        # Generate all posts in parallel, each persona seeing its own feed (if any)
         posts = await asyncio.gather(*[
-            persona.create_social_media_post_async(existing_posts)
+            persona.create_social_media_post_async(feeds.get(persona.id, []) if feeds else [])
             for persona in posting_personas
         ])
 
@@ -290,53 +510,60 @@ class Population:
         self,
         posts: List[Dict[str, Any]],
         social_media_platform=None,
-        reaction_probability: float = 0.4
+        reaction_probability: float = 0.4,
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]] = None
     ) -> Dict[str, Any]:
         """
         Have personas react to social media posts in parallel.
 
         All reactions happen concurrently, dramatically speeding up the process.
+        If `feeds` (persona_id -> ranked posts) is given, each persona only sees and
+        reacts to its own feed instead of every post.
         """
-        import random
-
         logger.debug(f"Processing reactions in parallel: {len(self.personas)} personas, {len(posts)} posts, {int(reaction_probability*100)}% probability")
 
         # First, store all posts in social_media_knowledge (sequential, fast)
         for persona in self.personas:
-            for post in posts:
-                if post.get("persona_id") != persona.id:
-                    persona.social_media_knowledge.append(post)
+            self.store_seen_posts(persona, self.visible_posts(persona, posts, feeds))
 
         # Collect all reaction tasks
-        reaction_tasks = []
-        task_metadata = []  # Track which persona/post each task corresponds to
+        planned = self.plan_reactions(posts, reaction_probability, feeds)
+        task_posts = [self.visible_posts(persona, posts, feeds)[index] for persona, index in planned]
+        logger.debug(f"Created {len(planned)} reaction tasks")
 
-        for persona in self.personas:
-            for post in posts:
-                if random.random() < reaction_probability:
-                    reaction_tasks.append(persona.react_to_post_async(post))
-                    task_metadata.append({
-                        "persona_id": persona.id,
-                        "post": post
-                    })
+        # Execute all reactions in parallel
+        reactions = await asyncio.gather(*[
+            persona.react_to_post_async(post)
+            for (persona, _), post in zip(planned, task_posts)
+        ])
 
-        logger.debug(f"Created {len(reaction_tasks)} reaction tasks")
+        return self._apply_reactions(
+            [(persona.id, post, reaction) for (persona, _), post, reaction in zip(planned, task_posts, reactions)],
+            social_media_platform
+        )
 
-        # Execute all reactions in parallel
-        reactions = await asyncio.gather(*reaction_tasks)
+    @staticmethod
+    def store_seen_posts(persona: Persona, posts: List[Dict[str, Any]]) -> None:
+        """Add the posts a persona saw (except its own) to its social media knowledge."""
+        for post in posts:
+            if post.get("persona_id") != persona.id:
+                persona.social_media_knowledge.append(post)
 
-        # Process results
-        total_reactions = 0
+    @staticmethod
+    def _apply_reactions(results: List[Tuple[str, Dict[str, Any], Optional[str]]], social_media_platform=None) -> Dict[str, Any]:
+        """Record (persona_id, post, reaction) results on the platform, in plan order."""
         reactions_by_type = {"thumbs_up": 0, "thumbs_down": 0}
+        applied = []
 
-        for reaction, metadata in zip(reactions, task_metadata):
+        for persona_id, post, reaction in results:
             if reaction and social_media_platform:
-                post_id = metadata["post"].get("id")
+                post_id = post.get("id")
                 if post_id:
-                    social_media_platform.add_reaction(post_id, metadata["persona_id"], reaction)
-                    total_reactions += 1
+                    applied.append((post_id, persona_id, reaction))
                     reactions_by_type[reaction] = reactions_by_type.get(reaction, 0) + 1
 
+        total_reactions = social_media_platform.add_reactions(applied) if applied else 0
+
         logger.info(f"Completed parallel reactions: {total_reactions} reactions")
 
         return {
@@ -356,33 +583,30 @@ class Population:
         vote_counts = {candidate: 0 for candidate in candidates}
 
         # Collect all votes in parallel
-        individual_votes = await asyncio.gather(*[
-            persona.vote_async(candidates)
-            for persona in self.personas
-        ])
+        individual_votes = await self._collect_votes_async(candidates)
 
         # Tally votes
         for candidate_name in individual_votes:
             if candidate_name in vote_counts:
                 vote_counts[candidate_name] += 1
 
+        self.last_votes = {
+            persona.id: candidate_name
+            for persona, candidate_name in zip(self.personas, individual_votes)
+        }
+
         logger.info(f"Parallel vote completed: {sum(vote_counts.values())} votes cast across {len(candidates)} candidates")
         return vote_counts
 
-    def _run_parallel_belief_updates(self, personas: List[Persona], knowledge_category: str, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
-        """Common async orchestration logic for parallel belief updates."""
-        logger.debug(f"Starting parallel belief updates for {knowledge_category} with {len(personas)} personas (max {max_concurrent} concurrent)")
-        
-        async def run_parallel():
-            semaphore = asyncio.Semaphore(max_concurrent)
-            
-            async def limited_update(persona):
-                async with semaphore:
-                    return await persona.update_beliefs_async(knowledge_category, max_change_percentage)
-            
-            tasks = [limited_update(persona) for persona in personas]
-            await asyncio.gather(*tasks)
+    async def _collect_votes_async(self, candidates: List[str]) -> List[str]:
+        """Vote of every persona, in population order."""
+        return await asyncio.gather(*[
+            persona.vote_async(candidates)
+            for persona in self.personas
+        ])
 
+    def _run_parallel_belief_updates(self, personas: List[Persona], knowledge_category: str, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
+        """Synchronous wrapper for _run_parallel_belief_updates_async."""
         # Get or create event loop and run async function
         # This avoids creating/destroying event loops which breaks gRPC client
         try:
@@ -401,14 +625,89 @@ class Population:
                 asyncio.set_event_loop(loop)
             
             # Run the async function on the persistent loop
-            loop.run_until_complete(run_parallel())
-        
+            loop.run_until_complete(
+                self._run_parallel_belief_updates_async(personas, knowledge_category, max_concurrent, max_change_percentage)
+            )
+
+    async def _run_parallel_belief_updates_async(self, personas: List[Persona], knowledge_category: str, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
+        """Common async orchestration logic for parallel belief updates."""
+        settings = self.archetype_settings
+        if settings and knowledge_category in settings["categories"] and len(personas) > settings["num_archetypes"]:
+            await self._run_archetype_belief_updates(personas, knowledge_category, max_concurrent, max_change_percentage)
+        else:
+            await self._run_individual_belief_updates(personas, knowledge_category, max_concurrent, max_change_percentage)
+
+    async def _run_individual_belief_updates(self, personas: List[Persona], knowledge_category: str, max_concurrent: int, max_change_percentage: float) -> None:
+        """Run one LLM belief update per persona, bounded by a semaphore."""
+        logger.debug(f"Starting parallel belief updates for {knowledge_category} with {len(personas)} personas (max {max_concurrent} concurrent)")
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def limited_update(persona):
+            async with semaphore:
+                return await persona.update_beliefs_async(knowledge_category, max_change_percentage)
+
+        await asyncio.gather(*[limited_update(persona) for persona in personas])
+
         logger.info(f"All personas updated beliefs from {knowledge_category} (parallel)")
 
+    async def _run_archetype_belief_updates(self, personas: List[Persona], knowledge_category: str, max_concurrent: int, max_change_percentage: float) -> None:
+        """Run belief updates for archetype representatives and susceptible personas, then propagate."""
+        import random
+
+        settings = self.archetype_settings
+        clustering = cluster_personas(personas, settings["num_archetypes"], seed=settings["seed"])
+        representative_of = {
+            int(clustering.labels[index]): index for index in clustering.representatives
+        }
+
+        individual = set(clustering.representatives)
+        individual.update(
+            index for index, persona in enumerate(personas)
+            if persona.features.get("susceptibility", 0.0) > settings["susceptibility_threshold"]
+        )
+
+        await self._run_individual_belief_updates(
+            [personas[index] for index in sorted(individual)],
+            knowledge_category,
+            max_concurrent,
+            max_change_percentage
+        )
+
+        rng = random.Random(settings["seed"])
+        max_distance = float(clustering.distances.max()) if len(clustering.distances) else 0.0
+        for index, persona in enumerate(personas):
+            if index in individual:
+                continue
+            representative = personas[representative_of[int(clustering.labels[index])]]
+            propagate_beliefs(
+                representative,
+                persona,
+                float(clustering.distances[index]),
+                max_distance,
+                perturbation=settings["perturbation"],
+                rng=rng
+            )
+
+        stats = {
+            "knowledge_category": knowledge_category,
+            "personas": len(personas),
+            "archetypes": len(clustering.representatives),
+            "llm_calls": len(individual),
+            "propagated": len(personas) - len(individual)
+        }
+        self.archetype_stats.append(stats)
+        logger.info(f"Archetype belief update ({knowledge_category}): {stats['llm_calls']} LLM calls for "
+                    f"{stats['personas']} personas ({stats['propagated']} propagated from {stats['archetypes']} archetypes)")
+
     def update_beliefs_from_debate(self, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
         """Update all personas' beliefs based on debate knowledge in parallel."""
         self._run_parallel_belief_updates(self.personas, "debate_knowledge", max_concurrent, max_change_percentage)
 
+    async def update_beliefs_from_debate_async(self, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
+        """Async version of update_beliefs_from_debate, for use inside a running event loop."""
+        await self._run_parallel_belief_updates_async(self.personas, "debate_knowledge", max_concurrent, max_change_percentage)
+
     def update_beliefs_from_chat(self, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
         """Update all personas' beliefs based on chat conversations in parallel."""
         # Filter personas who have chats
@@ -431,6 +730,9 @@ class Population:
                 "policy_positions": {},
                 "overall_vote": ""
             }
+            if self.is_weighted():
+                persona_data["weight"] = persona.weight
+                persona_data["stratum"] = persona.stratum
 
             # Add beliefs as policy positions with reasoning
             if hasattr(persona, 'beliefs') and persona.beliefs:
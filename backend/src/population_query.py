@@ -0,0 +1,168 @@
+"""Demographic queries over columnar persona datasets.
+
+A query filters personas on their columnar fields and optionally stratifies
+the selection so that given categories make up given shares of the result:
+
+    filters:
+      age: {min: 18, max: 30}
+      education_level: master_degree
+      city: ["Zürich", "Winterthur"]
+    stratify:
+      ethnicity: {"Swiss-German": 0.4}
+
+Filters are evaluated as vectorized masks over the memory-mapped columns of a
+PersonaStore, so selecting from millions of personas takes milliseconds.
+"""
+
+import logging
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from .persona_store import PersonaStore
+
+logger = logging.getLogger(__name__)
+
+OTHER = "__other__"
+
+
+@dataclass
+class PopulationQuery:
+    """Filters and stratification targets for selecting personas."""
+    filters: Dict[str, Any] = field(default_factory=dict)
+    stratify: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, query_dict: Dict[str, Any]) -> 'PopulationQuery':
+        """Build a query from its YAML/dict form (``filters`` and ``stratify`` keys)."""
+        query_dict = query_dict or {}
+        unknown = set(query_dict) - {"filters", "stratify"}
+        if unknown:
+            raise ValueError(f"Unknown population_query keys: {sorted(unknown)}")
+
+        stratify = query_dict.get("stratify") or {}
+        for field_name, shares in stratify.items():
+            total = sum(shares.values())
+            if any(share < 0 for share in shares.values()) or total > 1.0 + 1e-9:
+                raise ValueError(f"Stratification shares for '{field_name}' must be non-negative and sum to at most 1 (got {total})")
+
+        return cls(filters=query_dict.get("filters") or {}, stratify=stratify)
+
+
+class PopulationIndex:
+    """Vectorized filter and stratification engine over a PersonaStore."""
+
+    def __init__(self, store: PersonaStore):
+        self.store = store
+
+    def _equals_mask(self, name: str, accepted: List[Any]) -> np.ndarray:
+        kind = self.store.kind(name)
+        if kind == "numeric":
+            return np.isin(self.store.numeric(name), np.array(accepted, dtype=np.float64))
+        if kind == "category":
+            codes, categories = self.store.categorical(name)
+            lookup = {category: code for code, category in enumerate(categories)}
+            accepted_codes = [lookup[str(value)] for value in accepted if str(value) in lookup]
+            return np.isin(codes, np.array(accepted_codes, dtype=np.int32))
+        # Free-text columns have no dictionary; compare row by row
+        accepted_strings = set(str(value) for value in accepted)
+        return np.fromiter(
+            (value in accepted_strings for value in self.store.values(name)),
+            dtype=bool,
+            count=len(self.store)
+        )
+
+    def _filter_mask(self, name: str, condition: Any) -> np.ndarray:
+        if isinstance(condition, dict):
+            unknown = set(condition) - {"min", "max"}
+            if unknown:
+                raise ValueError(f"Range filter on '{name}' only supports min/max (got {sorted(unknown)})")
+            values = self.store.numeric(name)
+            mask = ~np.isnan(values)
+            if "min" in condition:
+                mask &= values >= condition["min"]
+            if "max" in condition:
+                mask &= values <= condition["max"]
+            return mask
+
+        accepted = condition if isinstance(condition, list) else [condition]
+        return self._equals_mask(name, accepted)
+
+    def match(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Return a boolean mask of personas matching all filters."""
+        mask = np.ones(len(self.store), dtype=bool)
+        for name, condition in filters.items():
+            mask &= self._filter_mask(name, condition)
+        return mask
+
+    def _stratum_labels(self, name: str, shares: Dict[str, float], rows: np.ndarray) -> np.ndarray:
+        """Label each candidate row with its target category, or OTHER (-1)."""
+        labels = np.full(len(rows), -1, dtype=np.int32)
+        for label, category in enumerate(shares):
+            labels[self._equals_mask(name, [category])[rows]] = label
+        return labels
+
+    def _cell_quotas(self, size: int, stratify: Dict[str, Dict[str, float]]) -> Dict[Tuple[int, ...], int]:
+        """Split `size` across stratification cells with largest-remainder rounding."""
+        per_field = []
+        for shares in stratify.values():
+            options = [(label, share) for label, share in enumerate(shares.values())]
+            options.append((-1, max(0.0, 1.0 - sum(shares.values()))))
+            per_field.append(options)
+
+        exact = {}
+        for combination in itertools.product(*per_field):
+            cell = tuple(label for label, _ in combination)
+            exact[cell] = size * float(np.prod([share for _, share in combination]))
+
+        quotas = {cell: int(np.floor(value)) for cell, value in exact.items()}
+        shortfall = size - sum(quotas.values())
+        for cell in sorted(exact, key=lambda c: exact[c] - quotas[c], reverse=True)[:shortfall]:
+            quotas[cell] += 1
+        return quotas
+
+    def select(
+        self,
+        query: PopulationQuery,
+        size: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Select persona rows matching a query.
+
+        Args:
+            query: Filters and stratification targets
+            size: Number of personas to select (default: all matches, stratification ignored)
+            seed: Seed for the random draw within each cell
+
+        Returns:
+            Array of selected row indices into the store
+        """
+        rng = np.random.default_rng(seed)
+        candidates = np.flatnonzero(self.match(query.filters))
+        logger.debug(f"Population query matched {len(candidates)} of {len(self.store)} personas")
+
+        if size is None or size >= len(candidates) and not query.stratify:
+            return candidates
+        if not query.stratify:
+            return np.sort(rng.choice(candidates, size=size, replace=False))
+
+        labels = np.stack([
+            self._stratum_labels(name, shares, candidates)
+            for name, shares in query.stratify.items()
+        ], axis=1)
+
+        selected = []
+        for cell, quota in self._cell_quotas(size, query.stratify).items():
+            if quota == 0:
+                continue
+            in_cell = candidates[np.all(labels == np.array(cell), axis=1)]
+            if len(in_cell) < quota:
+                logger.warning(f"Population query cell {cell} has {len(in_cell)} personas, wanted {quota}; taking all")
+                selected.append(in_cell)
+            else:
+                selected.append(rng.choice(in_cell, size=quota, replace=False))
+
+        return np.sort(np.concatenate(selected)) if selected else np.array([], dtype=np.int64)
@@ -0,0 +1,386 @@
+"""Population whose personas are partitioned across worker processes.
+
+One asyncio loop in one process caps how much prompt building, JSON parsing
+and bookkeeping a large population can do per second. ShardedPopulation
+(config.population_shards) deals the personas round-robin to worker
+processes. Each worker owns its personas (knowledge, chats, posts, beliefs)
+and executes commands on its own event loop.
+
+The coordinating process keeps every random decision: it plans chat pairs,
+posters and reactions with the same Population.plan_* methods, in the same
+order, as a single-process run, and only ships execution to the shards. A
+sharded run therefore makes the same LLM calls with the same inputs as a
+single-process run with the same seed. Chats between personas of different
+shards proceed in lockstep turns: the coordinator gathers every pair's next
+message from the shards owning the speakers and routes the histories back.
+
+The coordinator's personas stay a mirror: they carry features and (synced
+after every belief update) beliefs, which is all the engine reads directly.
+Pickling the population (checkpoints) or close() pulls the full persona
+state back from the workers. Messages travel over multiprocessing pipes.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import traceback
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from . import llm_client
+from .persona import Persona
+from .population import Population
+
+logger = logging.getLogger(__name__)
+
+
+class ShardWorker:
+    """Executes population commands for the personas owned by one worker process."""
+
+    def __init__(self):
+        self.population = Population()
+        self.by_id: Dict[str, Persona] = {}
+
+    async def load(self, personas: List[Persona]) -> int:
+        load_dotenv()
+        client = llm_client.create_client(os.getenv('GEMINI_API_KEY'))
+        for persona in personas:
+            persona.llm_client = client
+        self.population.personas = personas
+        self.by_id = {persona.id: persona for persona in personas}
+        return len(personas)
+
+    async def consume_debate(self, transcript) -> None:
+        self.population.consume_debate_content(transcript)
+
+    async def update_beliefs(self, knowledge_category: str, max_concurrent: int, max_change_percentage: float) -> Dict[str, Dict[str, Any]]:
+        """Update personas that have knowledge of the category; returns their new beliefs."""
+        personas = [
+            persona for persona in self.population.personas
+            if knowledge_category == "debate_knowledge" or getattr(persona, knowledge_category)
+        ]
+        await self.population._run_individual_belief_updates(personas, knowledge_category, max_concurrent, max_change_percentage)
+        return {persona.id: persona.beliefs for persona in personas}
+
+    async def chat_turns(self, turns: List[Tuple[str, List[Dict[str, Any]], str, str]]) -> List[str]:
+        """Next message of each (speaker_id, conversation_history, peer_id, peer_name) turn."""
+        return await asyncio.gather(*[
+            self.by_id[speaker_id].chat_with_peers_async(history, peer_id, peer_name)
+            for speaker_id, history, peer_id, peer_name in turns
+        ])
+
+    async def write_posts(self, persona_ids: List[str], feeds: Optional[Dict[str, List[Dict[str, Any]]]]) -> List[Optional[Dict[str, Any]]]:
+        posts = await asyncio.gather(*[
+            self.by_id[persona_id].create_social_media_post_async(feeds.get(persona_id, []) if feeds else [])
+            for persona_id in persona_ids
+        ])
+        return [
+            {"persona_id": post.persona_id, "content": post.content, "id": post.id} if post is not None else None
+            for post in posts
+        ]
+
+    async def react(
+        self,
+        posts: List[Dict[str, Any]],
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]],
+        tasks: List[Tuple[str, int]]
+    ) -> List[Optional[str]]:
+        """Store seen posts, then react to the planned (persona_id, visible post index) pairs."""
+        for persona in self.population.personas:
+            Population.store_seen_posts(persona, Population.visible_posts(persona, posts, feeds))
+        return await asyncio.gather(*[
+            self.by_id[persona_id].react_to_post_async(Population.visible_posts(self.by_id[persona_id], posts, feeds)[index])
+            for persona_id, index in tasks
+        ])
+
+    async def vote(self, candidates: List[str]) -> Dict[str, str]:
+        votes = await asyncio.gather(*[persona.vote_async(candidates) for persona in self.population.personas])
+        return {persona.id: vote for persona, vote in zip(self.population.personas, votes)}
+
+    async def export(self) -> List[Persona]:
+        return self.population.personas
+
+
+def _shard_main(connection) -> None:
+    """Worker process: run commands from the coordinator until told to stop."""
+    worker = ShardWorker()
+    # Not set as the current loop: a forked child still references the parent's loop, and
+    # replacing it lets it be collected, which closes it and unregisters the parent's
+    # wakeup pipe from the epoll instance both processes share
+    loop = asyncio.new_event_loop()
+    while True:
+        command, payload = connection.recv()
+        if command == "stop":
+            break
+        try:
+            result = loop.run_until_complete(getattr(worker, command)(**payload))
+            connection.send(("ok", result))
+        except Exception:
+            connection.send(("error", traceback.format_exc()))
+    connection.close()
+
+
+class ShardedPopulation(Population):
+    """Population executing persona work on worker processes, with planning kept in this process."""
+
+    def __init__(self, num_shards: int, world_story: str = None):
+        """
+        Args:
+            num_shards: Number of worker processes
+            world_story: World context passed to personas
+        """
+        super().__init__(world_story=world_story)
+        if num_shards < 1:
+            raise ValueError(f"num_shards must be at least 1 (got {num_shards})")
+        self.num_shards = num_shards
+        self._shards = None  # [(process, connection)], started on first use
+        self._shard_of: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # ---------- worker management ----------
+
+    def _ensure_started(self) -> None:
+        if self._shards is not None:
+            return
+        self._shards = self._start_shards()
+        self.num_shards = len(self._shards)
+
+        self._shard_of = {persona.id: index % self.num_shards for index, persona in enumerate(self.personas)}
+        self._call({
+            shard: ("load", {"personas": self.personas[shard::self.num_shards]})
+            for shard in range(self.num_shards)
+        })
+        logger.info(f"Started {self.num_shards} population shards for {len(self.personas)} personas")
+
+    def _start_shards(self) -> list:
+        """Start the worker processes; returns one (process, connection) per shard."""
+        context = multiprocessing.get_context()
+        shards = []
+        for _ in range(self.num_shards):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=_shard_main, args=(child_connection,), daemon=True)
+            process.start()
+            child_connection.close()
+            shards.append((process, parent_connection))
+        return shards
+
+    def _stop_shards(self) -> None:
+        for process, connection in self._shards:
+            connection.send(("stop", {}))
+            process.join(timeout=10)
+            connection.close()
+
+    def _call(self, commands: Dict[int, Tuple[str, Dict[str, Any]]]) -> Dict[int, Any]:
+        """Send one command to each listed shard and wait for all results."""
+        with self._lock:
+            for shard, command in commands.items():
+                self._shards[shard][1].send(command)
+            results = {}
+            errors = []
+            for shard in commands:
+                status, result = self._shards[shard][1].recv()
+                if status == "ok":
+                    results[shard] = result
+                else:
+                    errors.append(f"shard {shard}:\n{result}")
+        if errors:
+            raise RuntimeError("Population shard failed: " + "\n".join(errors))
+        return results
+
+    def _broadcast(self, command: str, **payload) -> Dict[int, Any]:
+        self._ensure_started()
+        return self._call({shard: (command, payload) for shard in range(self.num_shards)})
+
+    async def _broadcast_async(self, command: str, **payload) -> Dict[int, Any]:
+        # Blocking pipe I/O runs off the event loop, so pipelined debates keep going meanwhile
+        self._ensure_started()
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: self._broadcast(command, **payload))
+
+    async def _call_async(self, commands: Dict[int, Tuple[str, Dict[str, Any]]]) -> Dict[int, Any]:
+        self._ensure_started()
+        return await asyncio.get_running_loop().run_in_executor(None, self._call, commands)
+
+    def _by_shard(self, items, persona_id_of) -> Dict[int, list]:
+        self._ensure_started()
+        grouped: Dict[int, list] = {shard: [] for shard in range(self.num_shards)}
+        for item in items:
+            grouped[self._shard_of[persona_id_of(item)]].append(item)
+        return grouped
+
+    def _export(self) -> List[Persona]:
+        """Full persona state gathered from the shards, in population order."""
+        exported = {persona.id: persona for personas in self._broadcast("export").values() for persona in personas}
+        return [exported[persona.id] for persona in self.personas]
+
+    def close(self) -> None:
+        """Pull the full persona state back into this process and stop the workers."""
+        if self._shards is None:
+            return
+        clients = [persona.llm_client for persona in self.personas]
+        self.personas = self._export()
+        for persona, client in zip(self.personas, clients):
+            persona.llm_client = client
+        self._stop_shards()
+        self._shards = None
+        logger.info(f"Stopped {self.num_shards} population shards")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        if self._shards is not None:
+            state["personas"] = self._export()
+        state["_shards"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def mix_in_from_jsonl(self, file_path: str, fraction: float, seed: Optional[int] = None) -> List[str]:
+        self.close()  # Workers restart with the new partition on next use
+        return super().mix_in_from_jsonl(file_path, fraction, seed)
+
+    # ---------- sharded execution ----------
+
+    def consume_debate_content(self, debate_transcript) -> None:
+        self._broadcast("consume_debate", transcript=debate_transcript)
+
+    async def _update_beliefs_async(self, knowledge_category: str, max_concurrent: int, max_change_percentage: float) -> None:
+        # The concurrency limit is global: each shard gets its share
+        per_shard = max(1, max_concurrent // self.num_shards)
+        results = await self._broadcast_async("update_beliefs", knowledge_category=knowledge_category,
+                                               max_concurrent=per_shard, max_change_percentage=max_change_percentage)
+        personas = {persona.id: persona for persona in self.personas}
+        updated = 0
+        for beliefs in results.values():
+            for persona_id, persona_beliefs in beliefs.items():
+                personas[persona_id].beliefs = persona_beliefs
+                updated += 1
+        logger.info(f"All personas updated beliefs from {knowledge_category} ({updated} personas on {self.num_shards} shards)")
+
+    async def update_beliefs_async(self, knowledge_category: str = "debate_knowledge") -> None:
+        await self._update_beliefs_async(knowledge_category, 20, 0.5)
+
+    def update_beliefs_from_debate(self, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
+        self._run_async(self._update_beliefs_async("debate_knowledge", max_concurrent, max_change_percentage))
+
+    async def update_beliefs_from_debate_async(self, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
+        await self._update_beliefs_async("debate_knowledge", max_concurrent, max_change_percentage)
+
+    def update_beliefs_from_chat(self, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
+        self._run_async(self._update_beliefs_async("chats", max_concurrent, max_change_percentage))
+
+    def update_beliefs_from_social_media(self, max_concurrent: int = 20, max_change_percentage: float = 0.5) -> None:
+        self._run_async(self._update_beliefs_async("social_media_knowledge", max_concurrent, max_change_percentage))
+
+    @staticmethod
+    def _run_async(coroutine):
+        try:
+            loop = asyncio.get_event_loop()
+            if loop.is_closed():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coroutine)
+
+    async def chat_with_peers_async(self, num_rounds_mean: int = 3, num_rounds_variance: int = 1) -> List[Dict[str, Any]]:
+        pairs = self.plan_chat_pairs(num_rounds_mean, num_rounds_variance)
+        histories: List[List[Dict[str, Any]]] = [[] for _ in pairs]
+
+        # Lockstep turns: every pair's persona_a speaks, then every pair's persona_b, round by round
+        for round_index in range(max((num_rounds for _, _, num_rounds in pairs), default=0)):
+            for side in (0, 1):
+                turns = []  # (pair index, speaker, peer)
+                for pair_index, (persona_a, persona_b, num_rounds) in enumerate(pairs):
+                    if round_index < num_rounds:
+                        speaker, peer = (persona_a, persona_b) if side == 0 else (persona_b, persona_a)
+                        turns.append((pair_index, speaker, peer))
+
+                grouped = self._by_shard(turns, lambda turn: turn[1].id)
+                results = await self._call_async({
+                    shard: ("chat_turns", {"turns": [
+                        (speaker.id, histories[pair_index], peer.id, peer.features.get('name', peer.id))
+                        for pair_index, speaker, peer in shard_turns
+                    ]})
+                    for shard, shard_turns in grouped.items() if shard_turns
+                })
+                for shard, messages in results.items():
+                    for (pair_index, speaker, _), message in zip(grouped[shard], messages):
+                        histories[pair_index].append({"speaker_id": speaker.id, "message": message})
+
+        return [
+            {"participants": [persona_a.id, persona_b.id], "num_rounds": num_rounds, "conversation": history}
+            for (persona_a, persona_b, num_rounds), history in zip(pairs, histories)
+        ]
+
+    async def create_social_media_posts_async(
+        self,
+        post_probability: float = 0.07,
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        posting_ids = [persona.id for persona in self.plan_posters(post_probability)]
+        if not posting_ids:
+            return []
+
+        grouped = self._by_shard(posting_ids, lambda persona_id: persona_id)
+        results = await self._call_async({
+            shard: ("write_posts", {
+                "persona_ids": persona_ids,
+                "feeds": {persona_id: feeds.get(persona_id, []) for persona_id in persona_ids} if feeds else None
+            })
+            for shard, persona_ids in grouped.items() if persona_ids
+        })
+        post_of = {
+            persona_id: post
+            for shard, posts in results.items()
+            for persona_id, post in zip(grouped[shard], posts)
+        }
+        valid_posts = [post_of[persona_id] for persona_id in posting_ids if post_of[persona_id] is not None]
+
+        logger.info(f"Posts created on {self.num_shards} shards: {len(valid_posts)} from {len(posting_ids)} eligible personas")
+        return valid_posts
+
+    async def react_to_posts_async(
+        self,
+        posts: List[Dict[str, Any]],
+        social_media_platform=None,
+        reaction_probability: float = 0.4,
+        feeds: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        planned = self.plan_reactions(posts, reaction_probability, feeds)
+        self._ensure_started()
+
+        tasks_by_shard = self._by_shard([(persona.id, index) for persona, index in planned], lambda task: task[0])
+        members = self._by_shard([persona.id for persona in self.personas], lambda persona_id: persona_id)
+        results = await self._call_async({
+            shard: ("react", {
+                "posts": posts if feeds is None else [],
+                "feeds": {persona_id: feeds.get(persona_id, []) for persona_id in members[shard]} if feeds is not None else None,
+                "tasks": tasks_by_shard[shard]
+            })
+            for shard in range(self.num_shards)
+        })
+
+        reaction_of = {
+            task: reaction
+            for shard, reactions in results.items()
+            for task, reaction in zip(tasks_by_shard[shard], reactions)
+        }
+        return self._apply_reactions(
+            [
+                (persona.id, self.visible_posts(persona, posts, feeds)[index], reaction_of[(persona.id, index)])
+                for persona, index in planned
+            ],
+            social_media_platform
+        )
+
+    async def _collect_votes_async(self, candidates: List[str]) -> List[str]:
+        votes = {}
+        for shard_votes in (await self._broadcast_async("vote", candidates=candidates)).values():
+            votes.update(shard_votes)
+        return [votes[persona.id] for persona in self.personas]
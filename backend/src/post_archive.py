@@ -0,0 +1,110 @@
+"""Append-only on-disk archive for expired social media posts.
+
+Posts that fall out of the platform's retention window are appended to a
+JSONL file, one line per post together with its reactions:
+
+    {"post": {"id": ..., "persona_id": ..., "content": ..., ...}, "reactions": [...]}
+
+Only byte offsets are kept in memory (by post id and by author), so the
+archive can grow without bound while lookups stay a single seek.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PostArchive:
+    """Append-only JSONL archive of posts with offset indexes by id and author."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._offsets: Dict[str, int] = {}  # post_id -> byte offset of its line
+        self._offsets_by_persona: Dict[str, List[int]] = {}
+
+        if self.path.exists():
+            self._build_index()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.touch()
+
+    def _build_index(self) -> None:
+        """Rebuild the offset indexes by scanning an existing archive file."""
+        with open(self.path, "rb") as f:
+            offset = f.tell()
+            for line in iter(f.readline, b""):
+                if line.strip():
+                    post = json.loads(line)["post"]
+                    self._add_offset(post, offset)
+                offset = f.tell()
+        logger.debug(f"Indexed {len(self)} archived posts in {self.path}")
+
+    def _add_offset(self, post: Dict[str, Any], offset: int) -> None:
+        self._offsets[post["id"]] = offset
+        self._offsets_by_persona.setdefault(post["persona_id"], []).append(offset)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Record how far the file was written, so a resumed run can drop later appends
+        state = self.__dict__.copy()
+        state["checkpoint_size"] = self.path.stat().st_size if self.path.exists() else 0
+        return state
+
+    def truncate_to_checkpoint(self) -> None:
+        """Drop entries appended after this archive was pickled (see checkpoint.py)."""
+        size = getattr(self, "checkpoint_size", None)
+        if size is not None and self.path.exists() and self.path.stat().st_size > size:
+            with open(self.path, "r+b") as f:
+                f.truncate(size)
+            logger.warning(f"Dropped entries appended to {self.path} after the checkpoint")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self._offsets
+
+    def append(self, entries: Iterable[Tuple[Dict[str, Any], List[Dict[str, Any]]]]) -> int:
+        """
+        Append posts to the archive.
+
+        Args:
+            entries: (post dict, reactions list) pairs
+
+        Returns:
+            Number of posts appended
+        """
+        count = 0
+        with open(self.path, "ab") as f:
+            for post, reactions in entries:
+                offset = f.tell()
+                line = json.dumps({"post": post, "reactions": reactions}, ensure_ascii=False) + "\n"
+                f.write(line.encode("utf-8"))
+                self._add_offset(post, offset)
+                count += 1
+        return count
+
+    def _read(self, offsets: List[int]) -> List[Dict[str, Any]]:
+        entries = []
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                entries.append(json.loads(f.readline()))
+        return entries
+
+    def get(self, post_id: str) -> Optional[Dict[str, Any]]:
+        """Return the archived entry ({"post", "reactions"}) for a post ID, or None."""
+        offset = self._offsets.get(post_id)
+        return self._read([offset])[0] if offset is not None else None
+
+    def by_persona(self, persona_id: str) -> List[Dict[str, Any]]:
+        """Return all archived entries written by a persona, oldest first."""
+        return self._read(self._offsets_by_persona.get(persona_id, []))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
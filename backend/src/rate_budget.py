@@ -0,0 +1,59 @@
+"""Request rate budget shared by all processes of an experiment.
+
+The budget hands out request slots spaced 60 / requests_per_minute seconds
+apart. The time of the next free slot lives in shared memory, so simulations
+running in different worker processes draw from one global quota instead of
+each assuming the whole quota for itself.
+"""
+
+import time
+import asyncio
+import logging
+import multiprocessing
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class RateBudget:
+    """Global requests-per-minute budget, shareable with pool workers through their initializer."""
+
+    def __init__(self, requests_per_minute: float, context=None):
+        """
+        Args:
+            requests_per_minute: Requests allowed per minute across all processes
+            context: multiprocessing context of the pool the budget is shared with
+        """
+        if requests_per_minute <= 0:
+            raise ValueError(f"requests_per_minute must be positive (got {requests_per_minute})")
+        context = context or multiprocessing.get_context()
+        self.interval = 60.0 / requests_per_minute
+        self._next_slot = context.Value('d', 0.0, lock=False)
+        self._lock = context.Lock()
+        self.requests = 0  # Per process
+        self.waited_seconds = 0.0
+
+    def reserve(self) -> float:
+        """Take the next free request slot and return how long to wait for it (seconds)."""
+        now = time.time()
+        with self._lock:
+            slot = max(now, self._next_slot.value)
+            self._next_slot.value = slot + self.interval
+        delay = slot - now
+        self.requests += 1
+        self.waited_seconds += delay
+        return delay
+
+    def wait(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests made and time spent waiting in this process."""
+        return {"requests": self.requests, "waited_seconds": round(self.waited_seconds, 3)}
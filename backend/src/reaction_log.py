@@ -0,0 +1,276 @@
+"""Array-backed log of social media reactions.
+
+Every reaction is one row of four parallel NumPy arrays: the reacting
+persona and the post as integer codes, the reaction as an int8
+(+1 thumbs up, -1 thumbs down) and the epoch it happened in. Authors are
+encoded the same way as reacting personas, so the log can be read as a
+sparse persona x post matrix and aggregated with ``np.bincount``:
+
+- author approval: share of thumbs up on each author's posts
+- persona agreement: share of a persona's reactions that match the
+  majority reaction on the post
+- post polarization: ``4 p (1 - p)`` with ``p`` the post's thumbs-up share
+  (0 for unanimous posts, 1 for an even split)
+
+The same log can be rebuilt from a simulation's ``epochs.jsonl`` for
+offline analysis (see ``from_epochs``).
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REACTION_VALUES = {"thumbs_up": 1, "thumbs_down": -1}
+REACTION_NAMES = {value: name for name, value in REACTION_VALUES.items()}
+
+INITIAL_CAPACITY = 1024
+
+
+class ReactionLog:
+    """Growable columnar log of (persona, post, reaction, epoch) rows."""
+
+    def __init__(self):
+        self.persona_ids: List[str] = []
+        self.post_ids: List[str] = []
+        self._persona_codes: Dict[str, int] = {}
+        self._post_codes: Dict[str, int] = {}
+        self._post_authors = np.full(INITIAL_CAPACITY, -1, dtype=np.int32)  # post code -> author persona code
+
+        self._size = 0
+        self._personas = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self._posts = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self._values = np.empty(INITIAL_CAPACITY, dtype=np.int8)
+        self._epochs = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def personas(self) -> np.ndarray:
+        """Persona code of each reaction."""
+        return self._personas[:self._size]
+
+    @property
+    def posts(self) -> np.ndarray:
+        """Post code of each reaction."""
+        return self._posts[:self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Reaction of each row: +1 thumbs up, -1 thumbs down."""
+        return self._values[:self._size]
+
+    @property
+    def epochs(self) -> np.ndarray:
+        """Epoch of each reaction."""
+        return self._epochs[:self._size]
+
+    @property
+    def post_authors(self) -> np.ndarray:
+        """Author persona code of each post code (-1 if unknown)."""
+        return self._post_authors[:len(self.post_ids)]
+
+    def persona_code(self, persona_id: str) -> int:
+        """Return the integer code of a persona, assigning one if new."""
+        code = self._persona_codes.get(persona_id)
+        if code is None:
+            code = self._persona_codes[persona_id] = len(self.persona_ids)
+            self.persona_ids.append(persona_id)
+        return code
+
+    def register_post(self, post_id: str, author_id: Optional[str] = None) -> int:
+        """Return the integer code of a post, assigning one (and recording its author) if new."""
+        code = self._post_codes.get(post_id)
+        if code is None:
+            code = self._post_codes[post_id] = len(self.post_ids)
+            self.post_ids.append(post_id)
+            if code >= len(self._post_authors):
+                grown = np.full(2 * len(self._post_authors), -1, dtype=np.int32)
+                grown[:code] = self._post_authors[:code]
+                self._post_authors = grown
+        if author_id is not None and self._post_authors[code] < 0:
+            self._post_authors[code] = self.persona_code(author_id)
+        return code
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= len(self._values):
+            return
+        capacity = max(needed, 2 * len(self._values))
+        for name in ("_personas", "_posts", "_values", "_epochs"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def extend(self, reactions: Iterable[Tuple[str, str, str]], epoch: int = 0) -> int:
+        """
+        Append reactions.
+
+        Args:
+            reactions: (post_id, persona_id, reaction) tuples; reaction is "thumbs_up" or "thumbs_down"
+            epoch: Epoch the reactions happened in
+
+        Returns:
+            Number of reactions appended
+        """
+        reactions = list(reactions)
+        self._reserve(len(reactions))
+        start = self._size
+        for offset, (post_id, persona_id, reaction) in enumerate(reactions):
+            row = start + offset
+            self._posts[row] = self.register_post(post_id)
+            self._personas[row] = self.persona_code(persona_id)
+            self._values[row] = REACTION_VALUES[reaction]
+        self._epochs[start:start + len(reactions)] = epoch
+        self._size += len(reactions)
+        return len(reactions)
+
+    def _records(self, mask: np.ndarray) -> List[Tuple[str, str, str, int]]:
+        rows = np.flatnonzero(mask)
+        return [
+            (self.post_ids[post], self.persona_ids[persona], REACTION_NAMES[int(value)], int(epoch))
+            for post, persona, value, epoch in zip(
+                self.posts[rows], self.personas[rows], self.values[rows], self.epochs[rows]
+            )
+        ]
+
+    def by_post(self) -> Dict[str, List[Dict[str, str]]]:
+        """Reactions grouped by post ID as {"persona_id", "reaction"} dicts, in insertion order."""
+        grouped: Dict[str, List[Dict[str, str]]] = {}
+        for post_id, persona_id, reaction, _ in self._records(np.ones(self._size, dtype=bool)):
+            grouped.setdefault(post_id, []).append({"persona_id": persona_id, "reaction": reaction})
+        return grouped
+
+    def epoch_records(self, epoch: int) -> List[List[Any]]:
+        """Reactions of one epoch as compact [post_id, persona_id, +1/-1] rows (for serialization)."""
+        return [
+            [post_id, persona_id, REACTION_VALUES[reaction]]
+            for post_id, persona_id, reaction, _ in self._records(self.epochs == epoch)
+        ]
+
+    def remove_posts(self, post_ids: Iterable[str]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Drop all reactions to the given posts and return them grouped by post ID.
+
+        Post and persona codes stay assigned, so codes held elsewhere remain valid.
+        """
+        codes = np.array([self._post_codes[post_id] for post_id in post_ids if post_id in self._post_codes], dtype=np.int32)
+        removed = np.isin(self.posts, codes)
+        grouped: Dict[str, List[Dict[str, str]]] = {}
+        for post_id, persona_id, reaction, _ in self._records(removed):
+            grouped.setdefault(post_id, []).append({"persona_id": persona_id, "reaction": reaction})
+
+        keep = np.flatnonzero(~removed)
+        for name in ("_personas", "_posts", "_values", "_epochs"):
+            array = getattr(self, name)
+            array[:len(keep)] = array[keep]
+        self._size = len(keep)
+        return grouped
+
+    def to_coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Tuple[int, int]]:
+        """
+        Export as a sparse persona x post matrix in coordinate form.
+
+        Returns:
+            (data, rows, cols, shape): int8 reactions, persona codes, post codes and the
+            matrix shape; row/column labels are `persona_ids` / `post_ids`
+        """
+        return self.values.copy(), self.personas.copy(), self.posts.copy(), (len(self.persona_ids), len(self.post_ids))
+
+    def to_sparse(self):
+        """Export as a ``scipy.sparse.csr_matrix`` (persona x post; repeated reactions are summed)."""
+        try:
+            from scipy.sparse import coo_matrix
+        except ImportError:
+            raise ImportError("scipy is required for to_sparse(); use to_coo() without it")
+        data, rows, cols, shape = self.to_coo()
+        return coo_matrix((data.astype(np.int32), (rows, cols)), shape=shape).tocsr()
+
+    def _post_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Thumbs up and thumbs down count per post code."""
+        size = len(self.post_ids)
+        likes = np.bincount(self.posts, weights=self.values > 0, minlength=size)
+        dislikes = np.bincount(self.posts, weights=self.values < 0, minlength=size)
+        return likes, dislikes
+
+    def author_approval(self) -> Dict[str, Dict[str, float]]:
+        """Per author: thumbs up/down received and approval share (thumbs up / all reactions)."""
+        authors = self.post_authors[self.posts]
+        known = authors >= 0
+        size = len(self.persona_ids)
+        likes = np.bincount(authors[known], weights=self.values[known] > 0, minlength=size)
+        dislikes = np.bincount(authors[known], weights=self.values[known] < 0, minlength=size)
+        total = likes + dislikes
+        return {
+            self.persona_ids[code]: {
+                "likes": int(likes[code]),
+                "dislikes": int(dislikes[code]),
+                "approval": float(likes[code] / total[code])
+            }
+            for code in np.flatnonzero(total)
+        }
+
+    def persona_agreement(self) -> Dict[str, float]:
+        """
+        Per reacting persona: share of its reactions that match the majority reaction on the post.
+
+        Reactions to posts with a tied vote are left out.
+        """
+        likes, dislikes = self._post_counts()
+        majority = np.sign(likes - dislikes)[self.posts]
+        decided = majority != 0
+        size = len(self.persona_ids)
+        agreed = np.bincount(self.personas, weights=decided & (self.values == majority), minlength=size)
+        counted = np.bincount(self.personas, weights=decided, minlength=size)
+        return {self.persona_ids[code]: float(agreed[code] / counted[code]) for code in np.flatnonzero(counted)}
+
+    def post_polarization(self) -> Dict[str, float]:
+        """Per post with reactions: 4 p (1 - p) where p is its thumbs-up share."""
+        likes, dislikes = self._post_counts()
+        total = likes + dislikes
+        reacted = np.flatnonzero(total)
+        share = likes[reacted] / total[reacted]
+        polarization = 4.0 * share * (1.0 - share)
+        return {self.post_ids[code]: float(value) for code, value in zip(reacted, polarization)}
+
+    def summary(self, top: int = 5) -> Dict[str, Any]:
+        """Compact aggregate view: totals, most polarizing posts and author approval."""
+        polarization = self.post_polarization()
+        most_polarizing = sorted(polarization.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            "total_reactions": len(self),
+            "thumbs_up": int((self.values > 0).sum()),
+            "thumbs_down": int((self.values < 0).sum()),
+            "author_approval": self.author_approval(),
+            "most_polarizing_posts": [{"post_id": post_id, "polarization": value} for post_id, value in most_polarizing]
+        }
+
+    @classmethod
+    def from_epochs(cls, epochs_path) -> 'ReactionLog':
+        """
+        Rebuild the reaction log of a finished simulation from its epochs.jsonl.
+
+        Post authors come from each epoch's ``newsfeed.posts`` and reactions from
+        ``newsfeed.reactions`` ([post_id, persona_id, +1/-1] rows).
+        """
+        log = cls()
+        with open(Path(epochs_path), "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                epoch_data = json.loads(line)
+                newsfeed = epoch_data.get("newsfeed", {})
+                for post in newsfeed.get("posts", []):
+                    log.register_post(post["id"], post.get("persona_id"))
+                log.extend(
+                    ((post_id, persona_id, REACTION_NAMES[value]) for post_id, persona_id, value in newsfeed.get("reactions", [])),
+                    epoch=epoch_data.get("epoch", 0)
+                )
+        logger.debug(f"Loaded {len(log)} reactions from {epochs_path}")
+        return log
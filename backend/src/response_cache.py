@@ -0,0 +1,113 @@
+"""LLM response cache shared by all runs of an experiment.
+
+Responses are stored in a SQLite database that any number of processes can
+read and write. A cache key covers the full request (model, system
+instruction, prompt, sampling parameters) plus two things that keep
+sampling honest:
+
+- namespace: runs only share responses within a namespace. The experiment
+  runner uses one namespace per replicate, so replicate k of two configs sees
+  the same responses to identical prompts (common random numbers), while
+  different replicates stay independent.
+- occurrence: the n-th identical request within a run gets the n-th cached
+  response, so asking the same prompt twice still yields two samples.
+
+A failed run that is retried therefore replays every response it already
+received and only pays for the requests it had not reached. A retry that
+resumes from a checkpoint must continue the occurrence counts where the
+checkpoint left off (otherwise its first request for a prompt already sent in
+an earlier epoch would replay that epoch's response): checkpoints save the
+counts (occurrence_state) and load_checkpoint restores them.
+"""
+
+import json
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """SQLite-backed cache of LLM responses keyed by request, namespace and occurrence."""
+
+    def __init__(self, path, namespace: str = ""):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            namespace: Responses are only shared between users of the same namespace
+        """
+        self.path = Path(path)
+        self.namespace = namespace
+        self._occurrences: Counter = Counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork or a thread (LLM calls also run under
+        # asyncio.to_thread): every thread of every process opens its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_local"], state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def key(self, model: str, system_instruction: str, prompt: str, temperature: float, max_output_tokens: int) -> str:
+        """Key of the next occurrence of a request in this namespace."""
+        request = hashlib.sha256(json.dumps([model, system_instruction, prompt, temperature, max_output_tokens]).encode("utf-8")).hexdigest()
+        with self._lock:
+            occurrence = self._occurrences[request]
+            self._occurrences[request] += 1
+        return hashlib.sha256(json.dumps([self.namespace, occurrence, request]).encode("utf-8")).hexdigest()
+
+    def occurrence_state(self) -> Dict[str, Any]:
+        """Occurrence counts so far, to be saved with a checkpoint of the run."""
+        with self._lock:
+            return {"namespace": self.namespace, "occurrences": dict(self._occurrences)}
+
+    def restore_occurrences(self, state: Dict[str, Any]) -> None:
+        """Continue counting from a checkpoint's occurrence_state (ignored for another namespace)."""
+        if state.get("namespace") != self.namespace:
+            return
+        with self._lock:
+            self._occurrences = Counter(state["occurrences"])
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        self._connect().execute("INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response))
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hits and misses of this process."""
+        return {"hits": self.hits, "misses": self.misses}
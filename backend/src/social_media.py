@@ -1,6 +1,16 @@
-from typing import Dict, List, Any
+import heapq
+import bisect
+import logging
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from dataclasses import dataclass, asdict, field
 
+import numpy as np
+
+from .post_archive import PostArchive
+from .reaction_log import ReactionLog
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Post:
@@ -10,6 +20,7 @@ class Post:
     content: str
     likes: int = 0
     dislikes: int = 0
+    epoch: int = 0  # Epoch in which the post was published
 
     def to_string(self) -> str:
         """Format post as a readable string with like/dislike counts"""
@@ -19,9 +30,54 @@ class Post:
 class SocialMedia:
     VALID_REACTIONS = ["thumbs_up", "thumbs_down"]
 
+    # Weights of the feed ranking terms (see rank_feeds)
+    FEED_WEIGHTS = {"recency": 1.0, "engagement": 1.0, "similarity": 1.0}
+    RECENCY_HALF_LIFE = 1.0  # epochs
+    RANKING_CHUNK = 256  # viewers scored per vectorized block
+
     def __init__(self):
         self.posts: List[Post] = []
-        self.reactions: Dict[str, List[Dict[str, Any]]] = {}
+        self.reaction_log = ReactionLog()
+        self.current_epoch = 0
+
+        # Retention window, set by enable_retention; expired posts move to the archive
+        self.retention_epochs: Optional[int] = None
+        self.archive: Optional[PostArchive] = None
+
+        # Persona profiles for feed ranking, set by set_persona_profiles
+        self._profile_index: Dict[str, int] = {}
+        self._profile_vectors: Optional[np.ndarray] = None
+        self._social_media_usage: Optional[np.ndarray] = None
+
+        # Indexes maintained by add_post
+        self._posts_by_id: Dict[str, Post] = {}
+        self._posts_by_persona: Dict[str, List[Post]] = {}
+        self._sequence: Dict[str, int] = {}  # post_id -> insertion order, for merging persona indexes
+        self._next_sequence = 0
+
+        # Rendering caches; `version` is bumped by every change that affects rendered feeds
+        self.version = 0
+        self._rendered: Dict[str, str] = {}  # post_id -> Post.to_string()
+        self._feed_cache: Dict[int, Tuple[int, str]] = {}  # limit -> (version, feed)
+        self._read_cursors: Dict[str, int] = {}  # reader_id -> sequence of the last post read
+
+    @property
+    def reactions(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Reactions grouped by post ID as {"persona_id", "reaction"} dicts (built from reaction_log)."""
+        return self.reaction_log.by_post()
+
+    def _index_post(self, post: Post) -> None:
+        post.epoch = self.current_epoch
+        self.reaction_log.register_post(post.id, post.persona_id)
+        self._sequence[post.id] = self._next_sequence
+        self._next_sequence += 1
+        self.version += 1
+        self._posts_by_id[post.id] = post
+        self._posts_by_persona.setdefault(post.persona_id, []).append(post)
+
+    def get_post(self, post_id: str):
+        """Return the post with the given ID, or None."""
+        return self._posts_by_id.get(post_id)
 
     def add_post(self, post) -> str:
         """
@@ -52,6 +108,7 @@ class SocialMedia:
                 dislikes=0
             )
             self.posts.append(post_obj)
+            self._index_post(post_obj)
             return post_id
         else:
             # Handle Post object
@@ -63,33 +120,241 @@ class SocialMedia:
                 post.content = post.content.content
 
             self.posts.append(post)
+            self._index_post(post)
             return post.id
 
+    def enable_retention(self, retention_epochs: int, archive_path) -> None:
+        """
+        Keep only posts from the last `retention_epochs` epochs in memory.
+
+        Args:
+            retention_epochs: Number of epochs a post stays active (>= 1)
+            archive_path: JSONL file that expired posts and their reactions are appended to
+        """
+        if retention_epochs < 1:
+            raise ValueError(f"retention_epochs must be at least 1 (got {retention_epochs})")
+        self.retention_epochs = retention_epochs
+        self.archive = PostArchive(archive_path)
+
+    def expire_posts(self) -> int:
+        """
+        Move posts older than the retention window to the archive.
+
+        Posts published in epoch ``current_epoch - retention_epochs`` or earlier are
+        appended (with their reactions) to the archive and dropped from every
+        in-memory structure. Posts are kept in publication order, so the expired
+        ones are always a prefix of `posts`.
+
+        Returns:
+            Number of posts archived
+        """
+        if self.retention_epochs is None or not self.posts:
+            return 0
+
+        cutoff = self.current_epoch - self.retention_epochs
+        expired_count = 0
+        while expired_count < len(self.posts) and self.posts[expired_count].epoch <= cutoff:
+            expired_count += 1
+        if expired_count == 0:
+            return 0
+
+        expired = self.posts[:expired_count]
+        expired_reactions = self.reaction_log.remove_posts([post.id for post in expired])
+        self.archive.append((asdict(post), expired_reactions.get(post.id, [])) for post in expired)
+        self.posts = self.posts[expired_count:]
+
+        authors = set()
+        for post in expired:
+            del self._posts_by_id[post.id]
+            del self._sequence[post.id]
+            self._rendered.pop(post.id, None)
+            authors.add(post.persona_id)
+        for persona_id in authors:
+            remaining = [post for post in self._posts_by_persona[persona_id] if post.id in self._posts_by_id]
+            if remaining:
+                self._posts_by_persona[persona_id] = remaining
+            else:
+                del self._posts_by_persona[persona_id]
+        self.version += 1
+
+        logger.info(f"Archived {expired_count} posts from epoch {cutoff} or earlier "
+                    f"({len(self.posts)} active, {len(self.archive)} archived)")
+        return expired_count
+
+    def get_archived_post(self, post_id: str) -> Optional[Post]:
+        """Return an archived post by ID, or None."""
+        entry = self.archive.get(post_id) if self.archive else None
+        return Post(**entry["post"]) if entry else None
+
+    def get_archived_posts_by_persona(self, persona_id: str) -> List[Post]:
+        """Return all archived posts by a persona, oldest first."""
+        if not self.archive:
+            return []
+        return [Post(**entry["post"]) for entry in self.archive.by_persona(persona_id)]
+
+    def _render(self, post: Post) -> str:
+        line = self._rendered.get(post.id)
+        if line is None:
+            line = self._rendered[post.id] = post.to_string()
+        return line
+
     def get_feed(self, limit: int = 100) -> str:
-        """Returns the last `limit` posts as a concatenated string"""
+        """Returns the last `limit` posts as a concatenated string (cached until the platform changes)"""
+        cached = self._feed_cache.get(limit)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
         recent_posts = self.posts[-limit:] if len(self.posts) > limit else self.posts
-        return "\n".join([post.to_string() for post in recent_posts])
+        feed = "\n".join([self._render(post) for post in recent_posts])
+        self._feed_cache[limit] = (self.version, feed)
+        return feed
+
+    def read_new_posts(self, reader_id: str, limit: Optional[int] = 100) -> List[Post]:
+        """
+        Return posts published since `reader_id`'s previous read and advance its read cursor.
+
+        The first read returns the whole active feed. At most the newest `limit` posts are returned
+        (all if None), but the cursor always moves past every post, so skipped posts are not
+        returned later.
+        """
+        cursor = self._read_cursors.get(reader_id, -1)
+        start = bisect.bisect_right(self.posts, cursor, key=lambda post: self._sequence[post.id])
+        new_posts = self.posts[start:]
+        if self.posts:
+            self._read_cursors[reader_id] = self._sequence[self.posts[-1].id]
+        return new_posts[-limit:] if limit is not None and len(new_posts) > limit else new_posts
+
+    def get_feed_since(self, reader_id: str, limit: int = 100) -> str:
+        """Like get_feed, but only with posts new since `reader_id`'s previous read (see read_new_posts)."""
+        return "\n".join([self._render(post) for post in self.read_new_posts(reader_id, limit)])
 
     def get_feed_by_personas(self, personas: List[str]) -> List[Post]:
         """Returns only posts made by the specified personas"""
-        return [post for post in self.posts if post.persona_id in personas]
+        per_persona = [self._posts_by_persona.get(persona_id, []) for persona_id in set(personas)]
+        return list(heapq.merge(*per_persona, key=lambda post: self._sequence[post.id]))
 
     def add_reaction(self, post_id: str, persona_id: str, reaction: str) -> None:
         if reaction not in self.VALID_REACTIONS:
             raise ValueError(f"Invalid reaction: {reaction}. Must be one of {self.VALID_REACTIONS}")
 
         # Find the post and increment its like/dislike count
-        post = next((p for p in self.posts if p.id == post_id), None)
+        post = self._posts_by_id.get(post_id)
         if post:
             if reaction == "thumbs_up":
                 post.likes += 1
             elif reaction == "thumbs_down":
                 post.dislikes += 1
+            self._rendered.pop(post_id, None)
+            self.version += 1
 
         # Track the reaction
-        if post_id not in self.reactions:
-            self.reactions[post_id] = []
-        self.reactions[post_id].append({"persona_id": persona_id, "reaction": reaction})
+        self.reaction_log.extend([(post_id, persona_id, reaction)], epoch=self.current_epoch)
+
+    def add_reactions(self, reactions: Iterable[Tuple[str, str, str]]) -> int:
+        """
+        Apply many reactions at once.
+
+        Args:
+            reactions: (post_id, persona_id, reaction) tuples
+
+        Returns:
+            Number of reactions applied
+        """
+        reactions = list(reactions)
+        invalid = {reaction for _, _, reaction in reactions if reaction not in self.VALID_REACTIONS}
+        if invalid:
+            raise ValueError(f"Invalid reaction: {sorted(invalid)[0]}. Must be one of {self.VALID_REACTIONS}")
+
+        for post_id, persona_id, reaction in reactions:
+            post = self._posts_by_id.get(post_id)
+            if post:
+                if reaction == "thumbs_up":
+                    post.likes += 1
+                else:
+                    post.dislikes += 1
+                self._rendered.pop(post_id, None)
+        self.version += 1
+
+        return self.reaction_log.extend(reactions, epoch=self.current_epoch)
+
+    def set_persona_profiles(self, persona_ids: List[str], vectors: np.ndarray, social_media_usage: List[float]) -> None:
+        """
+        Register persona feature vectors and social media usage for feed ranking.
+
+        Args:
+            persona_ids: IDs of viewers/authors, parallel to the rows of `vectors`
+            vectors: Feature matrix, one row per persona (compared by cosine similarity)
+            social_media_usage: media_diet['social_media'] share per persona
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self._profile_vectors = vectors / np.maximum(norms, 1e-9)
+        self._profile_index = {persona_id: i for i, persona_id in enumerate(persona_ids)}
+        self._social_media_usage = np.asarray(social_media_usage, dtype=np.float32)
+
+    def rank_feeds(self, viewer_ids: List[str], k: int = 20) -> Dict[str, List[Post]]:
+        """
+        Build a personalized top-k feed for each viewer.
+
+        Each post is scored for each viewer as
+
+            recency    * 0.5 ** (age_in_epochs / RECENCY_HALF_LIFE)
+          + engagement * usage * log1p(likes + dislikes) / max
+          + similarity * cosine(viewer, author)
+
+        (weighted by FEED_WEIGHTS), where usage is the viewer's media_diet['social_media'],
+        so heavy users see more of what is already popular. Viewers never see their own posts.
+        Scoring is vectorized per block of viewers and the top k is picked with argpartition.
+
+        Args:
+            viewer_ids: Personas to build feeds for
+            k: Maximum number of posts per feed
+
+        Returns:
+            Dict of viewer_id -> posts, best first
+        """
+        if not self.posts or not viewer_ids:
+            return {viewer_id: [] for viewer_id in viewer_ids}
+
+        posts = self.posts
+        age = self.current_epoch - np.array([post.epoch for post in posts], dtype=np.float32)
+        recency = np.power(0.5, age / self.RECENCY_HALF_LIFE)
+        volume = np.log1p(np.array([post.likes + post.dislikes for post in posts], dtype=np.float32))
+        engagement = volume / volume.max() if volume.max() > 0 else volume
+        base = self.FEED_WEIGHTS["recency"] * recency
+
+        author_rows = np.array([self._profile_index.get(post.persona_id, -1) for post in posts])
+        has_profile = self._profile_vectors is not None
+        if has_profile:
+            author_vectors = self._profile_vectors[np.maximum(author_rows, 0)]
+            author_vectors[author_rows < 0] = 0.0
+        author_codes: Dict[str, int] = {}
+        post_authors = np.array([author_codes.setdefault(post.persona_id, len(author_codes)) for post in posts])
+
+        k = min(k, len(posts))
+        feeds = {}
+        for start in range(0, len(viewer_ids), self.RANKING_CHUNK):
+            block = viewer_ids[start:start + self.RANKING_CHUNK]
+            viewer_rows = np.array([self._profile_index.get(viewer_id, -1) for viewer_id in block])
+
+            usage = np.full(len(block), 0.5, dtype=np.float32)
+            scores = np.repeat(base[None, :], len(block), axis=0)
+            if has_profile:
+                known = viewer_rows >= 0
+                usage[known] = self._social_media_usage[viewer_rows[known]]
+                viewer_vectors = self._profile_vectors[np.maximum(viewer_rows, 0)]
+                viewer_vectors[~known] = 0.0
+                scores += self.FEED_WEIGHTS["similarity"] * (viewer_vectors @ author_vectors.T)
+            scores += self.FEED_WEIGHTS["engagement"] * usage[:, None] * engagement[None, :]
+            viewer_codes = np.array([author_codes.get(viewer_id, -1) for viewer_id in block])
+            scores[post_authors[None, :] == viewer_codes[:, None]] = -np.inf
+
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row, viewer_id in enumerate(block):
+                ranked = top[row][np.argsort(-scores[row, top[row]], kind="stable")]
+                feeds[viewer_id] = [posts[i] for i in ranked if np.isfinite(scores[row, i])]
+
+        return feeds
 
     def get_trending_topics(self) -> List[str]:
         return []
@@ -97,7 +362,8 @@ class SocialMedia:
     def get_platform_state(self) -> Dict[str, Any]:
         return {
             "total_posts": len(self.posts),
-            "total_reactions": sum(len(reactions) for reactions in self.reactions.values()),
+            "total_reactions": len(self.reaction_log),
             "posts": [asdict(post) for post in self.posts],
-            "reactions": self.reactions
+            "reactions": self.reactions,
+            "reaction_summary": self.reaction_log.summary()
         }
\ No newline at end of file
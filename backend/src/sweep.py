@@ -0,0 +1,289 @@
+"""Parameter sweeps that execute shared prefixes once.
+
+A sweep is a list of runs. Each run starts from a config and may schedule
+config changes that take effect from a later epoch:
+
+    sweep_id: seeds
+    base_config: src/configs/config.yaml
+    runs:
+      - id: seed_42
+      - id: seed_7
+        changes: {1: {random_seed: 7}}       # same setup and first epoch as seed_42
+      - id: more_posts
+        overrides: {post_probability: 0.2}   # same setup as seed_42
+
+Runs are arranged in a prefix tree. Two runs share the setup stage (population,
+candidate initial positions) when their setup fields match, and share epoch k
+when they also ran under identical configs in every epoch up to k. Each shared
+prefix is executed once, in the directory of its first run; at a branch point
+the other runs continue from a copy of the setup or, after an epoch, are forked
+from the epoch's checkpoint (GameEngine.fork). Every run ends up in its own
+simulation directory under ``<base_dir>/<sweep_id>/``, next to a ``sweep.json``
+index that records where each run branched off.
+"""
+
+import json
+import logging
+import dataclasses
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from .config import Config
+from .game_engine import GameEngine
+from .checkpoint import save_checkpoint, load_checkpoint
+
+logger = logging.getLogger(__name__)
+
+# Fields that shape the engine built before epoch 0 (population, candidates, topics, world)
+SETUP_FIELDS = (
+    "population_file", "population_size", "population_query", "population_sampling",
+    "opinion_dynamics", "archetypes", "topics", "candidates", "world_file", "world_story",
+    "random_seed", "population_shards"
+)
+
+# Fields that do not change what an epoch computes
+IGNORED_FIELDS = ("num_epochs", "checkpoints")
+
+
+def config_diff(target: Config, current: Config) -> Dict[str, Any]:
+    """Fields whose value in `target` differs from `current`, as overrides for apply_overrides."""
+    return {
+        config_field.name: getattr(target, config_field.name)
+        for config_field in dataclasses.fields(Config)
+        if getattr(target, config_field.name) != getattr(current, config_field.name)
+    }
+
+
+def _signature(values: Dict[str, Any]) -> str:
+    return json.dumps(values, sort_keys=True, default=str)
+
+
+def _partition(runs: List['SweepRun'], key: Callable[['SweepRun'], str]) -> List[List['SweepRun']]:
+    """Group runs by key, keeping the order of first appearance."""
+    groups: Dict[str, List[SweepRun]] = {}
+    for run in runs:
+        groups.setdefault(key(run), []).append(run)
+    return list(groups.values())
+
+
+@dataclass
+class SweepRun:
+    """One run of a sweep: its initial config and config changes by the epoch they take effect."""
+    id: str
+    config: Config
+    changes: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        field_names = {config_field.name for config_field in dataclasses.fields(Config)}
+        for epoch, overrides in self.changes.items():
+            if epoch < 0:
+                raise ValueError(f"Run {self.id}: changes must start at epoch 0 or later (got {epoch})")
+            unknown = sorted(set(overrides) - field_names)
+            if unknown:
+                raise ValueError(f"Run {self.id}: unknown config fields in changes: {', '.join(unknown)}")
+            if "num_epochs" in overrides:
+                raise ValueError(f"Run {self.id}: num_epochs cannot change during a run")
+        if self.config.num_epochs < 1:
+            raise ValueError(f"Run {self.id}: num_epochs must be at least 1")
+
+    @property
+    def num_epochs(self) -> int:
+        return self.config.num_epochs
+
+    def config_at(self, epoch: int) -> Config:
+        """Config in effect during `epoch` (checkpoints are always on, branches fork from them)."""
+        overrides = {"checkpoints": True}
+        for change_epoch in sorted(self.changes):
+            if change_epoch <= epoch:
+                overrides.update(self.changes[change_epoch])
+        return dataclasses.replace(self.config, **overrides)
+
+    def setup_signature(self) -> str:
+        config = self.config_at(0)
+        return _signature({name: getattr(config, name) for name in SETUP_FIELDS})
+
+    def signature(self, epoch: int) -> str:
+        config = dataclasses.asdict(self.config_at(epoch))
+        return _signature({name: value for name, value in config.items() if name not in IGNORED_FIELDS})
+
+
+class SweepRunner:
+    """Execute a list of runs as a prefix tree, running every shared prefix once."""
+
+    def __init__(
+        self,
+        runs: List[SweepRun],
+        engine_factory: Callable[[Config], GameEngine],
+        base_dir: str = "data/simulation",
+        sweep_id: Optional[str] = None,
+        final_vote: bool = True
+    ):
+        """
+        Args:
+            runs: Runs of the sweep (IDs become the simulation directory names)
+            engine_factory: Builds a set-up engine (population, candidates, mediator) for a config
+            base_dir: Base directory for simulation outputs
+            sweep_id: Name of the sweep directory (default: timestamp)
+            final_vote: Conduct and save the final vote of every completed run
+        """
+        run_ids = [run.id for run in runs]
+        if len(set(run_ids)) != len(run_ids):
+            raise ValueError("Sweep run IDs must be unique")
+        self.runs = runs
+        self.engine_factory = engine_factory
+        self.sweep_id = sweep_id or datetime.now().strftime("%Y%m%d_%H%M%S_sweep")
+        self.sweep_dir = Path(base_dir) / self.sweep_id
+        self.final_vote = final_vote
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self.setups_executed = 0
+        self.epochs_executed = 0
+
+    def run(self) -> Dict[str, Path]:
+        """
+        Execute the sweep.
+
+        Returns:
+            Simulation directory of every run
+        """
+        self.sweep_dir.mkdir(parents=True, exist_ok=True)
+        for group in _partition(self.runs, SweepRun.setup_signature):
+            self._run_setup_group(group)
+
+        total_epochs = sum(run.num_epochs for run in self.runs)
+        logger.info(f"Sweep {self.sweep_id} finished: {len(self.runs)} runs, {self.setups_executed} setups, "
+                    f"{self.epochs_executed} of {total_epochs} epochs executed")
+        self._write_index()
+        return {run.id: Path(self.index[run.id]["simulation_dir"]) for run in self.runs}
+
+    def _run_setup_group(self, runs: List[SweepRun]) -> None:
+        """Set up one engine for runs with the same setup fields and branch it for their epoch-0 configs."""
+        owner = runs[0]
+        engine = self.engine_factory(owner.config_at(0))
+        self.setups_executed += 1
+
+        branches = _partition(runs, lambda run: run.signature(0))
+        snapshot = None
+        if len(branches) > 1:
+            snapshot = save_checkpoint(engine, self.sweep_dir / "setup" / f"{owner.id}.pkl.gz")
+
+        for i, branch in enumerate(branches):
+            leader = branch[0]
+            if i > 0:
+                engine = load_checkpoint(snapshot)
+                engine.config = leader.config_at(0)  # Only non-setup fields differ; run() picks them up
+            self._start(engine, leader, {"run": owner.id, "after": "setup"} if i > 0 else None)
+            self._advance(engine, leader, branch, 0)
+            engine = None
+
+        if snapshot is not None:
+            snapshot.unlink()
+
+    def _start(self, engine: GameEngine, run: SweepRun, branched_from: Optional[Dict[str, Any]]) -> None:
+        engine.simulation_id = run.id
+        engine.initialize_simulation_output(str(self.sweep_dir))
+        engine.write_effective_config()
+        self._record(run, engine, branched_from)
+
+    def _record(self, run: SweepRun, engine: GameEngine, branched_from: Optional[Dict[str, Any]]) -> None:
+        self.index[run.id] = {
+            "simulation_dir": str(engine.simulation_dir),
+            "branched_from": branched_from,
+            "changes": run.changes
+        }
+
+    def _advance(self, engine: GameEngine, owner: SweepRun, runs: List[SweepRun], epoch: int) -> None:
+        """
+        Run epochs shared by `runs` from `epoch` on, in the directory of `owner`, until they branch.
+
+        At the branch point the owner's branch continues with the engine, and every other
+        branch (and every run ending there) is forked from the last shared checkpoint.
+        """
+        while True:
+            finished = [run for run in runs if run.num_epochs <= epoch]
+            branches = _partition([run for run in runs if run.num_epochs > epoch], lambda run: run.signature(epoch))
+            if finished or len(branches) != 1:
+                break
+            self._run_epoch(engine, owner, epoch)
+            epoch += 1
+
+        parent_dir = engine.simulation_dir
+        if owner in finished:
+            self._complete(engine, owner)
+        else:
+            owner_branch = next(branch for branch in branches if owner in branch)
+            self._advance(engine, owner, owner_branch, epoch)
+        engine = None
+
+        parent_config = owner.config_at(epoch - 1)
+        for run in finished:
+            if run is not owner:
+                fork = self._fork(parent_dir, owner, epoch - 1, run, config_diff(run.config_at(epoch - 1), parent_config))
+                self._complete(fork, run)
+        for branch in branches:
+            if owner not in branch:
+                leader = branch[0]
+                fork = self._fork(parent_dir, owner, epoch - 1, leader, config_diff(leader.config_at(epoch), parent_config))
+                self._advance(fork, leader, branch, epoch)
+
+    def _run_epoch(self, engine: GameEngine, owner: SweepRun, epoch: int) -> None:
+        overrides = config_diff(owner.config_at(epoch), engine.config)
+        if overrides:
+            logger.info(f"Run {owner.id}: applying changes from epoch {epoch}: {', '.join(overrides)}")
+            engine.apply_overrides(overrides)
+        engine.run(until_epoch=epoch + 1)
+        self.epochs_executed += 1
+
+    def _fork(self, parent_dir: Path, owner: SweepRun, epoch: int, run: SweepRun, overrides: Dict[str, Any]) -> GameEngine:
+        fork = GameEngine.fork(parent_dir, epoch, overrides, base_dir=str(self.sweep_dir), simulation_id=run.id)
+        self._record(run, fork, {"run": owner.id, "after_epoch": epoch})
+        return fork
+
+    def _complete(self, engine: GameEngine, run: SweepRun) -> None:
+        engine.run()
+        if self.final_vote and engine.population.size() > 0 and engine.candidates:
+            engine.save_final_vote(engine.conduct_final_vote())
+        engine.population.close()
+        logger.info(f"Run {run.id} completed in {engine.simulation_dir}")
+
+    def _write_index(self) -> None:
+        index = {
+            "sweep_id": self.sweep_id,
+            "setups_executed": self.setups_executed,
+            "epochs_executed": self.epochs_executed,
+            "epochs_total": sum(run.num_epochs for run in self.runs),
+            "runs": self.index
+        }
+        with open(self.sweep_dir / "sweep.json", 'w') as f:
+            json.dump(index, f, indent=2, default=str)
+
+
+def load_sweep(yaml_path: str) -> Dict[str, Any]:
+    """
+    Load a sweep specification.
+
+    Each run names a config file (`config`, default `base_config`), optional `overrides`
+    applied from the start and optional `changes` keyed by the epoch they take effect from.
+
+    Returns:
+        Dict with the sweep_id (or None) and the list of SweepRuns
+    """
+    with open(yaml_path, 'r') as f:
+        spec = yaml.safe_load(f)
+
+    configs: Dict[str, Config] = {}
+    runs = []
+    for run_spec in spec["runs"]:
+        config_path = run_spec.get("config", spec.get("base_config"))
+        if config_path is None:
+            raise ValueError(f"Run {run_spec['id']} has no config and the sweep no base_config")
+        if config_path not in configs:
+            configs[config_path] = Config.from_yaml(config_path)
+        config = dataclasses.replace(configs[config_path], **run_spec.get("overrides", {}))
+        changes = {int(epoch): overrides for epoch, overrides in (run_spec.get("changes") or {}).items()}
+        runs.append(SweepRun(str(run_spec["id"]), config, changes))
+
+    return {"sweep_id": spec.get("sweep_id"), "runs": runs}
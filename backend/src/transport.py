@@ -0,0 +1,236 @@
+"""Message transports between a simulation coordinator and its workers.
+
+A transport opens channels that carry picklable Python objects in both
+directions. The coordinator listens, workers connect:
+
+    listener = TcpTransport(authkey=b"secret").listen(("0.0.0.0", 7070))
+    channel = listener.accept()                       # coordinator side
+    channel = TcpTransport(authkey=b"secret").connect(("coordinator", 7070))  # worker side
+
+TcpTransport uses multiprocessing.connection, which authenticates both ends
+with an HMAC challenge on the shared authkey before any pickle is exchanged.
+InProcessTransport connects threads of one process through queues and
+stands in for the network in tests. Another transport (e.g. a message
+broker) only needs to provide listen() and connect() returning objects
+with the Listener and Channel methods below.
+"""
+
+import queue
+import socket
+import logging
+import threading
+import multiprocessing
+import multiprocessing.connection
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ChannelClosed(ConnectionError):
+    """The other end of a channel closed or went away."""
+
+
+class Channel:
+    """One end of a bidirectional message channel."""
+
+    def send(self, message: Any) -> None:
+        raise NotImplementedError
+
+    def recv(self, timeout: Optional[float] = None) -> Any:
+        """
+        Receive the next message.
+
+        Raises:
+            TimeoutError: If no message arrived within `timeout` seconds
+            ChannelClosed: If the other end closed the channel
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class Listener:
+    """Accepts channels opened by connecting workers."""
+
+    address: Any = None
+
+    def accept(self, timeout: Optional[float] = None) -> Channel:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class Transport:
+    def listen(self, address) -> Listener:
+        raise NotImplementedError
+
+    def connect(self, address) -> Channel:
+        raise NotImplementedError
+
+
+# ---------- TCP ----------
+
+class ConnectionChannel(Channel):
+    """Channel over a multiprocessing.connection.Connection (sends are serialized across threads)."""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._send_lock = threading.Lock()
+
+    def send(self, message: Any) -> None:
+        try:
+            with self._send_lock:
+                self._connection.send(message)
+        except (OSError, EOFError) as error:
+            raise ChannelClosed(str(error)) from error
+
+    def recv(self, timeout: Optional[float] = None) -> Any:
+        try:
+            if timeout is not None and not self._connection.poll(timeout):
+                raise TimeoutError(f"No message within {timeout}s")
+            return self._connection.recv()
+        except (OSError, EOFError) as error:
+            raise ChannelClosed(str(error)) from error
+
+    def close(self) -> None:
+        try:
+            self._connection.close()
+        except OSError:
+            pass
+
+
+class TcpListener(Listener):
+    def __init__(self, address: Tuple[str, int], authkey: bytes):
+        self._socket = socket.create_server(address)
+        self.address = self._socket.getsockname()[:2]
+        self._authkey = authkey
+
+    def accept(self, timeout: Optional[float] = None) -> Channel:
+        self._socket.settimeout(timeout)
+        try:
+            client, _ = self._socket.accept()
+        except socket.timeout:
+            raise TimeoutError(f"No connection within {timeout}s") from None
+        except OSError as error:
+            raise ChannelClosed("Listener closed") from error
+        client.setblocking(True)
+
+        # The handshake of multiprocessing.connection.Listener.accept
+        connection = multiprocessing.connection.Connection(client.detach())
+        try:
+            multiprocessing.connection.deliver_challenge(connection, self._authkey)
+            multiprocessing.connection.answer_challenge(connection, self._authkey)
+        except (multiprocessing.AuthenticationError, OSError, EOFError) as error:
+            connection.close()
+            raise ChannelClosed(f"Handshake failed: {error}") from error
+        return ConnectionChannel(connection)
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+class TcpTransport(Transport):
+    """Authenticated TCP connections (address: (host, port); port 0 picks a free port)."""
+
+    def __init__(self, authkey: bytes):
+        if not authkey:
+            raise ValueError("TcpTransport requires an authkey shared by the coordinator and its workers")
+        self.authkey = authkey
+
+    def listen(self, address: Tuple[str, int]) -> TcpListener:
+        return TcpListener(tuple(address), self.authkey)
+
+    def connect(self, address: Tuple[str, int]) -> Channel:
+        return ConnectionChannel(multiprocessing.connection.Client(tuple(address), family='AF_INET', authkey=self.authkey))
+
+
+# ---------- in-process ----------
+
+_CLOSED = object()
+
+
+class QueueChannel(Channel):
+    """Channel between two threads of one process."""
+
+    def __init__(self, inbox: queue.Queue, outbox: queue.Queue):
+        self._inbox = inbox
+        self._outbox = outbox
+        self._closed = False
+
+    @classmethod
+    def pair(cls) -> Tuple['QueueChannel', 'QueueChannel']:
+        a_to_b, b_to_a = queue.Queue(), queue.Queue()
+        return cls(b_to_a, a_to_b), cls(a_to_b, b_to_a)
+
+    def send(self, message: Any) -> None:
+        if self._closed:
+            raise ChannelClosed("Channel closed")
+        self._outbox.put(message)
+
+    def recv(self, timeout: Optional[float] = None) -> Any:
+        if self._closed:
+            raise ChannelClosed("Channel closed")
+        try:
+            message = self._inbox.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No message within {timeout}s") from None
+        if message is _CLOSED:
+            self._closed = True
+            raise ChannelClosed("Channel closed by peer")
+        return message
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._outbox.put(_CLOSED)
+            self._inbox.put(_CLOSED)  # Wakes a recv() blocked on this end
+
+
+class InProcessListener(Listener):
+    def __init__(self, transport: 'InProcessTransport', address: str):
+        self._transport = transport
+        self.address = address
+        self._pending: queue.Queue = queue.Queue()
+
+    def accept(self, timeout: Optional[float] = None) -> Channel:
+        try:
+            channel = self._pending.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No connection within {timeout}s") from None
+        if channel is _CLOSED:
+            raise ChannelClosed("Listener closed")
+        return channel
+
+    def close(self) -> None:
+        self._transport._listeners.pop(self.address, None)
+        self._pending.put(_CLOSED)
+
+
+class InProcessTransport(Transport):
+    """Queue-backed channels between threads, addressed by name (for tests)."""
+
+    def __init__(self):
+        self._listeners: Dict[str, InProcessListener] = {}
+
+    def listen(self, address: str = "coordinator") -> InProcessListener:
+        if address in self._listeners:
+            raise OSError(f"Address already in use: {address}")
+        listener = InProcessListener(self, address)
+        self._listeners[address] = listener
+        return listener
+
+    def connect(self, address: str = "coordinator") -> Channel:
+        listener = self._listeners.get(address)
+        if listener is None:
+            raise ConnectionRefusedError(f"Nothing listening on {address}")
+        coordinator_end, worker_end = QueueChannel.pair()
+        listener._pending.put(coordinator_end)
+        return worker_end
+
+
+def parse_address(text: str, default_host: str = "0.0.0.0") -> Tuple[str, int]:
+    """Parse HOST:PORT (or :PORT / PORT) into a TCP address."""
+    host, _, port = text.rpartition(":")
+    return (host or default_host, int(port))
@@ -0,0 +1,169 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch, AsyncMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.agent_memory import AgentMemory, SUMMARY_HEADER, estimate_tokens
+from src.config import Config
+from src.game_engine import GameEngine
+from src.mediator import Mediator, Topic
+from src.candidate import Candidate, CandidateState
+
+
+def run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+class TestAgentMemory:
+    """Test suite for bounded agent memory"""
+
+    def test_render_grows_by_appended_entry(self):
+        """Test that appending only extends the rendered text"""
+        memory = AgentMemory(pinned="=== WORLD CONTEXT ===\nAtlantis\n\n")
+        before = memory.render()
+        memory.append("Reflection one.\n")
+
+        assert memory.render() == before + "Reflection one.\n"
+        assert memory.tokens == estimate_tokens(memory.render())
+
+    @patch('src.agent_memory.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_unbounded_memory_is_never_compacted(self, mock_generate):
+        """Test that memory without a token budget keeps every entry"""
+        memory = AgentMemory()
+        for i in range(50):
+            memory.append(f"Entry {i} " + "x" * 200 + "\n")
+
+        assert run(memory.compact_async(None, "Alice")) is False
+        assert len(memory.entries) == 50
+        mock_generate.assert_not_called()
+
+    @patch('src.agent_memory.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_compaction_keeps_pinned_and_recent_entries(self, mock_generate):
+        """Test that older entries are folded into the summary once over budget"""
+        mock_generate.return_value = "  I argued for rent caps and voters were skeptical.  "
+        memory = AgentMemory(pinned="WORLD\n", token_budget=100, recent_entries=2)
+        for i in range(6):
+            memory.append(f"Entry {i} " + "x" * 100 + "\n")
+
+        assert run(memory.compact_async(None, "Alice, a political candidate")) is True
+        assert memory.entries[0].startswith("Entry 4")
+        assert memory.summarized_entries == 4
+        rendered = memory.render()
+        assert rendered.startswith("WORLD\n" + SUMMARY_HEADER + "I argued for rent caps and voters were skeptical.")
+        assert rendered.endswith(memory.entries[-1])
+
+        prompt = mock_generate.call_args[0][1]
+        assert "Entry 3" in prompt and "Entry 4" not in prompt
+        assert memory.stats()["entries"] == 2
+
+    @patch('src.agent_memory.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_failed_compaction_keeps_entries(self, mock_generate):
+        """Test that an LLM error leaves memory untouched"""
+        mock_generate.side_effect = Exception("API error")
+        memory = AgentMemory(token_budget=10, recent_entries=1)
+        for i in range(3):
+            memory.append(f"Entry {i} " + "x" * 100 + "\n")
+
+        assert run(memory.compact_async(None, "Alice")) is False
+        assert len(memory.entries) == 3
+        assert memory.summary == ""
+
+    @patch('src.agent_memory.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_oversized_summary_is_cut_to_budget(self, mock_generate):
+        """Test that a summary longer than the budget allows is trimmed"""
+        mock_generate.return_value = "I remember a lot. " * 200
+        memory = AgentMemory(pinned="WORLD\n", token_budget=120, recent_entries=1)
+        for i in range(6):
+            memory.append(f"Entry {i} " + "x" * 100 + "\n")
+
+        assert run(memory.compact_async(None, "Alice")) is True
+        assert memory.tokens <= 120
+        assert memory.summary.startswith("I remember a lot.")
+
+    @patch('src.agent_memory.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_large_recent_entries_are_folded(self, mock_generate):
+        """Test that recent entries are summarized too when they alone exceed the budget"""
+        mock_generate.return_value = "Short summary."
+        memory = AgentMemory(token_budget=100, recent_entries=3)
+        for i in range(3):
+            memory.append(f"Entry {i} " + "x" * 300 + "\n")
+
+        assert run(memory.compact_async(None, "Alice")) is True
+        assert memory.tokens <= 100
+        assert memory.summarized_entries == 3
+
+    @patch('src.agent_memory.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_fork_journal_survives_compaction(self, mock_generate):
+        """Test that a fork records its own entries even if it compacts in between"""
+        mock_generate.return_value = "Summary."
+        memory = AgentMemory(token_budget=40, recent_entries=1)
+        memory.append("Shared " + "x" * 100 + "\n")
+        fork = memory.fork()
+        fork.append("Fork one " + "y" * 100 + "\n")
+        run(fork.compact_async(None, "Alice"))
+        fork.append("Fork two\n")
+
+        assert fork.summarized_entries > 0
+        assert fork.journal == ["Fork one " + "y" * 100 + "\n", "Fork two\n"]
+        assert memory.journal is None and len(memory.entries) == 1
+
+
+class TestAgentMemoryIntegration:
+    """Test suite for memory management in agents"""
+
+    @patch('src.agent_memory.llm_client.generate_response_async', new_callable=AsyncMock)
+    @patch('src.mediator.llm_client.generate_response')
+    def test_mediator_memory_is_compacted(self, mock_generate, mock_summarize):
+        """Test that the mediator's prompt memory shrinks after compaction"""
+        mock_generate.return_value = "Voters worry about rents. " * 20
+        mock_summarize.return_value = "Rents dominate the discussion."
+        mediator = Mediator("med_1", world_story="Atlantis")
+        mediator.memory_manager.token_budget = 200
+        mediator.memory_manager.recent_entries = 1
+        for _ in range(4):
+            mediator.read_social_media_signals("@p1: rents are too high")
+        size_before = len(mediator.state.memory)
+
+        assert run(mediator.compact_memory_async()) is True
+        assert len(mediator.state.memory) < size_before
+        assert mediator.state.memory.startswith("=== WORLD CONTEXT ===\nAtlantis")
+        assert "Rents dominate the discussion." in mediator.state.memory
+        assert mediator.state.memory == mediator.memory_manager.render()
+
+    def test_memory_stays_under_budget_within_an_epoch(self):
+        """Test that memory is compacted between the questions of one epoch, not only after the debates"""
+        budget = 250
+        topic = Topic(id="t1", title="Housing", description="Rents")
+        with patch('src.game_engine.llm_client.create_client'), patch.dict('os.environ', {'GEMINI_API_KEY': 'test_key'}):
+            engine = GameEngine(Config(population_size=0, questions_per_topic=5, turns_per_question=1, num_epochs=1,
+                                       random_seed=42, agent_memory={"token_budget": budget, "recent_entries": 2}))
+        engine.mediator = Mediator("m1", topics=[topic], llm_client_instance=Mock(), world_story="Atlantis")
+        engine.candidates = []
+        for i in range(2):
+            candidate = Candidate(f"c{i}", f"Candidate {i}", "Centrist", [topic], Mock(), initialize=False)
+            candidate.state = CandidateState(id=candidate.id, name=candidate.name, character="Centrist",
+                                             policy_positions={"t1": "For"}, memory="=== WORLD CONTEXT ===\nAtlantis\n\n")
+            candidate.memory_manager = AgentMemory(pinned=candidate.state.memory)
+            engine.candidates.append(candidate)
+        engine._configure_agent_memory()
+        agents = [engine.mediator, *engine.candidates]
+        prompt_memory = []
+
+        def fake_generate(client, prompt, system_instruction, **kwargs):
+            prompt_memory.append(max(agent.memory_manager.tokens for agent in agents))
+            return "A short statement."
+
+        async def fake_generate_async(client, prompt, system_instruction, **kwargs):
+            if "faithful memory" in system_instruction:
+                return "What I remember. " * 100  # Overshoots the word target
+            return "A long reflection on the debate. " * 12
+
+        with patch('src.llm_client.generate_response', side_effect=fake_generate), \
+             patch('src.llm_client.generate_response_async', side_effect=fake_generate_async):
+            engine._conduct_debate_on_topic(0)
+
+        assert len(prompt_memory) >= 5 * 3  # Question, introduction and two statements per question
+        assert max(prompt_memory) <= budget
+        assert all(candidate.memory_manager.summarized_entries > 0 for candidate in engine.candidates)
+        assert all(candidate.state.memory == candidate.memory_manager.render() for candidate in engine.candidates)
@@ -0,0 +1,84 @@
+import random
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.archetypes import kmeans, persona_feature_matrix, propagate_beliefs
+
+
+def make_persona(persona_id, openness, education, susceptibility=0.5, beliefs=None):
+    """Lightweight stand-in exposing the attributes archetype clustering reads"""
+    return SimpleNamespace(
+        id=persona_id,
+        features={
+            "age": 40,
+            "education_level": education,
+            "susceptibility": susceptibility,
+            "personality_traits": {"openness": openness},
+        },
+        beliefs=beliefs or {}
+    )
+
+
+class TestKMeans:
+    """Test suite for vectorized k-means"""
+
+    def test_separates_obvious_clusters(self):
+        """Test that two well-separated blobs get two labels and one representative each"""
+        rng = np.random.default_rng(0)
+        X = np.vstack([rng.normal(0, 0.1, (20, 2)), rng.normal(5, 0.1, (20, 2))])
+
+        clustering = kmeans(X, 2, seed=0)
+
+        assert len(set(clustering.labels[:20])) == 1
+        assert len(set(clustering.labels[20:])) == 1
+        assert clustering.labels[0] != clustering.labels[20]
+        assert len(clustering.representatives) == 2
+
+    def test_k_capped_at_population_size(self):
+        """Test that asking for more clusters than points is safe"""
+        clustering = kmeans(np.zeros((3, 2)), 10, seed=0)
+        assert len(clustering.labels) == 3
+
+
+class TestFeatureMatrix:
+    """Test suite for persona feature encoding"""
+
+    def test_one_hot_demographics_and_votes(self):
+        """Test that categorical fields and topic votes are one-hot encoded"""
+        personas = [
+            make_persona("a", 0.1, "master_degree", beliefs={"housing": {"belief": "x", "vote": "Lina"}}),
+            make_persona("b", 0.9, "trade_school"),
+        ]
+        X = persona_feature_matrix(personas)
+
+        assert X.shape[0] == 2
+        assert not np.allclose(X[0], X[1])
+
+
+class TestPropagateBeliefs:
+    """Test suite for propagating representative beliefs to members"""
+
+    def test_copies_representative_beliefs(self):
+        """Test that a fully susceptible member adopts the representative's beliefs"""
+        representative = make_persona("rep", 0.5, "x", beliefs={"housing": {"belief": "b", "vote": "Lina"}, "overall_vote": "Lina"})
+        member = make_persona("m", 0.5, "x", susceptibility=1.0, beliefs={"housing": {"belief": "old", "vote": "Markus"}})
+
+        propagate_beliefs(representative, member, distance=1.0, max_distance=1.0, rng=random.Random(0))
+
+        assert member.beliefs == representative.beliefs
+        assert member.beliefs is not representative.beliefs
+
+    def test_stubborn_member_keeps_prior_topic(self):
+        """Test that a non-susceptible member may keep its own topic belief and re-derive its overall vote"""
+        representative = make_persona("rep", 0.5, "x", beliefs={"housing": {"belief": "b", "vote": "Lina"}, "overall_vote": "Lina"})
+        member = make_persona("m", 0.5, "x", susceptibility=0.0, beliefs={"housing": {"belief": "old", "vote": "Markus"}})
+
+        propagate_beliefs(representative, member, distance=1.0, max_distance=1.0, perturbation=1.0, rng=random.Random(0))
+
+        assert member.beliefs["housing"]["vote"] == "Markus"
+        assert member.beliefs["overall_vote"] == "Markus"
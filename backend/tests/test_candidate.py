@@ -0,0 +1,92 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import patch, AsyncMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.candidate import Candidate
+from src.mediator import Topic, Question, DebateTranscript, MediatorStatement
+
+
+TOPICS = [
+    Topic(id="t1", title="Healthcare", description="Universal healthcare"),
+    Topic(id="t2", title="Housing", description="Rent control"),
+    Topic(id="t3", title="Transport", description="Public transit"),
+]
+
+
+async def _echo_topic(client, prompt, system_instruction, **kwargs):
+    """Fake LLM: answer with the first topic title found in the prompt, after a short delay"""
+    await asyncio.sleep(0.05)
+    for topic in TOPICS:
+        if topic.title in prompt:
+            return f" Position on {topic.title} "
+    return " Reflection "
+
+
+class TestCandidateAsync:
+    """Test suite for the concurrent candidate LLM work"""
+
+    @patch('src.candidate.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_initialize_async_generates_all_topics_concurrently(self, mock_generate):
+        """Test that deferred initialization fills every topic, in topic order"""
+        mock_generate.side_effect = _echo_topic
+        candidate = Candidate("c1", "Alice", "Progressive", TOPICS, None, initialize=False)
+        assert candidate.state is None
+
+        loop = asyncio.new_event_loop()
+        start = loop.time()
+        loop.run_until_complete(candidate.initialize_async())
+        elapsed = loop.time() - start
+        loop.close()
+
+        assert mock_generate.call_count == 3
+        assert elapsed < 0.15  # three 50 ms calls overlapped
+        assert candidate.state.policy_positions == {
+            "t1": "Position on Healthcare",
+            "t2": "Position on Housing",
+            "t3": "Position on Transport",
+        }
+
+    @patch('src.candidate.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_read_social_media_signals_async(self, mock_generate):
+        """Test that per-topic updates and the reflection all run and are applied"""
+        mock_generate.side_effect = _echo_topic
+        candidate = Candidate("c1", "Alice", "Progressive", TOPICS[:2], None, initialize=False)
+        asyncio.run(candidate.initialize_async())
+        mock_generate.reset_mock()
+
+        asyncio.run(candidate.read_social_media_signals_async("Bob [1 👍 / 0 👎]: Lower rents now"))
+
+        assert mock_generate.call_count == 3  # two topics + one reflection
+        assert candidate.state.memory.endswith("Reflection\n")
+
+    @patch('src.candidate.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_read_empty_feed_async_makes_no_calls(self, mock_generate):
+        """Test that an empty feed is skipped"""
+        candidate = Candidate("c1", "Alice", "Progressive", [], None)
+
+        asyncio.run(candidate.read_social_media_signals_async(""))
+
+        mock_generate.assert_not_called()
+
+    @patch('src.candidate.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_reflect_on_debate_async(self, mock_generate):
+        """Test that the async reflection is appended to memory"""
+        mock_generate.return_value = " I held my ground. "
+        candidate = Candidate("c1", "Alice", "Progressive", [], None)
+        question = Question(id="t1_q1", text="Should rents be capped?", topic=TOPICS[1])
+        transcript = DebateTranscript(
+            statements=[MediatorStatement("m1", "Welcome", question)],
+            mediator_id="m1",
+            epoch=0,
+            topic_index=1,
+            question_index=0,
+            topic=TOPICS[1],
+            question=question
+        )
+
+        asyncio.run(candidate.reflect_on_debate_async(question, transcript))
+
+        assert "After debate on 'Should rents be capped?' (Housing)" in candidate.state.memory
+        assert candidate.state.memory.endswith("I held my ground.\n")
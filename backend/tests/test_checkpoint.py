@@ -0,0 +1,125 @@
+import json
+import random
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.game_engine import GameEngine
+from src.config import Config
+from src.candidate import Candidate, CandidateState
+from src.checkpoint import save_checkpoint, latest_checkpoint, checkpoint_path
+from src.mediator import Mediator, Topic
+from src.persona import Persona
+from src.social_media import SocialMedia
+
+
+TOPICS = [Topic(id="t1", title="Climate", description="Climate policy")]
+
+
+@pytest.fixture
+def llm():
+    with patch('src.game_engine.llm_client.create_client') as mock_create_client, \
+         patch.dict('os.environ', {'GEMINI_API_KEY': 'test_key'}):
+        mock_create_client.return_value = Mock()
+        yield mock_create_client
+
+
+@pytest.fixture
+def engine(llm, tmp_path):
+    engine = GameEngine(Config(population_size=2, questions_per_topic=1, turns_per_question=1,
+                               num_epochs=3, random_seed=42, post_retention_epochs=1))
+    engine.simulation_id = "run"
+    engine.initialize_simulation_output(base_dir=str(tmp_path))
+
+    engine.mediator = Mediator("m1", topics=list(TOPICS), llm_client_instance=engine.llm_client, world_story="Atlantis")
+    engine.mediator._remember("Social media review: rents are high\n")
+    candidate = Candidate("c1", "Alice", "Progressive", list(TOPICS), engine.llm_client, initialize=False)
+    candidate.state = CandidateState(id="c1", name="Alice", character="Progressive",
+                                     policy_positions={"t1": "Carbon tax"}, memory="")
+    candidate._remember("I held my ground.\n")
+    engine.candidates = [candidate]
+
+    for i in range(2):
+        persona = Persona(f"p{i}", {"name": f"Persona {i}"})
+        persona.beliefs = {"overall_vote": "Alice"}
+        persona.chats.append({"peer_id": f"p{1 - i}", "message": "hello"})
+        engine.population.personas.append(persona)
+
+    engine.social_media = SocialMedia()
+    engine.social_media.enable_retention(1, engine.simulation_dir / "post_archive.jsonl")
+    post_id = engine.social_media.add_post({"persona_id": "p0", "content": "Tax carbon"})
+    engine.social_media.add_reactions([(post_id, "p1", "thumbs_up")])
+    return engine
+
+
+class TestCheckpoint:
+    """Test suite for full-state checkpoints and resume"""
+
+    def test_round_trip_restores_state(self, engine, llm):
+        """Test that a resumed engine carries population, agents, platform and random state"""
+        engine.current_epoch = 0
+        engine.epochs_completed = 1
+        random.seed(7)
+        path = save_checkpoint(engine)
+        expected_draw = random.random()
+
+        assert path == checkpoint_path(engine.simulation_dir, 0) == latest_checkpoint(engine.simulation_dir)
+        restored = GameEngine.resume(engine.simulation_dir)
+
+        assert random.random() == expected_draw
+        assert restored.epochs_completed == 1
+        assert restored.population.personas[1].beliefs == {"overall_vote": "Alice"}
+        assert restored.population.personas[0].chats == engine.population.personas[0].chats
+        assert restored.candidates[0].state.memory == "I held my ground.\n"
+        assert restored.mediator.state.memory == engine.mediator.state.memory
+        assert restored.social_media.reaction_log.summary() == engine.social_media.reaction_log.summary()
+        assert [p.content for p in restored.social_media.posts] == ["Tax carbon"]
+
+        # Every agent got the fresh client
+        client = llm.return_value
+        assert restored.llm_client is client
+        assert restored.mediator.llm_client is client
+        assert restored.candidates[0].llm_client is client
+        assert all(persona.llm_client is client for persona in restored.population.personas)
+
+    def test_resume_drops_records_written_after_checkpoint(self, engine):
+        """Test that epochs.jsonl and the post archive are cut back to the checkpoint"""
+        engine.current_epoch = 0
+        engine.epochs_completed = 1
+        save_checkpoint(engine)
+
+        # Crash after epoch 1 was serialized but before its checkpoint
+        with open(engine.simulation_file, "w") as f:
+            f.write(json.dumps({"epoch": 0}) + "\n" + json.dumps({"epoch": 1}) + "\n")
+        engine.social_media.archive.append([({"id": "late", "persona_id": "p0", "content": "late"}, [])])
+
+        restored = GameEngine.resume(engine.simulation_dir)
+
+        with open(engine.simulation_file) as f:
+            assert [json.loads(line)["epoch"] for line in f] == [0]
+        assert "late" not in restored.social_media.archive
+        assert not (engine.simulation_dir / "post_archive.jsonl").read_text()
+
+    def test_resumed_run_continues_with_next_epoch(self, engine):
+        """Test that run() checkpoints every epoch and a resumed run skips completed epochs"""
+        epochs = []
+        with patch.object(GameEngine, '_run_epoch', lambda self: epochs.append(self.current_epoch)), \
+             patch.object(GameEngine, '_serialize_epoch_state'):
+            engine.config.num_epochs = 2
+            engine.run()
+            assert latest_checkpoint(engine.simulation_dir) == checkpoint_path(engine.simulation_dir, 1)
+
+            restored = GameEngine.resume(engine.simulation_dir)
+            restored.config.num_epochs = 3
+            restored.run()
+
+        assert epochs == [0, 1, 2]
+        assert latest_checkpoint(engine.simulation_dir) == checkpoint_path(engine.simulation_dir, 2)
+
+    def test_resume_without_checkpoint(self, tmp_path):
+        """Test that resuming an empty directory fails clearly"""
+        with pytest.raises(FileNotFoundError):
+            GameEngine.resume(tmp_path)
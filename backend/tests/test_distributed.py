@@ -0,0 +1,204 @@
+import time
+import random
+import threading
+import multiprocessing
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import Config
+from src.game_engine import GameEngine
+from src.population import Population
+from src.distributed import Coordinator, DistributedPopulation, WorkerLost, WorkerPool, run_worker, serve
+from src.transport import ChannelClosed, InProcessTransport, QueueChannel, TcpTransport
+from tests.test_population_shards import TRANSCRIPT, llm, populate, run_epoch  # noqa: F401 (llm is a fixture)
+
+
+AUTHKEY = b"test-cluster-key"
+
+
+class FlakyChannel(QueueChannel):
+    """Worker end of an in-process channel that drops the connection on its n-th command."""
+
+    def __init__(self, channel: QueueChannel, fail_on: int):
+        super().__init__(channel._inbox, channel._outbox)
+        self.commands_left = fail_on
+
+    def recv(self, timeout=None):
+        message = super().recv(timeout)
+        self.commands_left -= 1
+        if self.commands_left == 0:
+            self.close()
+            raise ChannelClosed("simulated crash")
+        return message
+
+
+def start_worker(transport, worker_id, fail_on=None):
+    channel = transport.connect("coordinator")
+    if fail_on is not None:
+        channel = FlakyChannel(channel, fail_on)
+    thread = threading.Thread(target=serve, args=(channel, worker_id, 0.05), daemon=True)
+    thread.start()
+    return thread
+
+
+def run_population_epoch(engine):
+    """Stand-in for GameEngine._run_epoch exercising the population only."""
+    engine.population.consume_debate_content(TRANSCRIPT)
+    engine.population.update_beliefs_from_debate()
+    engine.population.chat_with_peers(num_rounds_mean=2, num_rounds_variance=1)
+    engine.population.update_beliefs_from_chat()
+
+
+@pytest.fixture
+def in_process_pool():
+    transport = InProcessTransport()
+    pool = WorkerPool(transport.listen("coordinator"), heartbeat_timeout=2.0)
+    yield transport, pool
+    pool.stop()
+
+
+class TestTransport:
+    """Test suite for the coordinator/worker transports"""
+
+    def test_in_process_channels(self):
+        transport = InProcessTransport()
+        listener = transport.listen("coordinator")
+        worker_end = transport.connect("coordinator")
+        coordinator_end = listener.accept(timeout=1)
+
+        worker_end.send(("hello", "w1"))
+        assert coordinator_end.recv(timeout=1) == ("hello", "w1")
+        with pytest.raises(TimeoutError):
+            coordinator_end.recv(timeout=0.01)
+        worker_end.close()
+        with pytest.raises(ChannelClosed):
+            coordinator_end.recv(timeout=1)
+
+    def test_tcp_rejects_wrong_key(self):
+        """Test that a worker without the shared key never joins the pool"""
+        pool = WorkerPool(TcpTransport(AUTHKEY).listen(("127.0.0.1", 0)))
+        try:
+            with pytest.raises(Exception):
+                TcpTransport(b"wrong key").connect(pool.listener.address)
+            time.sleep(0.2)
+            assert pool.live_workers() == []
+        finally:
+            pool.stop()
+
+
+class TestDistributedPopulation:
+    """Test suite for populations hosted by remote workers"""
+
+    def test_worker_processes_over_tcp_match_single_process(self, llm):
+        """Test one box with several worker processes: same results as a single process for the same seed"""
+        expected = run_epoch(populate(Population()))
+
+        pool = WorkerPool(TcpTransport(AUTHKEY).listen(("127.0.0.1", 0)))
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(TcpTransport(AUTHKEY), pool.listener.address, f"w{i}", 0.1), daemon=True)
+            for i in range(3)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            pool.wait_for_workers(3, timeout=20)
+            population = populate(DistributedPopulation(pool))
+            actual = run_epoch(population)
+            population.close()
+        finally:
+            pool.stop()
+            for process in processes:
+                process.join(timeout=10)
+
+        assert population.num_shards == 3
+        assert actual == expected
+        assert all(process.exitcode == 0 for process in processes)
+
+    def test_disconnected_worker_raises_worker_lost(self, llm, in_process_pool):
+        transport, pool = in_process_pool
+        start_worker(transport, "steady")
+        start_worker(transport, "flaky", fail_on=2)
+        pool.wait_for_workers(2, timeout=5)
+
+        population = populate(DistributedPopulation(pool), size=4)
+        with pytest.raises(WorkerLost, match="flaky"):
+            population.consume_debate_content(TRANSCRIPT)  # load succeeds, this command is dropped
+        assert [worker.id for worker in pool.live_workers()] == ["steady"]
+
+    def test_silent_worker_detected_by_heartbeat(self, llm):
+        """Test that a worker that stays connected but stops heartbeating counts as lost"""
+        transport = InProcessTransport()
+        pool = WorkerPool(transport.listen("coordinator"), heartbeat_timeout=0.3)
+        hung = transport.connect("coordinator")
+        hung.send(("hello", "hung"))  # ...and never anything else
+        try:
+            pool.wait_for_workers(1, timeout=5)
+            population = populate(DistributedPopulation(pool), size=2)
+            with pytest.raises(WorkerLost, match="no heartbeat"):
+                population.consume_debate_content(TRANSCRIPT)
+        finally:
+            pool.stop()
+
+
+class TestCoordinator:
+    """Test suite for running a simulation on workers"""
+
+    def make_engine(self, tmp_path, name):
+        with patch('src.game_engine.llm_client.create_client'):
+            engine = GameEngine(Config(population_size=6, questions_per_topic=1, turns_per_question=1, num_epochs=3, random_seed=5))
+        engine.simulation_id = name
+        engine.initialize_simulation_output(str(tmp_path))
+        populate(engine.population, size=6)
+        return engine
+
+    def test_recovers_from_lost_worker(self, llm, tmp_path, in_process_pool):
+        """Test that losing a worker mid-run repeats the epoch on the others with identical results"""
+        with patch.object(GameEngine, '_run_epoch', run_population_epoch), \
+             patch.object(GameEngine, '_serialize_epoch_state'):
+            random.seed(5)
+            reference = self.make_engine(tmp_path, "reference")
+            reference.run()
+
+            transport, pool = in_process_pool
+            start_worker(transport, "w1")
+            start_worker(transport, "w2")
+            start_worker(transport, "flaky", fail_on=12)  # Dies during epoch 1
+            pool.wait_for_workers(3, timeout=5)
+
+            random.seed(5)
+            coordinator = Coordinator(self.make_engine(tmp_path, "distributed"), pool, min_workers=2, worker_wait=5)
+            coordinator.run()
+
+        engine = coordinator.engine
+        assert coordinator.recoveries == 1
+        assert engine.epochs_completed == 3
+        assert engine.population.num_shards == 2
+        assert [persona.beliefs for persona in engine.population.personas] == \
+            [persona.beliefs for persona in reference.population.personas]
+        assert [persona.chats for persona in engine.population.personas] == \
+            [persona.chats for persona in reference.population.personas]
+        assert (tmp_path / "distributed" / "checkpoints" / "setup.pkl.gz").exists()
+
+    def test_gives_up_after_max_recoveries(self, llm, tmp_path, in_process_pool):
+        with patch.object(GameEngine, '_run_epoch', run_population_epoch), \
+             patch.object(GameEngine, '_serialize_epoch_state'):
+            transport, pool = in_process_pool
+            start_worker(transport, "w1")
+            start_worker(transport, "flaky", fail_on=3)
+            pool.wait_for_workers(2, timeout=5)
+
+            coordinator = Coordinator(self.make_engine(tmp_path, "distributed"), pool, max_recoveries=0)
+            with pytest.raises(WorkerLost):
+                coordinator.run()
+
+    def test_rejects_archetypes(self, in_process_pool):
+        _, pool = in_process_pool
+        config = Config(population_size=2, questions_per_topic=1, turns_per_question=1, num_epochs=1, random_seed=1,
+                        archetypes={"num_archetypes": 2})
+        engine = Mock(config=config)
+        with pytest.raises(ValueError, match="archetypes"):
+            Coordinator(engine, pool)
@@ -0,0 +1,181 @@
+import json
+import sys
+import asyncio
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src import llm_client
+from src.config import Config
+from src.checkpoint import save_checkpoint, load_checkpoint
+from src.game_engine import GameEngine
+from src.experiment_runner import ExperimentRunner, find_configs
+from src.rate_budget import RateBudget
+from src.response_cache import ResponseCache
+
+
+CONFIG = "population_size: 0\nquestions_per_topic: 1\nturns_per_question: 1\nnum_epochs: 2\nrandom_seed: {seed}\n"
+
+
+def fake_engine_factory(config, config_path):
+    """Engine without agents; fails once for configs that have a '<stem>.fail' marker next to them."""
+    marker = Path(config_path).with_suffix(".fail")
+    if marker.exists():
+        marker.unlink()
+        raise RuntimeError("LLM quota exceeded")
+    return GameEngine(config, config_path=config_path)
+
+
+@pytest.fixture
+def simulation(tmp_path):
+    with patch('src.game_engine.llm_client.create_client') as mock_create_client, \
+         patch.dict('os.environ', {'GEMINI_API_KEY': 'test_key'}), \
+         patch.object(GameEngine, '_run_epoch'), \
+         patch.object(GameEngine, '_serialize_epoch_state'):
+        mock_create_client.return_value = Mock()
+        for name, seed in [("baseline", 42), ("berlin", 7)]:
+            (tmp_path / f"{name}.yaml").write_text(CONFIG.format(seed=seed))
+        yield tmp_path
+
+
+class TestResponseCache:
+    """Test suite for the shared LLM response cache"""
+
+    def test_occurrences_and_namespaces(self, tmp_path):
+        """Test that repeated requests and other namespaces get their own entries"""
+        cache = ResponseCache(tmp_path / "cache.sqlite", namespace="replicate-1")
+        request = ("model", "system", "prompt", 1.0, 100)
+        first, second = cache.key(*request), cache.key(*request)
+        assert first != second
+        cache.put(first, "response one")
+
+        replay = ResponseCache(tmp_path / "cache.sqlite", namespace="replicate-1")
+        assert replay.get(replay.key(*request)) == "response one"
+        assert replay.get(replay.key(*request)) is None
+        other = ResponseCache(tmp_path / "cache.sqlite", namespace="replicate-2")
+        assert other.get(other.key(*request)) is None
+        assert replay.stats() == {"hits": 1, "misses": 1}
+
+    def test_resumed_run_continues_occurrences(self, simulation):
+        """Test that a run resumed from a checkpoint does not replay responses of earlier epochs"""
+        request = ("model", "system", "prompt", 1.0, 100)
+        engine = GameEngine(Config.from_yaml(str(simulation / "baseline.yaml")))
+        engine.initialize_simulation_output(str(simulation / "out"))
+        try:
+            first_attempt = ResponseCache(simulation / "cache.sqlite")
+            llm_client.configure_sharing(first_attempt)
+            epoch_0 = first_attempt.key(*request)
+            path = save_checkpoint(engine)
+            epoch_1 = first_attempt.key(*request)  # Sent after the checkpoint, then the run crashed
+
+            retry = ResponseCache(simulation / "cache.sqlite")
+            llm_client.configure_sharing(retry)
+            load_checkpoint(path)
+            assert retry.key(*request) == epoch_1 != epoch_0
+        finally:
+            llm_client.configure_sharing()
+
+    def test_usable_from_worker_threads(self, tmp_path):
+        """Test that the cache serves calls from other threads (LLM calls under asyncio.to_thread)"""
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        key = cache.key("model", "system", "prompt", 1.0, 100)
+        cache.put(key, "main thread")
+
+        async def from_threads():
+            other = await asyncio.to_thread(cache.key, "model", "system", "prompt", 1.0, 100)
+            await asyncio.to_thread(cache.put, other, "worker thread")
+            return await asyncio.gather(asyncio.to_thread(cache.get, key), asyncio.to_thread(cache.get, other))
+
+        assert asyncio.run(from_threads()) == ["main thread", "worker thread"]
+
+    def test_generate_response_replays_cached_responses(self, tmp_path):
+        """Test that llm_client answers a replayed request from the cache without calling the model"""
+        client = Mock()
+        client.GenerativeModel.return_value.generate_content.return_value.text = "Fresh answer"
+        try:
+            llm_client.configure_sharing(ResponseCache(tmp_path / "cache.sqlite"))
+            assert llm_client.generate_response(client, "prompt", "system") == "Fresh answer"
+            llm_client.configure_sharing(ResponseCache(tmp_path / "cache.sqlite"))
+            assert llm_client.generate_response(client, "prompt", "system") == "Fresh answer"
+        finally:
+            llm_client.configure_sharing()
+
+        assert client.GenerativeModel.return_value.generate_content.call_count == 1
+
+
+class TestRateBudget:
+    """Test suite for the global request budget"""
+
+    def test_slots_are_spaced_by_interval(self):
+        """Test that back-to-back reservations wait for consecutive slots"""
+        budget = RateBudget(requests_per_minute=60)
+        delays = [budget.reserve() for _ in range(3)]
+
+        assert delays[0] == pytest.approx(0, abs=0.05)
+        assert delays[1] == pytest.approx(1, abs=0.05)
+        assert delays[2] == pytest.approx(2, abs=0.05)
+        assert budget.stats()["requests"] == 3
+
+    def test_invalid_budget(self):
+        with pytest.raises(ValueError):
+            RateBudget(requests_per_minute=0)
+
+
+class TestExperimentRunner:
+    """Test suite for multi-run experiments"""
+
+    def test_find_configs(self, simulation):
+        """Test resolving directories and globs to config files"""
+        assert find_configs([str(simulation)]) == [simulation / "baseline.yaml", simulation / "berlin.yaml"]
+        assert find_configs([str(simulation / "b*.yaml"), str(simulation / "baseline.yaml")]) == \
+            [simulation / "baseline.yaml", simulation / "berlin.yaml"]
+        with pytest.raises(FileNotFoundError):
+            find_configs([str(simulation / "missing_*.yaml")])
+
+    def test_replicates_are_seeded_and_indexed(self, simulation):
+        """Test that every replicate gets its own directory, seed and index entry"""
+        runner = ExperimentRunner(find_configs([str(simulation)]), fake_engine_factory, replicates=2,
+                                  base_dir=str(simulation / "out"), experiment_id="exp", processes=0)
+        index = runner.run()
+
+        assert [run["simulation_id"] for run in index["runs"]] == ["baseline_1", "baseline_2", "berlin_1", "berlin_2"]
+        assert [run["random_seed"] for run in index["runs"]] == [42, 43, 7, 8]
+        assert index["completed"] == 4 and index["failed"] == 0
+        for run in index["runs"]:
+            assert run["epochs_completed"] == 2
+            assert (Path(run["simulation_dir"]) / "checkpoints" / "epoch_0001.pkl.gz").exists()
+        assert json.loads((simulation / "out" / "exp" / "index.json").read_text())["completed"] == 4
+
+    def test_failed_run_is_retried(self, simulation):
+        """Test that a failing run is attempted again and the others are unaffected"""
+        (simulation / "berlin.fail").touch()
+        runner = ExperimentRunner([simulation / "baseline.yaml", simulation / "berlin.yaml"], fake_engine_factory,
+                                  base_dir=str(simulation / "out"), experiment_id="exp", processes=0, max_retries=1)
+        index = runner.run()
+
+        runs = {run["simulation_id"]: run for run in index["runs"]}
+        assert runs["baseline_1"]["attempts"] == 1
+        assert runs["berlin_1"]["attempts"] == 2 and runs["berlin_1"]["status"] == "completed"
+
+    def test_exhausted_retries_are_reported(self, simulation):
+        """Test that a run failing on every attempt is marked failed in the index"""
+        (simulation / "berlin.fail").touch()
+        runner = ExperimentRunner([simulation / "berlin.yaml"], fake_engine_factory,
+                                  base_dir=str(simulation / "out"), experiment_id="exp", processes=0, max_retries=0)
+        index = runner.run()
+
+        assert index["failed"] == 1
+        assert index["runs"][0]["error"] == "RuntimeError: LLM quota exceeded"
+
+    def test_process_pool(self, simulation):
+        """Test running replicates in worker processes under a shared rate budget"""
+        runner = ExperimentRunner(find_configs([str(simulation)]), fake_engine_factory, replicates=2,
+                                  base_dir=str(simulation / "out"), experiment_id="exp", processes=2,
+                                  requests_per_minute=6000)
+        index = runner.run()
+
+        assert index["completed"] == 4
+        assert sorted(run["random_seed"] for run in index["runs"]) == [7, 8, 42, 43]
+        assert all(Path(run["simulation_dir"], "metadata.json").exists() for run in index["runs"])
@@ -0,0 +1,104 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch, AsyncMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.feed_digest import FeedSummarizer, FeedDigest
+from src.mediator import Topic
+
+
+TOPICS = [
+    Topic(id="t1", title="Healthcare", description="Universal healthcare"),
+    Topic(id="t2", title="Housing", description="Rent control"),
+]
+
+
+class TestFeedSummarizer:
+    """Test suite for map-reduce feed summarization"""
+
+    def test_merge_sums_counts_and_ranks_themes(self):
+        """Test the reduce step over chunk classifications"""
+        summarizer = FeedSummarizer(None, TOPICS, max_themes=2)
+        chunk_results = [
+            {"topics": {"t1": {"positive": 2, "negative": 1, "neutral": 0, "themes": ["Premiums", "waiting lists"]}}, "off_topic": 1},
+            {"topics": {"t1": {"positive": 1, "negative": 0, "neutral": 1, "themes": ["premiums"]},
+                        "unknown": {"positive": 9}}, "off_topic": 0},
+            None,
+        ]
+
+        digest = summarizer.merge(chunk_results, total_posts=7, epoch=3)
+
+        assert digest.epoch == 3
+        assert digest.failed_chunks == 1
+        assert digest.off_topic == 1
+        healthcare = digest.topics["t1"]
+        assert (healthcare.positive, healthcare.negative, healthcare.neutral) == (3, 1, 1)
+        assert healthcare.themes == ["Premiums", "waiting lists"]
+        assert digest.topics["t2"].mentions == 0
+        assert "Housing: not discussed" in digest.to_text()
+
+    @patch('src.feed_digest.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_summarize_chunks_posts_in_parallel(self, mock_generate):
+        """Test that posts are split into chunks with one LLM call each"""
+        mock_generate.return_value = "```json\n" + json.dumps(
+            {"topics": {"t2": {"positive": 0, "negative": 2, "neutral": 0, "themes": ["rents"]}}, "off_topic": 0}
+        ) + "\n```"
+        summarizer = FeedSummarizer(None, TOPICS, chunk_size=2)
+
+        digest = summarizer.summarize([f"persona_{i} [0 👍 / 0 👎]: post {i}" for i in range(5)])
+
+        assert mock_generate.call_count == 3
+        assert digest.total_posts == 5
+        assert digest.topics["t2"].negative == 6
+        assert digest.topic_text("t2") == "Housing: 6 posts (0 positive, 6 negative, 0 neutral). Themes: rents"
+
+    @patch('src.feed_digest.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_malformed_chunk_is_skipped(self, mock_generate):
+        """Test that an unparseable chunk response does not fail the digest"""
+        mock_generate.return_value = "not json"
+        summarizer = FeedSummarizer(None, TOPICS)
+
+        digest = summarizer.summarize(["a post"])
+
+        assert isinstance(digest, FeedDigest)
+        assert digest.failed_chunks == 1
+        assert digest.topics["t1"].mentions == 0
+
+    def test_merge_skips_malformed_chunk_results(self):
+        """Test that chunks with non-numeric counts or a non-object topics value count as failed"""
+        summarizer = FeedSummarizer(None, TOPICS)
+        good = {"topics": {"t1": {"positive": 1, "negative": 0, "neutral": 0}}, "off_topic": 0}
+        chunk_results = [
+            {"topics": {"t1": {"positive": "2 posts"}}},
+            {"off_topic": "none"},
+            {"topics": ["t1"]},
+            {"topics": {"t1": {"positive": 3, "themes": "rents"}}},
+            {"topics": {"t1": {"positive": 5, "negative": -1}}},
+            "[]",
+            good,
+        ]
+
+        digest = summarizer.merge(chunk_results, total_posts=7)
+
+        assert digest.failed_chunks == 6
+        assert digest.topics["t1"].positive == 1
+        assert digest.off_topic == 0
+
+    @patch('src.feed_digest.llm_client.generate_response_async', new_callable=AsyncMock)
+    def test_malformed_counts_from_llm_do_not_fail_the_digest(self, mock_generate):
+        """Test that parseable but malformed chunk output is counted as failed"""
+        mock_generate.return_value = json.dumps({"topics": {"t1": {"positive": "a few"}}, "off_topic": 0})
+        summarizer = FeedSummarizer(None, TOPICS)
+
+        digest = summarizer.summarize(["a post"])
+
+        assert digest.failed_chunks == 1
+        assert digest.topics["t1"].mentions == 0
+
+    def test_summarize_no_posts(self):
+        """Test that an empty feed makes no LLM calls"""
+        digest = FeedSummarizer(None, TOPICS).summarize([])
+
+        assert digest.total_posts == 0
+        assert digest.failed_chunks == 0
@@ -0,0 +1,142 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.game_engine import GameEngine
+from src.config import Config
+from src.candidate import Candidate, CandidateState
+from src.checkpoint import latest_checkpoint, checkpoint_path
+from src.mediator import Mediator, Topic
+from src.persona import Persona
+from src.social_media import SocialMedia
+
+
+TOPICS = [Topic(id="t1", title="Climate", description="Climate policy")]
+
+
+@pytest.fixture
+def llm():
+    with patch('src.game_engine.llm_client.create_client') as mock_create_client, \
+         patch.dict('os.environ', {'GEMINI_API_KEY': 'test_key'}):
+        mock_create_client.return_value = Mock()
+        yield mock_create_client
+
+
+@pytest.fixture
+def parent(llm, tmp_path):
+    """A parent run with checkpoints after epochs 0 and 1."""
+    engine = GameEngine(Config(population_size=4, questions_per_topic=1, turns_per_question=1,
+                               num_epochs=2, random_seed=42, post_retention_epochs=1,
+                               candidates=[{"id": "c1", "name": "Alice", "description": "Progressive"}]))
+    engine.simulation_id = "parent"
+    engine.initialize_simulation_output(base_dir=str(tmp_path))
+
+    engine.mediator = Mediator("m1", topics=list(TOPICS), llm_client_instance=engine.llm_client)
+    candidate = Candidate("c1", "Alice", "Progressive", list(TOPICS), engine.llm_client, initialize=False)
+    candidate.state = CandidateState(id="c1", name="Alice", character="Progressive",
+                                     policy_positions={"t1": "Carbon tax"}, memory="")
+    engine.candidates = [candidate]
+    for i in range(4):
+        engine.population.personas.append(Persona(f"p{i}", {"id": f"p{i}", "name": f"Persona {i}"}))
+
+    engine.social_media = SocialMedia()
+    engine.social_media.enable_retention(1, engine.simulation_dir / "post_archive.jsonl")
+
+    def run_epoch(self):
+        self.social_media.archive.append([({"id": f"post_e{self.current_epoch}", "persona_id": "p0",
+                                            "content": "archived"}, [])])
+
+    def serialize_epoch(self, *args, **kwargs):
+        with open(self.simulation_file, "a") as f:
+            f.write(json.dumps({"epoch": self.current_epoch}) + "\n")
+
+    with patch.object(GameEngine, '_run_epoch', run_epoch), \
+         patch.object(GameEngine, '_serialize_epoch_state', serialize_epoch):
+        engine.run()
+    return engine
+
+
+class TestFork:
+    """Test suite for forking a simulation from a checkpoint"""
+
+    def test_fork_inherits_history_up_to_epoch(self, parent, tmp_path):
+        """Test that the fork gets the parent's records and archive up to the fork epoch only"""
+        fork = GameEngine.fork(parent.simulation_dir, 0, base_dir=str(tmp_path), simulation_id="child")
+
+        assert fork.simulation_dir == tmp_path / "child"
+        assert fork.epochs_completed == 1
+        with open(fork.simulation_file) as f:
+            assert [json.loads(line)["epoch"] for line in f] == [0]
+        assert fork.social_media.archive.path == fork.simulation_dir / "post_archive.jsonl"
+        assert "post_e0" in fork.social_media.archive and "post_e1" not in fork.social_media.archive
+        assert len((fork.simulation_dir / "post_archive.jsonl").read_text().splitlines()) == 1
+
+        metadata = json.loads((fork.simulation_dir / "metadata.json").read_text())
+        assert metadata["simulation_id"] == "child"
+        assert metadata["parent"] == {"simulation_id": "parent", "simulation_dir": str(parent.simulation_dir),
+                                      "epoch": 0, "overrides": {}}
+
+    def test_forked_run_leaves_parent_untouched(self, parent, tmp_path):
+        """Test that the fork continues with the next epoch and writes only to its own directory"""
+        parent_epochs = parent.simulation_file.read_text()
+        parent_archive = (parent.simulation_dir / "post_archive.jsonl").read_text()
+        parent_checkpoints = sorted((parent.simulation_dir / "checkpoints").iterdir())
+
+        fork = GameEngine.fork(parent.simulation_dir, 0, {"num_epochs": 3}, base_dir=str(tmp_path), simulation_id="child")
+        epochs = []
+        with patch.object(GameEngine, '_run_epoch', lambda self: epochs.append(self.current_epoch)), \
+             patch.object(GameEngine, '_serialize_epoch_state'):
+            fork.run()
+
+        assert epochs == [1, 2]
+        assert latest_checkpoint(fork.simulation_dir) == checkpoint_path(fork.simulation_dir, 2)
+        assert parent.simulation_file.read_text() == parent_epochs
+        assert (parent.simulation_dir / "post_archive.jsonl").read_text() == parent_archive
+        assert sorted((parent.simulation_dir / "checkpoints").iterdir()) == parent_checkpoints
+
+    def test_overrides_are_applied(self, parent, tmp_path):
+        """Test config overrides, candidate changes and retention changes"""
+        overrides = {
+            "max_change_percentage": 0.2,
+            "post_retention_epochs": 3,
+            "candidates": [{"id": "c1", "name": "Alice", "description": "Centrist"},
+                           {"id": "c2", "name": "Bob", "description": "Conservative"}]
+        }
+        with patch('src.candidate.llm_client.generate_response_async', return_value="Lower taxes"):
+            fork = GameEngine.fork(parent.simulation_dir, 1, overrides, base_dir=str(tmp_path), simulation_id="child")
+
+        assert fork.config.max_change_percentage == 0.2
+        assert fork.social_media.retention_epochs == 3
+        alice, bob = fork.candidates
+        assert alice.state.policy_positions == {"t1": "Carbon tax"}
+        assert alice.character == alice.state.character == "Centrist"
+        assert bob.state.policy_positions == {"t1": "Lower taxes"}
+        assert json.loads((fork.simulation_dir / "metadata.json").read_text())["parent"]["overrides"] == overrides
+
+    def test_unknown_override_is_rejected(self, parent, tmp_path):
+        """Test that a misspelled config field fails the fork"""
+        with pytest.raises(ValueError, match="num_epoch"):
+            GameEngine.fork(parent.simulation_dir, 0, {"num_epoch": 5}, base_dir=str(tmp_path), simulation_id="child")
+
+    def test_missing_epoch_is_rejected(self, parent, tmp_path):
+        """Test that forking from an epoch without checkpoint fails clearly"""
+        with pytest.raises(FileNotFoundError):
+            GameEngine.fork(parent.simulation_dir, 5, base_dir=str(tmp_path))
+
+    def test_population_mixture_replaces_fraction(self, parent, tmp_path):
+        """Test that a mixture override swaps in personas from another population file"""
+        incoming = tmp_path / "incoming.jsonl"
+        incoming.write_text("".join(json.dumps({"id": f"n{i}", "name": f"New {i}"}) + "\n" for i in range(5)))
+
+        fork = GameEngine.fork(parent.simulation_dir, 1,
+                               {"population_mixture": {"population_file": str(incoming), "fraction": 0.5, "seed": 1}},
+                               base_dir=str(tmp_path), simulation_id="child")
+
+        ids = [persona.id for persona in fork.population.personas]
+        assert len(ids) == 4
+        assert sum(persona_id.startswith("n") for persona_id in ids) == 2
+        assert all(not persona.chats for persona in fork.population.personas if persona.id.startswith("n"))
@@ -1,5 +1,8 @@
+import json
 import pytest
 import sys
+import time
+import asyncio
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
@@ -7,7 +10,9 @@ from unittest.mock import Mock, patch, MagicMock
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.game_engine import GameEngine
 from src.config import Config
-from src.mediator import Topic, DebateTranscript, CandidateStatement, MediatorStatement
+from src.mediator import Mediator, Topic, DebateTranscript, CandidateStatement, MediatorStatement
+from src.candidate import Candidate, CandidateState
+from tests.test_population_shards import llm, populate  # noqa: F401 (llm is a fixture)
 
 
 class TestGameEngine:
@@ -176,3 +181,196 @@ class TestGameEngine:
         assert len(engine.debate_transcripts) == 2
         assert engine.debate_transcripts[0] == transcript1
         assert engine.debate_transcripts[1] == transcript2
+
+
+class TestParallelTopics:
+    """Test suite for debating topics concurrently"""
+
+    TOPICS = [
+        Topic(id="t1", title="Climate", description="Climate policy"),
+        Topic(id="t2", title="Housing", description="Rent control"),
+    ]
+
+    @staticmethod
+    def _fake_llm(client, prompt, system_instruction, **kwargs):
+        time.sleep(0.02)
+        topic = "Climate" if "Climate" in prompt else "Housing"
+        return f"{topic} reply"
+
+    @staticmethod
+    async def _fake_llm_async(client, prompt, system_instruction, **kwargs):
+        await asyncio.sleep(0.02)
+        return "Climate reflection" if '(Climate)' in prompt or "topic: Climate" in prompt else "Housing reflection"
+
+    @pytest.fixture
+    def engine(self):
+        return self.make_engine()
+
+    def make_engine(self, **overrides):
+        with patch('src.game_engine.llm_client.create_client'), patch.dict('os.environ', {'GEMINI_API_KEY': 'test_key'}):
+            engine = GameEngine(Config(
+                population_size=0,
+                questions_per_topic=2,
+                turns_per_question=1,
+                num_epochs=1,
+                random_seed=42,
+                parallel_topics=True,
+                **overrides
+            ))
+        engine.mediator = Mediator("m1", topics=list(self.TOPICS), llm_client_instance=Mock())
+        engine.candidates = [
+            Candidate(f"c{i}", f"Candidate {i}", "Centrist", list(self.TOPICS), Mock(), initialize=False)
+            for i in range(2)
+        ]
+        for candidate in engine.candidates:
+            candidate.state = CandidateState(
+                id=candidate.id, name=candidate.name, character="Centrist",
+                policy_positions={"t1": "For", "t2": "Against"}, memory=""
+            )
+        return engine
+
+    def test_parallel_debates_merge_in_topic_order(self, engine):
+        """Test that transcripts and reflections land in topic order regardless of completion order"""
+        with patch('src.mediator.llm_client.generate_response', side_effect=self._fake_llm), \
+             patch('src.candidate.llm_client.generate_response', side_effect=self._fake_llm), \
+             patch('src.candidate.llm_client.generate_response_async', side_effect=self._fake_llm_async):
+            start = time.perf_counter()
+            engine._conduct_debates_in_parallel()
+            parallel_time = time.perf_counter() - start
+
+        assert [(t.topic_index, t.question_index) for t in engine.debate_transcripts] == [(0, 0), (0, 1), (1, 0), (1, 1)]
+        for candidate in engine.candidates:
+            memory = candidate.state.memory
+            assert memory.count("--- After debate on") == 4
+            assert memory.index("(Climate) ---") < memory.index("(Housing) ---")
+            assert candidate.state.policy_positions == {"t1": "For", "t2": "Against"}
+
+        # Each topic chains 2 questions x (propose + introduce + 2 statements) = 8 calls of 20 ms;
+        # sequential topics would need at least twice that
+        assert parallel_time < 2 * 8 * 0.02
+
+    @pytest.mark.parametrize("key_term,plan_calls", [(None, 2), ("zoning", 4)])
+    def test_planned_questions_replan_only_on_divergence(self, engine, key_term, plan_calls):
+        """Test that planned questions replace propose/introduce calls and re-plan when answers drift"""
+        engine.config.question_planning = {"divergence_threshold": 0.5}
+        prompts = []
+
+        def fake_llm(client, prompt, system_instruction, **kwargs):
+            # Mediator and candidates share the llm_client module, so one fake serves both
+            if "Plan the next" not in prompt:
+                return self._fake_llm(client, prompt, system_instruction)
+            prompts.append(prompt)
+            count = int(prompt.split("Plan the next ")[1].split()[0])
+            # Candidates answer "<topic> reply", so the topic title is a term they cover
+            term = key_term or ("Climate" if "Climate" in prompt else "Housing")
+            return json.dumps([
+                {"question": f"Planned question {i}?", "introduction": "Planned intro", "key_terms": [term]}
+                for i in range(count)
+            ])
+
+        with patch('src.mediator.llm_client.generate_response', side_effect=fake_llm), \
+             patch('src.candidate.llm_client.generate_response_async', side_effect=self._fake_llm_async):
+            engine._plan_questions()
+            engine._conduct_debates_in_parallel()
+
+        assert len(prompts) == plan_calls
+        assert [t.question.id for t in engine.debate_transcripts] == ["t1_q1", "t1_q2", "t2_q1", "t2_q2"]
+        assert all(t.statements[0].statement == "Planned intro" for t in engine.debate_transcripts)
+
+    def test_simultaneous_protocol_with_rebuttal(self, engine):
+        """Test that candidates answer each turn concurrently and a rebuttal turn follows"""
+        engine.config.debate_protocol = "simultaneous"
+        engine.config.rebuttal_turn = True
+        engine.config.turns_per_question = 2
+        prompts = []
+
+        async def fake_llm_async(client, prompt, system_instruction, **kwargs):
+            prompts.append(prompt)
+            return await self._fake_llm_async(client, prompt, system_instruction)
+
+        with patch('src.mediator.llm_client.generate_response', side_effect=self._fake_llm), \
+             patch('src.candidate.llm_client.generate_response_async', side_effect=fake_llm_async):
+            engine._conduct_debate_on_topic(0)
+
+        transcript = engine.debate_transcripts[0]
+        # Introduction, 2 turns x 2 candidates, 2 rebuttals
+        assert len(transcript.statements) == 7
+        assert [s.candidate_id for s in transcript.statements[1:]] == ["c0", "c1"] * 3
+        # Within the first turn neither candidate saw the other's answer
+        assert "OPPONENT" not in prompts[0] and "OPPONENT" not in prompts[1]
+        assert sum("REBUTTAL ROUND" in prompt for prompt in prompts) == 4  # 2 questions x 2 candidates
+
+    def test_unknown_debate_protocol(self):
+        """Test that an unknown protocol is rejected"""
+        with pytest.raises(ValueError, match="debate_protocol"):
+            GameEngine(Config(population_size=0, questions_per_topic=1, turns_per_question=1,
+                              num_epochs=1, random_seed=42, debate_protocol="roundtable"))
+
+    @pytest.mark.parametrize("ordering", ["deterministic", "arrival"])
+    def test_pipelined_population_consumes_every_transcript(self, engine, ordering):
+        """Test that the population processes each transcript while debates continue"""
+        engine.config.pipeline_debates = True
+        engine.config.pipeline_ordering = ordering
+        engine.config.pipeline_belief_updates = "per_transcript"
+        consumed = []
+
+        async def fake_update(**kwargs):
+            await asyncio.sleep(0.01)
+
+        engine.population = Mock()
+        engine.population.consume_debate_content.side_effect = lambda t: consumed.append((t.topic_index, t.question_index))
+        engine.population.update_beliefs_from_debate_async.side_effect = fake_update
+
+        def slow_climate(client, prompt, system_instruction, **kwargs):
+            time.sleep(0.04 if "Climate" in prompt else 0.01)
+            return "reply"
+
+        with patch('src.mediator.llm_client.generate_response', side_effect=slow_climate), \
+             patch('src.candidate.llm_client.generate_response', side_effect=slow_climate), \
+             patch('src.candidate.llm_client.generate_response_async', side_effect=self._fake_llm_async):
+            engine._run_async(engine._run_debates_pipelined())
+
+        assert engine.population.update_beliefs_from_debate_async.call_count == 4
+        assert sorted(consumed) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+        if ordering == "deterministic":
+            assert consumed == [(0, 0), (0, 1), (1, 0), (1, 1)]
+        else:
+            # Housing debates faster, so its transcripts arrive first
+            assert consumed[0] == (1, 0)
+
+    def test_pipelined_epoch_matches_non_pipelined(self, llm):
+        """Test that pipelined debates (deterministic, per_epoch) leave personas as the non-pipelined epoch does"""
+        outcomes = []
+        for pipelined in (False, True):
+            engine = self.make_engine(pipeline_debates=pipelined)
+            populate(engine.population, size=3)
+            with patch('src.mediator.llm_client.generate_response', side_effect=self._fake_llm), \
+                 patch('src.candidate.llm_client.generate_response', side_effect=self._fake_llm), \
+                 patch.object(GameEngine, '_candidates_read_social_media'), \
+                 patch.object(GameEngine, '_personas_chat_with_peers'), \
+                 patch.object(GameEngine, '_personas_post_to_social_media'), \
+                 patch.object(GameEngine, '_population_react_to_posts'):
+                engine._run_epoch()
+            outcomes.append([(persona.debate_knowledge, persona.beliefs) for persona in engine.population.personas])
+
+        knowledge, beliefs = outcomes[0][0]
+        assert len(knowledge) == 4 and beliefs
+        assert outcomes[1] == outcomes[0]
+
+    def test_pipelined_per_epoch_belief_updates(self, engine):
+        """Test that per_epoch streams every transcript but leaves the single belief update to the epoch"""
+        engine.config.pipeline_debates = True
+        engine.config.pipeline_belief_updates = "per_epoch"
+        engine.population = Mock()
+
+        with patch('src.mediator.llm_client.generate_response', return_value="reply"), \
+             patch('src.candidate.llm_client.generate_response', return_value="reply"), \
+             patch('src.candidate.llm_client.generate_response_async', side_effect=self._fake_llm_async):
+            engine._run_async(engine._run_debates_pipelined())
+
+        assert engine.population.consume_debate_content.call_count == 4
+        assert engine.population.update_beliefs_from_debate_async.call_count == 0
+
+        with pytest.raises(ValueError, match="pipeline_belief_updates"):
+            GameEngine(Config(population_size=0, questions_per_topic=1, turns_per_question=1,
+                              num_epochs=1, random_seed=42, pipeline_belief_updates="per_question"))
@@ -1,11 +1,12 @@
+import asyncio
 import pytest
 import sys
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, AsyncMock
 
 # Add parent directory to path to import modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from src.mediator import Mediator, Topic, Question, CandidateStatement, DebateTranscript, MediatorStatement, MediatorState
+from src.mediator import Mediator, Topic, Question, CandidateStatement, DebateTranscript, MediatorStatement, MediatorState, PlannedQuestion
 
 
 class TestTopic:
@@ -179,6 +180,27 @@ class TestMediator:
         assert turn_result[0] == stmt1
         assert turn_result[1] == stmt2
 
+    def test_orchestrate_simultaneous_turn(self, mediator, sample_questions):
+        """Test that all candidates answer from the same context, results in candidate order"""
+        mediator_intro = MediatorStatement("med_1", "Welcome to the debate", sample_questions[0])
+        candidates = []
+        for candidate_id, name in [("c1", "Alice"), ("c2", "Bob")]:
+            candidate = Mock()
+            candidate.craft_debate_statement_async = AsyncMock(
+                return_value=CandidateStatement(candidate_id, name, f"{name} answers", sample_questions[0])
+            )
+            candidates.append(candidate)
+
+        turn_result = asyncio.run(mediator.orchestrate_simultaneous_turn_async(
+            sample_questions[0], candidates, 1, [mediator_intro], rebuttal=True
+        ))
+
+        assert [s.candidate_name for s in turn_result] == ["Alice", "Bob"]
+        for candidate in candidates:
+            candidate.craft_debate_statement_async.assert_called_once_with(
+                sample_questions[0], 1, [mediator_intro], rebuttal=True
+            )
+
     def test_publish_debate_transcript(self, mediator, sample_topics, sample_questions):
         """Test publishing debate transcript with metadata"""
         mediator_intro = MediatorStatement("mediator_1", "Welcome to the debate", sample_questions[0])
@@ -260,6 +282,78 @@ class TestMediator:
         call_args = mock_generate.call_args
         assert "Alice" in call_args[0][1]
 
+    @patch('src.mediator.llm_client.generate_response')
+    def test_read_previous_debates_is_incremental(self, mock_generate, mediator, sample_topics, sample_questions):
+        """Test that only new transcripts are summarized and merged into the running digest"""
+        mock_generate.side_effect = ["Alice wants a carbon tax.", "Alice wants a carbon tax; Bob now agrees."]
+        first = DebateTranscript([CandidateStatement("c1", "Alice", "Carbon tax now", sample_questions[0])],
+                                 "med_1", 0, 0, 0, sample_topics[0], sample_questions[0])
+        second = DebateTranscript([CandidateStatement("c2", "Bob", "I agree on a carbon tax", sample_questions[0])],
+                                  "med_1", 1, 0, 0, sample_topics[0], sample_questions[0])
+
+        mediator.read_previous_debates([first])
+        mediator.read_previous_debates([first, second])
+        mediator.read_previous_debates([first, second])
+
+        assert mock_generate.call_count == 2
+        second_prompt = mock_generate.call_args_list[1][0][1]
+        assert "Bob: I agree on a carbon tax" in second_prompt
+        assert "Alice: Carbon tax now" not in second_prompt
+        assert "Alice wants a carbon tax." in second_prompt
+        assert mediator.debates_digest == "Alice wants a carbon tax; Bob now agrees."
+
+    @patch('src.mediator.llm_client.generate_response')
+    def test_published_transcripts_are_indexed_by_topic(self, mock_generate, mediator, sample_topics, sample_questions):
+        """Test that propose_question uses the topic index without being passed transcripts"""
+        mock_generate.return_value = "Should carbon be taxed at the border?"
+        mediator.publish_debate_transcript(
+            [CandidateStatement("c1", "Alice", "We need carbon tax", sample_questions[0])],
+            sample_topics[0], sample_questions[0], epoch=0, topic_index=0, question_index=0
+        )
+
+        question = mediator.propose_question(sample_topics[0])
+        other_topic_question = mediator.propose_question(sample_topics[1])
+
+        assert question.id == "t1_q2"
+        assert other_topic_question.id == "t2_q1"
+        prompt = mock_generate.call_args_list[0][0][1]
+        assert sample_questions[0].text in prompt
+        assert "Alice: We need carbon tax" in prompt
+
+    @patch('src.mediator.llm_client.generate_response')
+    def test_plan_questions(self, mock_generate, mediator, sample_topics):
+        """Test planning several questions with introductions in one call"""
+        mock_generate.return_value = """```json
+[{"question": "Should carbon be taxed?", "introduction": "Emissions keep rising.", "key_terms": ["carbon tax"]},
+ {"question": "Who pays for adaptation?", "introduction": "Floods are costly.", "key_terms": ["adaptation"]}]
+```"""
+
+        planned = mediator.plan_questions(sample_topics[0], 2)
+
+        mock_generate.assert_called_once()
+        assert [p.question.id for p in planned] == ["t1_q1", "t1_q2"]
+        assert planned[0].question.text == "Should carbon be taxed?"
+        assert planned[1].introduction == "Floods are costly."
+        assert planned[0].key_terms == ["carbon tax"]
+
+    @patch('src.mediator.llm_client.generate_response')
+    def test_plan_questions_unparseable(self, mock_generate, mediator, sample_topics):
+        """Test that an unparseable plan yields no questions (caller falls back to proposing)"""
+        mock_generate.return_value = "Here are some questions: ..."
+
+        assert mediator.plan_questions(sample_topics[0], 2) == []
+
+    def test_debate_diverged(self, sample_questions):
+        """Test divergence as low coverage of the planned key terms"""
+        planned = PlannedQuestion(sample_questions[0], "Intro", key_terms=["carbon pricing", "emissions"])
+
+        def transcript(text):
+            return DebateTranscript([CandidateStatement("c1", "Alice", text, sample_questions[0])],
+                                    "med_1", 0, 0, 0, sample_questions[0].topic, sample_questions[0])
+
+        assert not Mediator.debate_diverged(planned, transcript("Carbon pricing cuts emissions fastest."))
+        assert Mediator.debate_diverged(planned, transcript("Let me talk about my record on schools."))
+
     def test_read_previous_debates_empty_list(self, mediator):
         """Test reading empty debate list does not update memory"""
         initial_memory = mediator.state.memory
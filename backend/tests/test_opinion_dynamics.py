@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import Config
+from src.game_engine import GameEngine
+from src.opinion_dynamics import OpinionDynamics
+
+
+@pytest.fixture
+def dynamics():
+    """Fixture for a 50-persona surrogate with two topics and two candidates"""
+    size = 50
+    return OpinionDynamics(
+        susceptibility=np.full(size, 0.8),
+        confirmation_bias=np.full(size, 0.2),
+        social_influence=np.full(size, 0.3),
+        topics=["Housing", "Climate"],
+        candidates=["Lina", "Markus"],
+        seed=0
+    )
+
+
+class TestOpinionDynamics:
+    """Test suite for the numeric opinion dynamics surrogate"""
+
+    def test_initial_stances_are_distributions(self, dynamics):
+        """Test that every persona starts with a probability distribution per topic"""
+        assert dynamics.stances.shape == (50, 3, 2)
+        assert np.allclose(dynamics.stances.sum(axis=2), 1.0)
+
+    def test_stances_from_beliefs_matches_free_form_keys(self, dynamics):
+        """Test mapping LLM belief keys and the overall vote onto topics"""
+        current = dynamics.stances[:2]
+        beliefs = [
+            {"housing": {"belief": "x", "vote": "Markus"}, "overall_vote": "Lina"},
+            {"unrelated": "legacy string"},
+        ]
+        stances = dynamics.stances_from_beliefs(beliefs, current)
+
+        assert stances[0, 0].tolist() == [0.0, 1.0]  # matched topic
+        assert stances[0, 1].tolist() == [1.0, 0.0]  # falls back to overall vote
+        assert np.allclose(stances[1], current[1])  # no usable vote
+
+    def test_step_moves_towards_calibrated_target(self, dynamics):
+        """Test that calibration on a subset pulls the rest of the population"""
+        rows = np.arange(10)
+        before = dynamics.stances[rows].copy()
+        after = np.zeros_like(before)
+        after[..., 0] = 1.0
+
+        dynamics.calibrate(rows, before, after)
+        share_before = dynamics.vote_shares()["overall"]["Lina"]
+        dynamics.step(pinned_rows=rows, pinned_stances=after)
+
+        assert dynamics.vote_shares()["overall"]["Lina"] > share_before
+        assert 0.0 < dynamics.step_size <= 1.0
+        assert np.allclose(dynamics.stances[rows], after)
+        assert np.allclose(dynamics.stances.sum(axis=2), 1.0, atol=1e-5)
+
+    @pytest.mark.parametrize("selection", [
+        {"population_query": {"filters": [{"field": "age", "op": ">=", "value": 65}]}},
+        {"population_sampling": {"strata": {"canton": None}}}
+    ])
+    def test_engine_rejects_population_selection(self, selection):
+        """Test that a query or stratified sample cannot be silently ignored in hybrid mode"""
+        config = Config(population_size=2, questions_per_topic=1, turns_per_question=1, num_epochs=1, random_seed=1,
+                        opinion_dynamics={"neighbors": 5}, **selection)
+        with patch('src.game_engine.llm_client.create_client'), pytest.raises(ValueError, match="opinion_dynamics"):
+            GameEngine(config)
@@ -0,0 +1,146 @@
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.persona_dataflow import PersonaDataflow
+from src.population import Population
+from src.social_media import SocialMedia
+
+
+class FakePersona:
+    """Persona stand-in whose async LLM stages record the order they ran in."""
+
+    def __init__(self, persona_id, events, post_delay=0.0):
+        self.id = persona_id
+        self.features = {"name": persona_id}
+        self.debate_knowledge = ["transcript"]
+        self.chats = []
+        self.social_media_knowledge = []
+        self.posts = []
+        self.events = events
+        self.post_delay = post_delay
+
+    async def update_beliefs_async(self, knowledge_category, max_change_percentage):
+        self.events.append(("update", self.id, knowledge_category))
+
+    async def chat_with_peers_async(self, conversation_history, peer_id, peer_name=None):
+        self.events.append(("chat", self.id, peer_id))
+        message = f"{self.id} to {peer_id}"
+        self.chats.append({"peer_id": peer_id, "message": message})
+        return message
+
+    async def create_social_media_post_async(self, existing_posts=None):
+        await asyncio.sleep(self.post_delay)
+        self.events.append(("post", self.id))
+        post = type("Post", (), {"id": f"local_{self.id}", "persona_id": self.id, "content": f"post by {self.id}"})()
+        self.posts.append(post)
+        return post
+
+    async def react_to_post_async(self, post):
+        self.events.append(("react", self.id, post["persona_id"]))
+        return "thumbs_up"
+
+
+class FakePopulation:
+    chat_pair_async = Population.chat_pair_async
+
+    def __init__(self, personas):
+        self.personas = personas
+
+
+def run(dataflow):
+    return asyncio.new_event_loop().run_until_complete(dataflow.run_async())
+
+
+class TestPersonaDataflow:
+    """Test suite for per-persona dataflow epochs"""
+
+    def test_every_persona_runs_every_stage(self):
+        """Test chats, posts, reactions and belief updates with certain posting and reacting"""
+        events = []
+        personas = [FakePersona(f"p{i}", events) for i in range(4)]
+        social_media = SocialMedia()
+        random.seed(0)
+
+        stats = run(PersonaDataflow(FakePopulation(personas), social_media,
+                                    post_probability=1.0, reaction_probability=1.0, num_rounds_variance=0))
+
+        assert stats == {"conversations": 2, "posts": 4, "total_reactions": 12, "thumbs_up": 12, "thumbs_down": 0}
+        assert len(social_media.posts) == 4
+        assert len(social_media.reaction_log) == 12
+        for persona in personas:
+            categories = [event[2] for event in events if event[0] == "update" and event[1] == persona.id]
+            assert categories == ["debate_knowledge", "chats", "social_media_knowledge"]
+            assert len(persona.social_media_knowledge) == 3
+
+    def test_chat_waits_for_partner_debate_update(self):
+        """Test that a pair only chats after both partners updated from the debate"""
+        events = []
+        personas = [FakePersona(f"p{i}", events) for i in range(2)]
+        random.seed(1)
+
+        run(PersonaDataflow(FakePopulation(personas), post_probability=0.0, num_rounds_variance=0))
+
+        first_chat = next(i for i, event in enumerate(events) if event[0] == "chat")
+        debate_updates = [i for i, event in enumerate(events) if event[0] == "update" and event[2] == "debate_knowledge"]
+        assert len(debate_updates) == 2
+        assert max(debate_updates) < first_chat
+
+    def test_reaction_waits_only_for_its_post(self):
+        """Test that a slow poster delays only the reactions to its own post"""
+        events = []
+        slow = FakePersona("slow", events, post_delay=0.05)
+        fast = FakePersona("fast", events)
+        random.seed(2)
+
+        run(PersonaDataflow(FakePopulation([slow, fast]), post_probability=1.0, reaction_probability=1.0))
+
+        slow_post = events.index(("post", "slow"))
+        assert events.index(("post", "fast")) < slow_post
+        assert events.index(("react", "fast", "slow")) > slow_post
+
+    def test_reaction_draws_are_seeded_per_persona_and_post(self):
+        """Test that the same seed produces the same reactions regardless of completion order"""
+        def reactions(post_delays):
+            events = []
+            personas = [FakePersona(f"p{i}", events, post_delay=delay) for i, delay in enumerate(post_delays)]
+            random.seed(3)
+            run(PersonaDataflow(FakePopulation(personas), post_probability=1.0, reaction_probability=0.5))
+            return sorted(event for event in events if event[0] == "react")
+
+        assert reactions([0.0, 0.0, 0.0, 0.0, 0.0]) == reactions([0.04, 0.0, 0.02, 0.0, 0.01])
+
+    def test_posts_are_published_in_plan_order(self):
+        """Test that the order of published posts does not depend on which post call finishes first"""
+        def published(post_delays):
+            personas = [FakePersona(f"p{i}", [], post_delay=delay) for i, delay in enumerate(post_delays)]
+            social_media = SocialMedia()
+            random.seed(5)
+            run(PersonaDataflow(FakePopulation(personas), social_media, post_probability=1.0, reaction_probability=0.5))
+            return [(post.persona_id, post.content) for post in social_media.posts]
+
+        expected = published([0.0] * 5)
+        assert [persona_id for persona_id, _ in expected] == [f"p{i}" for i in range(5)]
+        for post_delays in ([0.04, 0.0, 0.02, 0.0, 0.01], [0.0, 0.01, 0.02, 0.03, 0.04], [0.03, 0.03, 0.0, 0.0, 0.0]):
+            assert published(post_delays) == expected
+
+    def test_failed_post_does_not_block_reactions(self):
+        """Test that a persona whose post fails releases the personas waiting on it"""
+        events = []
+        personas = [FakePersona(f"p{i}", events) for i in range(3)]
+
+        async def failing_post(existing_posts=None):
+            raise RuntimeError("LLM unavailable")
+        personas[0].create_social_media_post_async = failing_post
+        random.seed(4)
+
+        dataflow = PersonaDataflow(FakePopulation(personas), post_probability=1.0, reaction_probability=1.0)
+        with pytest.raises(RuntimeError):
+            asyncio.new_event_loop().run_until_complete(asyncio.wait_for(dataflow.run_async(), timeout=5))
+
+        assert all(future.done() for future in dataflow.post_futures.values())
+        assert ("react", "p1", "p2") in events and ("react", "p2", "p1") in events
@@ -0,0 +1,137 @@
+import os
+import json
+import multiprocessing
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.persona_store import PersonaStore, build_columnar, cache_dir_for, is_stale
+
+
+def write_personas(path, personas):
+    with open(path, 'w', encoding='utf-8') as f:
+        for persona in personas:
+            f.write(json.dumps(persona, ensure_ascii=False) + '\n')
+
+
+@pytest.fixture
+def sample_personas():
+    """Fixture for a small persona dataset with nested and list fields"""
+    return [
+        {
+            "id": f"p{i}",
+            "name": f"Person {i}",
+            "age": 20 + i,
+            "education_level": "master_degree" if i % 2 else "trade_school",
+            "city": "Zürich",
+            "media_diet": {"social_media": 0.1 * i, "tv": 0.5},
+            "interests": ["hiking"],
+        }
+        for i in range(6)
+    ]
+
+
+@pytest.fixture
+def jsonl_file(tmp_path, sample_personas):
+    path = tmp_path / "personas.jsonl"
+    write_personas(path, sample_personas)
+    return path
+
+
+class TestPersonaStore:
+    """Test suite for the columnar persona store"""
+
+    def test_open_builds_cache(self, jsonl_file):
+        """Test that opening a JSONL file builds the sibling cache directory"""
+        store = PersonaStore.open(jsonl_file)
+
+        assert cache_dir_for(jsonl_file).exists()
+        assert len(store) == 6
+        assert not is_stale(jsonl_file)
+
+    def test_column_kinds(self, jsonl_file):
+        """Test that numeric, categorical and free-text fields are stored appropriately"""
+        store = PersonaStore.open(jsonl_file)
+
+        assert store.kind("age") == "numeric"
+        assert store.kind("media_diet.social_media") == "numeric"
+        assert store.kind("education_level") == "category"
+        assert store.kind("name") == "text"
+        assert "interests" not in store.columns
+
+    def test_numeric_and_categorical_values(self, jsonl_file):
+        """Test reading memory-mapped numeric arrays and category codes"""
+        store = PersonaStore.open(jsonl_file)
+
+        assert list(store.numeric("age")) == [20, 21, 22, 23, 24, 25]
+        codes, categories = store.categorical("education_level")
+        assert [categories[c] for c in codes[:2]] == ["trade_school", "master_degree"]
+        assert store.values("city", [0]) == ["Zürich"]
+
+    def test_record_round_trip(self, jsonl_file, sample_personas):
+        """Test that full records are returned exactly as written"""
+        store = PersonaStore.open(jsonl_file)
+
+        assert store.record(3) == sample_personas[3]
+        assert list(store.records([5, 0])) == [sample_personas[5], sample_personas[0]]
+
+    def test_cache_invalidated_when_source_changes(self, jsonl_file, sample_personas):
+        """Test that a modified JSONL file triggers a rebuild"""
+        PersonaStore.open(jsonl_file)
+
+        write_personas(jsonl_file, sample_personas[:2])
+        stat = os.stat(jsonl_file)
+        os.utime(jsonl_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert is_stale(jsonl_file)
+        assert len(PersonaStore.open(jsonl_file)) == 2
+
+    def test_malformed_line_raises(self, tmp_path):
+        """Test that malformed JSON reports the offending line"""
+        path = tmp_path / "bad.jsonl"
+        path.write_text('{"id": "ok"}\n{not json}\n')
+
+        with pytest.raises(ValueError, match="line 2"):
+            build_columnar(path)
+
+    def test_rebuild_keeps_mapped_cache_readable(self, jsonl_file, sample_personas):
+        """Test that replacing a stale cache does not break stores still mapping the old one"""
+        old_store = PersonaStore.open(jsonl_file)
+        assert old_store.record(5) == sample_personas[5]  # Maps the record column
+
+        write_personas(jsonl_file, sample_personas[:2])
+        stat = os.stat(jsonl_file)
+        os.utime(jsonl_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert len(PersonaStore.open(jsonl_file)) == 2
+        assert old_store.record(5) == sample_personas[5]
+        assert [path.name for path in jsonl_file.parent.iterdir() if ".cols" in path.name] == ["personas.jsonl.cols"]
+
+    def test_forced_rebuild_replaces_fresh_cache(self, jsonl_file, sample_personas):
+        """Test that rebuild=True rewrites a cache that is still up to date"""
+        PersonaStore.open(jsonl_file)
+        meta_file = cache_dir_for(jsonl_file) / "meta.json"
+        meta = json.loads(meta_file.read_text())
+        meta["count"] = 1  # Damaged, but its source signature still matches
+        meta_file.write_text(json.dumps(meta))
+        assert not is_stale(jsonl_file)
+
+        assert len(PersonaStore.open(jsonl_file)) == 1
+        assert len(PersonaStore.open(jsonl_file, rebuild=True)) == len(sample_personas)
+        assert json.loads(meta_file.read_text())["count"] == len(sample_personas)
+
+    def test_concurrent_builds(self, jsonl_file, sample_personas):
+        """Test that processes building the same cache at once all end up with a valid cache"""
+        context = multiprocessing.get_context()
+        with context.Pool(4) as pool:
+            sizes = pool.map(_open_size, [str(jsonl_file)] * 8)
+
+        assert sizes == [6] * 8
+        assert PersonaStore.open(jsonl_file).record(2) == sample_personas[2]
+        assert [path.name for path in jsonl_file.parent.iterdir() if ".cols" in path.name] == ["personas.jsonl.cols"]
+
+
+def _open_size(path):
+    return len(PersonaStore.open(path, rebuild=True))
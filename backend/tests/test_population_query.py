@@ -0,0 +1,92 @@
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.persona_store import PersonaStore
+from src.population_query import PopulationIndex, PopulationQuery
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Fixture for a 100-persona store with known demographics"""
+    path = tmp_path / "personas.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(100):
+            f.write(json.dumps({
+                "id": f"p{i}",
+                "age": 18 + i % 50,
+                "education_level": "master_degree" if i % 4 == 0 else "trade_school",
+                "city": "Zürich" if i % 2 == 0 else "Bern",
+                "ethnicity": "Swiss-German" if i % 5 == 0 else "Swiss-French",
+            }, ensure_ascii=False) + '\n')
+    return PersonaStore.open(path)
+
+
+class TestPopulationQuery:
+    """Test suite for PopulationQuery parsing"""
+
+    def test_from_dict(self):
+        """Test parsing filters and stratification from a config dict"""
+        query = PopulationQuery.from_dict({
+            "filters": {"age": {"min": 18, "max": 30}},
+            "stratify": {"ethnicity": {"Swiss-German": 0.4}}
+        })
+        assert query.filters == {"age": {"min": 18, "max": 30}}
+        assert query.stratify == {"ethnicity": {"Swiss-German": 0.4}}
+
+    def test_from_dict_rejects_unknown_keys(self):
+        """Test that typos in the query are reported"""
+        with pytest.raises(ValueError, match="Unknown population_query keys"):
+            PopulationQuery.from_dict({"filter": {}})
+
+    def test_from_dict_rejects_shares_above_one(self):
+        """Test that stratification shares cannot exceed 100%"""
+        with pytest.raises(ValueError, match="sum to at most 1"):
+            PopulationQuery.from_dict({"stratify": {"city": {"Zürich": 0.7, "Bern": 0.6}}})
+
+
+class TestPopulationIndex:
+    """Test suite for PopulationIndex filtering and stratification"""
+
+    def test_range_and_equality_filters(self, store):
+        """Test combining a numeric range with categorical equality"""
+        index = PopulationIndex(store)
+        rows = index.select(PopulationQuery(filters={
+            "age": {"min": 18, "max": 30},
+            "education_level": "master_degree",
+            "city": ["Zürich"]
+        }))
+
+        ages = store.numeric("age")[rows]
+        assert len(rows) > 0
+        assert ((ages >= 18) & (ages <= 30)).all()
+        assert set(store.values("education_level", rows)) == {"master_degree"}
+
+    def test_unknown_category_matches_nothing(self, store):
+        """Test that filtering on a category absent from the data returns no rows"""
+        rows = PopulationIndex(store).select(PopulationQuery(filters={"city": "Geneva"}))
+        assert len(rows) == 0
+
+    def test_limit_samples_without_replacement(self, store):
+        """Test that size draws a reproducible subset of the matches"""
+        index = PopulationIndex(store)
+        query = PopulationQuery(filters={"city": "Bern"})
+
+        rows = index.select(query, size=10, seed=1)
+        assert len(rows) == len(set(rows.tolist())) == 10
+        assert rows.tolist() == index.select(query, size=10, seed=1).tolist()
+
+    def test_stratified_shares(self, store):
+        """Test that stratification hits the requested category share"""
+        rows = PopulationIndex(store).select(
+            PopulationQuery(stratify={"ethnicity": {"Swiss-German": 0.4}}),
+            size=40,
+            seed=0
+        )
+
+        ethnicities = store.values("ethnicity", rows)
+        assert len(rows) == 40
+        assert ethnicities.count("Swiss-German") == 16
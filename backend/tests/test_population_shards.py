@@ -0,0 +1,147 @@
+import re
+import json
+import random
+import hashlib
+import pickle
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import Config
+from src.game_engine import GameEngine
+from src.mediator import Topic, Question, CandidateStatement, MediatorStatement, DebateTranscript
+from src.persona import Persona
+from src.population import Population
+from src.population_shards import ShardedPopulation
+from src.social_media import SocialMedia
+
+
+CANDIDATES = ["Alice", "Bob"]
+UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+TOPIC = Topic(id="t1", title="Housing", description="Rents and vacancies")
+QUESTION = Question(id="q1", text="How do we lower rents?", topic=TOPIC)
+TRANSCRIPT = DebateTranscript(
+    statements=[MediatorStatement("m1", "Tonight: housing.", QUESTION),
+                CandidateStatement("c1", "Alice", "Build more.", QUESTION),
+                CandidateStatement("c2", "Bob", "Cap rents.", QUESTION)],
+    mediator_id="m1", epoch=0, topic_index=0, question_index=0, topic=TOPIC, question=QUESTION
+)
+
+
+async def fake_generate(client, prompt, system_instruction, **kwargs):
+    """Deterministic stand-in for the LLM: the answer only depends on the request (post UUIDs aside)."""
+    request = UUID.sub("<id>", system_instruction + prompt)
+    digest = hashlib.sha256(request.encode("utf-8")).hexdigest()
+    pick = int(digest, 16) % 2
+    if "belief update" in system_instruction:
+        return json.dumps({"t1": {"belief": f"belief {digest[:6]}", "vote": CANDIDATES[pick]}, "overall_vote": CANDIDATES[pick]})
+    if "reactions" in system_instruction:
+        return ["thumbs_up", "thumbs_down"][pick]
+    if "voting decision" in system_instruction:
+        return CANDIDATES[pick]
+    return f"message {digest[:8]}"
+
+
+@pytest.fixture
+def llm():
+    with patch('src.persona.llm_client.create_client', return_value=Mock()), \
+         patch('src.persona.llm_client.generate_response_async', side_effect=fake_generate), \
+         patch.dict('os.environ', {'GEMINI_API_KEY': 'test_key'}):
+        yield
+
+
+def populate(population, size=7):
+    for i in range(size):
+        population.add_persona(Persona(f"p{i}", {"id": f"p{i}", "name": f"Persona {i}", "age": 20 + i}))
+    return population
+
+
+def run_epoch(population):
+    """The population phases of one epoch, as the engine runs them."""
+    random.seed(11)
+    social_media = SocialMedia()
+    population.consume_debate_content(TRANSCRIPT)
+    population.update_beliefs_from_debate(max_concurrent=4)
+    conversations = population.chat_with_peers(num_rounds_mean=2, num_rounds_variance=1)
+    population.update_beliefs_from_chat(max_concurrent=4)
+    for post in population.create_social_media_posts(post_probability=0.5):
+        social_media.add_post(post)
+    posts = [{"id": post.id, "persona_id": post.persona_id, "content": post.content, "likes": 0, "dislikes": 0}
+             for post in social_media.posts]
+    reaction_stats = population.react_to_posts(posts, social_media, reaction_probability=0.6)
+    population.update_beliefs_from_social_media(max_concurrent=4)
+    votes = population.conduct_vote(CANDIDATES)
+
+    return {
+        "conversations": conversations,
+        "posts": [(post.persona_id, post.content, post.likes, post.dislikes) for post in social_media.posts],
+        "reactions": reaction_stats,
+        "beliefs": {persona.id: persona.beliefs for persona in population.personas},
+        "votes": votes,
+        "last_votes": population.last_votes
+    }
+
+
+class TestPopulationShards:
+    """Test suite for multi-process population sharding"""
+
+    def test_sharded_epoch_matches_single_process(self, llm):
+        """Test that a sharded population gives the same results as one process for the same seed"""
+        expected = run_epoch(populate(Population()))
+        sharded = populate(ShardedPopulation(3))
+        try:
+            actual = run_epoch(sharded)
+        finally:
+            sharded.close()
+
+        assert expected["conversations"] and expected["posts"]
+        assert actual == expected
+
+    def test_close_brings_persona_state_back(self, llm):
+        """Test that closing the shards restores knowledge, chats and posts in this process"""
+        reference = populate(Population())
+        run_epoch(reference)
+        sharded = populate(ShardedPopulation(2))
+        run_epoch(sharded)
+        sharded.close()
+
+        for expected, actual in zip(reference.personas, sharded.personas):
+            assert actual.debate_knowledge == expected.debate_knowledge
+            assert actual.chats == expected.chats
+            assert [post["content"] for post in actual.social_media_knowledge] == \
+                [post["content"] for post in expected.social_media_knowledge]
+            assert [post["content"] for post in actual.posts] == [post["content"] for post in expected.posts]
+            assert actual.llm_client is not None
+
+    def test_pickling_collects_workers_state(self, llm):
+        """Test that a pickled (checkpointed) sharded population carries the workers' persona state"""
+        sharded = populate(ShardedPopulation(2), size=4)
+        try:
+            sharded.consume_debate_content(TRANSCRIPT)
+            restored = pickle.loads(pickle.dumps(sharded))
+        finally:
+            sharded.close()
+
+        assert all(len(persona.debate_knowledge) == 1 for persona in restored.personas)
+        assert restored._shards is None
+
+        # A restored population restarts its workers on first use
+        try:
+            restored.update_beliefs_from_debate()
+            assert all(persona.beliefs for persona in restored.personas)
+        finally:
+            restored.close()
+
+    def test_engine_uses_shards_when_configured(self, llm):
+        """Test the config switch and the combinations it rejects"""
+        with patch('src.game_engine.llm_client.create_client'):
+            base = dict(population_size=2, questions_per_topic=1, turns_per_question=1, num_epochs=1, random_seed=1)
+            assert isinstance(GameEngine(Config(**base, population_shards=4)).population, ShardedPopulation)
+            assert type(GameEngine(Config(**base)).population) is Population
+            with pytest.raises(ValueError, match="archetypes"):
+                GameEngine(Config(**base, population_shards=2, archetypes={"num_archetypes": 2}))
+            with pytest.raises(ValueError, match="persona_dataflow"):
+                GameEngine(Config(**base, population_shards=2, persona_dataflow=True))
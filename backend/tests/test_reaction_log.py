@@ -0,0 +1,111 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.reaction_log import ReactionLog
+
+
+@pytest.fixture
+def log():
+    """Two authors, three posts, four reacting personas"""
+    log = ReactionLog()
+    log.register_post("p1", "alice")
+    log.register_post("p2", "alice")
+    log.register_post("p3", "bob")
+    log.extend([
+        ("p1", "carol", "thumbs_up"),
+        ("p1", "dave", "thumbs_up"),
+        ("p1", "bob", "thumbs_down"),
+        ("p2", "carol", "thumbs_up"),
+        ("p3", "carol", "thumbs_up"),
+        ("p3", "dave", "thumbs_down"),
+    ], epoch=0)
+    return log
+
+
+class TestReactionLog:
+    """Test suite for the array-backed reaction log"""
+
+    def test_compact_storage(self, log):
+        """Test that reactions are stored as integer codes and int8 values"""
+        assert len(log) == 6
+        assert log.values.dtype == np.int8
+        assert log.personas.dtype == np.int32
+        assert log.values.tolist() == [1, 1, -1, 1, 1, -1]
+
+    def test_grows_past_initial_capacity(self):
+        """Test that the log grows beyond its preallocated arrays"""
+        log = ReactionLog()
+        log.extend((f"p{i % 7}", f"persona_{i}", "thumbs_up") for i in range(5000))
+
+        assert len(log) == 5000
+        assert len(log.post_ids) == 7
+
+    def test_to_coo(self, log):
+        """Test the sparse persona x post export"""
+        data, rows, cols, shape = log.to_coo()
+
+        assert shape == (len(log.persona_ids), 3)
+        dense = np.zeros(shape, dtype=np.int8)
+        dense[rows, cols] = data
+        assert dense[log.persona_ids.index("bob"), log.post_ids.index("p1")] == -1
+        assert dense[log.persona_ids.index("carol")].tolist() == [1, 1, 1]
+
+    def test_author_approval(self, log):
+        """Test thumbs-up share per post author"""
+        approval = log.author_approval()
+
+        assert approval["alice"] == {"likes": 3, "dislikes": 1, "approval": 0.75}
+        assert approval["bob"]["approval"] == 0.5
+        assert "carol" not in approval
+
+    def test_persona_agreement(self, log):
+        """Test agreement with the majority reaction, ignoring tied posts"""
+        agreement = log.persona_agreement()
+
+        # p3 is tied; carol agrees on p1 and p2, bob disagrees on p1
+        assert agreement["carol"] == 1.0
+        assert agreement["bob"] == 0.0
+        assert agreement["dave"] == 1.0
+
+    def test_post_polarization(self, log):
+        """Test that unanimous posts score 0 and evenly split posts score 1"""
+        polarization = log.post_polarization()
+
+        assert polarization["p2"] == 0.0
+        assert polarization["p3"] == 1.0
+        assert polarization["p1"] == pytest.approx(4 * (2 / 3) * (1 / 3))
+
+    def test_remove_posts(self, log):
+        """Test dropping reactions of expired posts"""
+        removed = log.remove_posts(["p1"])
+
+        assert [r["persona_id"] for r in removed["p1"]] == ["carol", "dave", "bob"]
+        assert len(log) == 3
+        assert set(log.by_post()) == {"p2", "p3"}
+
+    def test_from_epochs(self, tmp_path):
+        """Test rebuilding the log from serialized epochs"""
+        epochs = [
+            {"epoch": 0, "newsfeed": {
+                "posts": [{"id": "p1", "persona_id": "alice"}],
+                "reactions": [["p1", "bob", 1], ["p1", "carol", -1]]
+            }},
+            {"epoch": 1, "newsfeed": {
+                "posts": [{"id": "p1", "persona_id": "alice"}, {"id": "p2", "persona_id": "bob"}],
+                "reactions": [["p2", "alice", 1]]
+            }},
+        ]
+        path = tmp_path / "epochs.jsonl"
+        path.write_text("\n".join(json.dumps(epoch) for epoch in epochs) + "\n")
+
+        log = ReactionLog.from_epochs(path)
+
+        assert len(log) == 3
+        assert log.epochs.tolist() == [0, 0, 1]
+        assert log.author_approval()["alice"]["approval"] == 0.5
+        assert log.epoch_records(1) == [["p2", "alice", 1]]
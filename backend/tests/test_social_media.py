@@ -5,6 +5,7 @@ from pathlib import Path
 # Add parent directory to path to import SocialMedia
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.social_media import SocialMedia, Post
+from src.post_archive import PostArchive
 
 
 class TestPost:
@@ -164,3 +165,163 @@ class TestSocialMedia:
 
         filtered = social_media.get_feed_by_personas(["persona_123"])
         assert filtered == []
+
+    def test_get_post_by_id(self, social_media, sample_posts):
+        """Test O(1) lookup of posts by ID"""
+        for post in sample_posts:
+            social_media.add_post(post)
+
+        assert social_media.get_post("post_3") is sample_posts[2]
+        assert social_media.get_post("missing") is None
+
+    def test_add_reactions_bulk(self, social_media, sample_posts):
+        """Test applying many reactions in one call"""
+        for post in sample_posts:
+            social_media.add_post(post)
+
+        applied = social_media.add_reactions([
+            ("post_1", "persona_456", "thumbs_up"),
+            ("post_1", "persona_789", "thumbs_down"),
+            ("post_4", "persona_123", "thumbs_up"),
+        ])
+
+        assert applied == 3
+        assert sample_posts[0].likes == 1
+        assert sample_posts[0].dislikes == 1
+        assert sample_posts[3].likes == 1
+        assert len(social_media.reactions["post_1"]) == 2
+
+    def test_add_reactions_bulk_rejects_invalid(self, social_media, sample_posts):
+        """Test that an invalid reaction rejects the whole batch"""
+        social_media.add_post(sample_posts[0])
+
+        with pytest.raises(ValueError, match="Invalid reaction"):
+            social_media.add_reactions([
+                ("post_1", "persona_456", "thumbs_up"),
+                ("post_1", "persona_789", "love"),
+            ])
+
+        assert sample_posts[0].likes == 0
+        assert social_media.reactions == {}
+
+    def test_rank_feeds_bounded_and_excludes_own_posts(self, social_media, sample_posts):
+        """Test that ranked feeds hold at most k posts and never the viewer's own"""
+        for post in sample_posts:
+            social_media.add_post(post)
+
+        feeds = social_media.rank_feeds(["persona_123", "persona_456"], k=2)
+
+        assert len(feeds["persona_123"]) == 2
+        assert all(post.persona_id != "persona_123" for post in feeds["persona_123"])
+        assert all(post.persona_id != "persona_456" for post in feeds["persona_456"])
+
+    def test_rank_feeds_prefers_recent_posts(self, social_media):
+        """Test that newer posts outrank older ones when nothing else differs"""
+        social_media.add_post(Post(id="old", persona_id="a", content="Old news"))
+        social_media.current_epoch = 3
+        social_media.add_post(Post(id="new", persona_id="b", content="Fresh take"))
+
+        feed = social_media.rank_feeds(["viewer"], k=2)["viewer"]
+
+        assert [post.id for post in feed] == ["new", "old"]
+
+    def test_rank_feeds_prefers_similar_authors(self, social_media):
+        """Test that posts by personas similar to the viewer rank first"""
+        social_media.add_post(Post(id="far", persona_id="b", content="Other side"))
+        social_media.add_post(Post(id="near", persona_id="a", content="Same side"))
+        social_media.set_persona_profiles(
+            ["viewer", "a", "b"],
+            [[1.0, 0.0], [0.9, 0.1], [-1.0, 0.0]],
+            [0.2, 0.2, 0.2]
+        )
+
+        feed = social_media.rank_feeds(["viewer"], k=1)["viewer"]
+
+        assert [post.id for post in feed] == ["near"]
+
+    def test_expire_posts_moves_old_posts_to_archive(self, social_media, tmp_path):
+        """Test that posts outside the retention window leave memory but stay queryable"""
+        social_media.enable_retention(2, tmp_path / "archive.jsonl")
+        social_media.add_post(Post(id="old", persona_id="a", content="Epoch 0"))
+        social_media.add_reaction("old", "b", "thumbs_up")
+        social_media.current_epoch = 1
+        social_media.add_post(Post(id="new", persona_id="a", content="Epoch 1"))
+
+        social_media.current_epoch = 2
+        archived = social_media.expire_posts()
+
+        assert archived == 1
+        assert [post.id for post in social_media.posts] == ["new"]
+        assert social_media.get_post("old") is None
+        assert "old" not in social_media.reactions
+        assert [post.id for post in social_media.get_feed_by_personas(["a"])] == ["new"]
+
+        archived_post = social_media.get_archived_post("old")
+        assert archived_post.content == "Epoch 0"
+        assert archived_post.likes == 1
+        assert social_media.archive.get("old")["reactions"] == [{"persona_id": "b", "reaction": "thumbs_up"}]
+        assert [post.id for post in social_media.get_archived_posts_by_persona("a")] == ["old"]
+
+    def test_expire_posts_without_retention_keeps_everything(self, social_media, sample_posts):
+        """Test that expiry is a no-op unless retention is enabled"""
+        for post in sample_posts:
+            social_media.add_post(post)
+        social_media.current_epoch = 10
+
+        assert social_media.expire_posts() == 0
+        assert len(social_media.posts) == 4
+        assert social_media.get_archived_post("post_1") is None
+
+    def test_archive_index_survives_reopen(self, tmp_path):
+        """Test that reopening an archive file rebuilds its indexes"""
+        path = tmp_path / "archive.jsonl"
+        PostArchive(path).append([
+            ({"id": "p1", "persona_id": "a", "content": "One"}, []),
+            ({"id": "p2", "persona_id": "b", "content": "Two"}, []),
+            ({"id": "p3", "persona_id": "a", "content": "Drei ü"}, []),
+        ])
+
+        archive = PostArchive(path)
+
+        assert len(archive) == 3
+        assert archive.get("p2")["post"]["content"] == "Two"
+        assert [entry["post"]["content"] for entry in archive.by_persona("a")] == ["One", "Drei ü"]
+        assert archive.get("missing") is None
+
+    def test_get_feed_is_cached_until_change(self, social_media, sample_posts):
+        """Test that the rendered feed is reused until posts or reactions change"""
+        social_media.add_post(sample_posts[0])
+        first = social_media.get_feed()
+        assert social_media.get_feed() is first
+
+        social_media.add_reaction("post_1", "persona_456", "thumbs_up")
+        updated = social_media.get_feed()
+        assert updated is not first
+        assert "[1 👍 / 0 👎]" in updated
+
+        social_media.add_post(sample_posts[1])
+        assert "Second post" in social_media.get_feed()
+
+    def test_get_feed_since_last_read(self, social_media, sample_posts):
+        """Test that each reader only receives posts new since its previous read"""
+        social_media.add_post(sample_posts[0])
+        social_media.add_post(sample_posts[1])
+
+        assert social_media.get_feed_since("candidate_1").count("\n") == 1
+        assert social_media.get_feed_since("candidate_1") == ""
+
+        social_media.add_post(sample_posts[2])
+        assert [post.id for post in social_media.read_new_posts("candidate_1")] == ["post_3"]
+        assert [post.id for post in social_media.read_new_posts("mediator")] == ["post_1", "post_2", "post_3"]
+
+    def test_read_new_posts_after_expiry(self, social_media, tmp_path):
+        """Test that read cursors stay valid when old posts are archived"""
+        social_media.enable_retention(1, tmp_path / "archive.jsonl")
+        social_media.add_post(Post(id="a", persona_id="x", content="Epoch 0"))
+        social_media.read_new_posts("reader")
+
+        social_media.current_epoch = 1
+        social_media.expire_posts()
+        social_media.add_post(Post(id="b", persona_id="x", content="Epoch 1"))
+
+        assert [post.id for post in social_media.read_new_posts("reader")] == ["b"]
@@ -0,0 +1,131 @@
+import json
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.config import Config
+from src.game_engine import GameEngine
+from src.persona_store import PersonaStore
+from src.stratified_sampling import draw_stratified_sample, estimate_shares
+from tests.test_population_shards import llm, populate  # noqa: F401 (llm is a fixture)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Fixture for a 1000-persona store: 80% trade_school, 20% master_degree"""
+    path = tmp_path / "personas.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(1000):
+            f.write(json.dumps({
+                "id": f"p{i}",
+                "age": 18 + i % 60,
+                "education_level": "master_degree" if i % 5 == 0 else "trade_school",
+            }) + '\n')
+    return PersonaStore.open(path)
+
+
+class TestDrawStratifiedSample:
+    """Test suite for stratified sample allocation and weights"""
+
+    def test_proportional_allocation(self, store):
+        """Test that strata are sampled in proportion to their size"""
+        sample = draw_stratified_sample(store, {"education_level": None}, sample_size=100, seed=0)
+
+        assert len(sample.rows) == 100
+        assert sample.strata.count("education_level=master_degree") == 20
+        assert sample.strata.count("education_level=trade_school") == 80
+
+    def test_weights_sum_to_target_size(self, store):
+        """Test that weights extrapolate the sample to the target population"""
+        sample = draw_stratified_sample(store, {"education_level": None}, sample_size=50, target_size=20000, seed=0)
+
+        assert sample.weights.sum() == pytest.approx(20000)
+        assert sum(sample.stratum_sizes.values()) == pytest.approx(20000)
+
+    def test_numeric_strata_need_edges(self, store):
+        """Test that numeric strata must be binned"""
+        with pytest.raises(ValueError, match="bin edges"):
+            draw_stratified_sample(store, {"age": None}, sample_size=10)
+
+    def test_numeric_and_categorical_cells(self, store):
+        """Test crossing a binned numeric field with a categorical field"""
+        sample = draw_stratified_sample(store, {"age": [40], "education_level": None}, sample_size=100, seed=3)
+
+        assert len(set(sample.strata)) == 4
+        assert len(set(sample.rows.tolist())) == 100
+
+
+class TestEstimateShares:
+    """Test suite for the stratified share estimator"""
+
+    def test_reweights_oversampled_stratum(self):
+        """Test that a stratum's share follows its population size, not its sample size"""
+        choices = ["A"] * 10 + ["B"] * 10
+        strata = ["small"] * 10 + ["large"] * 10
+        estimates = estimate_shares(choices, strata, {"small": 100, "large": 900}, ["A", "B"])
+
+        assert estimates["A"]["share"] == pytest.approx(0.1)
+        assert estimates["B"]["share"] == pytest.approx(0.9)
+
+    def test_confidence_interval_brackets_share(self):
+        """Test that mixed votes within strata produce a non-degenerate interval"""
+        choices = ["A", "B"] * 10
+        estimates = estimate_shares(choices, ["all"] * 20, {"all": 10000}, ["A"])
+
+        assert estimates["A"]["share"] == pytest.approx(0.5)
+        assert estimates["A"]["ci_low"] < 0.5 < estimates["A"]["ci_high"]
+        assert estimates["A"]["std_error"] > 0
+
+    def test_unweighted_population_is_not_a_census(self, llm):
+        """Test that a simple random sample gets a sampling interval, not a zero-width one"""
+        engine = make_engine()
+        engine.population.last_votes = {f"p{i}": "Alice" if i % 2 else "Bob" for i in range(6)}
+
+        estimates = engine.population.estimate_vote_shares(["Alice", "Bob"])
+
+        assert estimates["Alice"]["share"] == pytest.approx(0.5)
+        assert estimates["Alice"]["std_error"] > 0
+        assert estimates["Alice"]["ci_low"] < 0.5 < estimates["Alice"]["ci_high"]
+
+
+def make_engine():
+    with patch('src.game_engine.llm_client.create_client'):
+        engine = GameEngine(Config(population_size=6, questions_per_topic=1, turns_per_question=1, num_epochs=1, random_seed=1))
+    engine.candidates = [type("Candidate", (), {"name": name})() for name in ("Alice", "Bob")]
+    populate(engine.population, size=6)
+    return engine
+
+
+class TestFinalVote:
+    """Test suite for the final vote of weighted and unweighted populations"""
+
+    @pytest.mark.parametrize("weighted", [False, True])
+    def test_final_vote_keeps_one_shape(self, llm, tmp_path, weighted):
+        """Test that final_vote.json always holds counts; weighted runs add a separate estimate"""
+        engine = make_engine()
+        engine.simulation_id = "vote"
+        engine.initialize_simulation_output(str(tmp_path))
+        if weighted:
+            for i, persona in enumerate(engine.population.personas):
+                persona.stratum = "young" if i < 2 else "old"
+            engine.population.stratum_sizes.update({"young": 300.0, "old": 700.0})
+
+        def conduct_vote(candidates):
+            engine.population.last_votes = {f"p{i}": "Alice" if i < 3 else "Bob" for i in range(6)}
+            return {"Alice": 3, "Bob": 3}
+
+        with patch.object(engine.population, 'conduct_vote', side_effect=conduct_vote):
+            results = engine.conduct_final_vote()
+        engine.save_final_vote(results)
+
+        assert results == {"Alice": 3, "Bob": 3}
+        assert json.loads((tmp_path / "vote" / "final_vote.json").read_text()) == results
+        estimate_file = tmp_path / "vote" / "final_vote_estimate.json"
+        assert estimate_file.exists() == weighted
+        if weighted:
+            estimate = json.loads(estimate_file.read_text())
+            assert estimate["target_population_size"] == 1000
+            assert estimate["weighted_shares"]["Alice"]["share"] == pytest.approx(0.3 + 0.7 / 4)
@@ -0,0 +1,160 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.game_engine import GameEngine
+from src.config import Config
+from src.candidate import Candidate, CandidateState
+from src.mediator import Mediator, Topic
+from src.persona import Persona
+from src.social_media import SocialMedia
+from src.sweep import SweepRun, SweepRunner, load_sweep
+
+
+TOPICS = [Topic(id="t1", title="Climate", description="Climate policy")]
+
+
+def make_config(**overrides):
+    values = dict(population_size=2, questions_per_topic=1, turns_per_question=1, num_epochs=3, random_seed=42,
+                  candidates=[{"id": "c1", "name": "Alice", "description": "Progressive"}])
+    values.update(overrides)
+    return Config(**values)
+
+
+@pytest.fixture
+def llm():
+    with patch('src.game_engine.llm_client.create_client') as mock_create_client, \
+         patch.dict('os.environ', {'GEMINI_API_KEY': 'test_key'}):
+        mock_create_client.return_value = Mock()
+        yield mock_create_client
+
+
+@pytest.fixture
+def epochs(llm):
+    """Records (run directory, epoch, post_probability, random_seed) of every executed epoch."""
+    executed = []
+
+    def run_epoch(self):
+        executed.append((self.simulation_id, self.current_epoch, self.config.post_probability, self.config.random_seed))
+
+    def serialize_epoch(self, *args, **kwargs):
+        with open(self.simulation_file, "a") as f:
+            f.write(json.dumps({"epoch": self.current_epoch, "post_probability": self.config.post_probability}) + "\n")
+
+    with patch.object(GameEngine, '_run_epoch', run_epoch), \
+         patch.object(GameEngine, '_serialize_epoch_state', serialize_epoch):
+        yield executed
+
+
+def engine_factory(setups):
+    def factory(config):
+        setups.append(config.population_size)
+        engine = GameEngine(config)
+        engine.mediator = Mediator("m1", topics=list(TOPICS), llm_client_instance=engine.llm_client)
+        candidate = Candidate("c1", "Alice", "Progressive", list(TOPICS), engine.llm_client, initialize=False)
+        candidate.state = CandidateState(id="c1", name="Alice", character="Progressive",
+                                         policy_positions={"t1": "Carbon tax"}, memory="")
+        engine.candidates = [candidate]
+        for i in range(config.population_size):
+            engine.population.personas.append(Persona(f"p{i}", {"id": f"p{i}"}))
+        engine.social_media = SocialMedia()
+        return engine
+    return factory
+
+
+def recorded_epochs(run_dir):
+    with open(run_dir / "epochs.jsonl") as f:
+        return [json.loads(line)["epoch"] for line in f]
+
+
+class TestSweep:
+    """Test suite for prefix-sharing parameter sweeps"""
+
+    def test_seed_branches_share_setup_and_first_epoch(self, epochs, tmp_path):
+        """Test that runs differing in seed from epoch 1 execute setup and epoch 0 once"""
+        setups = []
+        runs = [SweepRun("seed_42", make_config()),
+                SweepRun("seed_7", make_config(), {1: {"random_seed": 7}}),
+                SweepRun("seed_9", make_config(), {1: {"random_seed": 9}})]
+        runner = SweepRunner(runs, engine_factory(setups), base_dir=str(tmp_path), sweep_id="seeds", final_vote=False)
+
+        run_dirs = runner.run()
+
+        assert setups == [2]
+        assert [epoch for epoch in epochs if epoch[1] == 0] == [("seed_42", 0, 0.07, 42)]
+        assert ("seed_7", 1, 0.07, 7) in epochs and ("seed_9", 2, 0.07, 9) in epochs
+        assert runner.epochs_executed == len(epochs) == 7
+        for run in runs:
+            assert run_dirs[run.id] == tmp_path / "seeds" / run.id
+            assert recorded_epochs(run_dirs[run.id]) == [0, 1, 2]
+
+        index = json.loads((tmp_path / "seeds" / "sweep.json").read_text())
+        assert index["epochs_executed"] == 7 and index["epochs_total"] == 9
+        assert index["runs"]["seed_7"]["branched_from"] == {"run": "seed_42", "after_epoch": 0}
+        assert json.loads((run_dirs["seed_9"] / "metadata.json").read_text())["parent"]["overrides"] == {"random_seed": 9}
+
+    def test_epoch_zero_differences_share_setup(self, epochs, tmp_path):
+        """Test that runs differing in a non-setup field from the start share only the setup"""
+        setups = []
+        runs = [SweepRun("base", make_config(num_epochs=2)),
+                SweepRun("more_posts", make_config(num_epochs=2, post_probability=0.5))]
+        runner = SweepRunner(runs, engine_factory(setups), base_dir=str(tmp_path), sweep_id="posts", final_vote=False)
+
+        run_dirs = runner.run()
+
+        assert setups == [2]
+        assert epochs == [("base", 0, 0.07, 42), ("base", 1, 0.07, 42),
+                          ("more_posts", 0, 0.5, 42), ("more_posts", 1, 0.5, 42)]
+        assert runner.index["more_posts"]["branched_from"] == {"run": "base", "after": "setup"}
+        assert recorded_epochs(run_dirs["more_posts"]) == [0, 1]
+        assert not list((tmp_path / "posts" / "setup").iterdir())
+
+    def test_different_setups_are_built_separately(self, epochs, tmp_path):
+        """Test that runs with different populations share nothing"""
+        setups = []
+        runs = [SweepRun("small", make_config(num_epochs=1)), SweepRun("large", make_config(num_epochs=1, population_size=3))]
+
+        SweepRunner(runs, engine_factory(setups), base_dir=str(tmp_path), sweep_id="sizes", final_vote=False).run()
+
+        assert setups == [2, 3]
+        assert len(epochs) == 2
+
+    def test_scheduled_change_and_shorter_run(self, epochs, tmp_path):
+        """Test a change from a later epoch and a run that ends inside another run's prefix"""
+        setups = []
+        runs = [SweepRun("short", make_config(num_epochs=2)),
+                SweepRun("late_change", make_config(num_epochs=4), {2: {"post_probability": 0.3}})]
+        runner = SweepRunner(runs, engine_factory(setups), base_dir=str(tmp_path), sweep_id="late", final_vote=False)
+
+        run_dirs = runner.run()
+
+        assert epochs == [("short", 0, 0.07, 42), ("short", 1, 0.07, 42),
+                          ("late_change", 2, 0.3, 42), ("late_change", 3, 0.3, 42)]
+        assert recorded_epochs(run_dirs["short"]) == [0, 1]
+        assert recorded_epochs(run_dirs["late_change"]) == [0, 1, 2, 3]
+        assert runner.index["late_change"]["branched_from"] == {"run": "short", "after_epoch": 1}
+
+    def test_unknown_change_field_is_rejected(self):
+        """Test that a misspelled field in scheduled changes fails early"""
+        with pytest.raises(ValueError, match="post_probabilty"):
+            SweepRun("typo", make_config(), {1: {"post_probabilty": 0.2}})
+
+    def test_load_sweep(self, tmp_path):
+        """Test reading a sweep specification with a base config, overrides and changes"""
+        base = tmp_path / "base.yaml"
+        base.write_text("population_size: 2\nquestions_per_topic: 1\nturns_per_question: 1\nnum_epochs: 3\nrandom_seed: 42\n")
+        spec = tmp_path / "sweep.yaml"
+        spec.write_text(f"sweep_id: demo\nbase_config: {base}\nruns:\n"
+                        "  - id: a\n"
+                        "  - id: b\n    overrides: {post_probability: 0.2}\n    changes: {1: {random_seed: 7}}\n")
+
+        sweep = load_sweep(str(spec))
+
+        assert sweep["sweep_id"] == "demo"
+        a, b = sweep["runs"]
+        assert a.config.post_probability == 0.07 and b.config.post_probability == 0.2
+        assert b.config_at(0).random_seed == 42 and b.config_at(1).random_seed == 7